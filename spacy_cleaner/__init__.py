@@ -1,6 +1,6 @@
 """Easily clean text data with `spaCy`."""
 
 from spacy_cleaner import processing
-from spacy_cleaner.cleaners import Cleaner
+from spacy_cleaner.cleaners import Cleaner, MultiCleaner
 
-__all__ = ["Cleaner", "processing"]
+__all__ = ["Cleaner", "MultiCleaner", "processing"]
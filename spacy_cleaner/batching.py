@@ -0,0 +1,275 @@
+"""Gather texts from concurrent callers into shared batches.
+
+`Language.pipe` is fastest with large batches, but services usually receive
+many small requests at once. A `MicroBatcher` collects the texts of
+concurrent requests for up to `max_latency` seconds, or until `max_batch_size`
+texts are waiting, and cleans them in one `Cleaner.clean` call on an
+executor, so the event loop is never blocked.
+
+A typical usage example:
+    ```python
+    import asyncio
+
+    from spacy_cleaner import Cleaner, batching, processing
+
+    cleaner = Cleaner(model, processing.remove_stopword_token, progress=False)
+    cleaner.batcher = batching.MicroBatcher(
+        cleaner, executor="process", max_workers=4
+    )
+
+    async def handle(texts):
+        return await cleaner.aclean(texts)
+    ```
+    Concurrent calls to handle share `model.pipe` batches.
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    from spacy_cleaner import cleaners
+
+_Item = Tuple[str, "asyncio.Future[str]"]
+
+_worker_cleaner: Optional["cleaners.Cleaner"] = None
+
+
+class MicroBatcher:
+    """Cleans the texts of concurrent callers in shared batches.
+
+    Each text waits at most `max_latency` seconds for others to join its
+    batch. At most `max_queue_size` texts are accepted before they are
+    cleaned, after which callers wait for room, so a burst of requests
+    cannot exhaust memory.
+
+    Args:
+        cleaner: The cleaner to use.
+        executor: Where batches are cleaned: `"thread"` for a thread pool,
+            `"process"` for a process pool, or an executor. A process pool
+            gets a copy of the cleaner in each worker, so the cleaner must
+            be picklable. An executor that is passed in is not shut down by
+            `close`.
+        max_workers: The number of batches cleaned at the same time, and the
+            size of the pool created for `"thread"` or `"process"`.
+        max_batch_size: The maximum number of texts per batch.
+        max_latency: The maximum time, in seconds, that a text waits for
+            more texts before its batch is cleaned.
+        max_queue_size: The maximum number of texts waiting to be cleaned.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        cleaner: "cleaners.Cleaner",
+        *,
+        executor: Union[str, concurrent.futures.Executor] = "thread",
+        max_workers: int = 1,
+        max_batch_size: int = 256,
+        max_latency: float = 0.005,
+        max_queue_size: int = 4096,
+    ) -> None:
+        self.cleaner = cleaner
+        self.max_workers = max_workers
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.max_queue_size = max_queue_size
+        self.batches = 0
+        self._owns_executor = isinstance(executor, str)
+        self.executor, self._clean = self._make_executor(executor)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def clean(self, texts: Iterable[str]) -> List[str]:
+        """Clean texts, sharing batches with concurrent calls.
+
+        Args:
+            texts: The texts to clean.
+
+        Returns:
+            The cleaned texts, in order.
+        """
+        futures = [await self._submit(text) for text in texts]
+        return list(await asyncio.gather(*futures))
+
+    async def clean_iter(
+        self, texts: Union[Iterable[str], AsyncIterable[str]]
+    ) -> AsyncIterator[str]:
+        """Lazily clean a stream of texts, sharing batches with other calls.
+
+        Texts are submitted as soon as there is room in the queue, and
+            results are yielded in order as soon as they are ready.
+
+        Args:
+            texts: An iterable or async iterable of texts.
+
+        Yields:
+            The cleaned texts, in order.
+        """
+        pending: Deque[asyncio.Future[str]] = collections.deque()
+        async for text in _aiter(texts):
+            pending.append(await self._submit(text))
+            while pending[0].done():
+                yield pending.popleft().result()
+        while pending:
+            yield await pending.popleft()
+
+    def close(self) -> None:
+        """Shuts down the executor, if it was created by the batcher."""
+        if self._owns_executor:
+            self.executor.shutdown()
+
+    def _make_executor(
+        self, executor: Union[str, concurrent.futures.Executor]
+    ) -> Tuple[concurrent.futures.Executor, Callable[[List[str]], List[str]]]:
+        """Creates the executor and the function that cleans a batch on it.
+
+        Args:
+            executor: `"thread"`, `"process"` or an executor.
+
+        Returns:
+            The executor, and the function to run on it.
+
+        Raises:
+            ValueError: If `executor` is an unknown string.
+        """
+        if not isinstance(executor, str):
+            return executor, self.cleaner.clean
+        if executor == "thread":
+            return (
+                concurrent.futures.ThreadPoolExecutor(self.max_workers),
+                self.cleaner.clean,
+            )
+        if executor == "process":
+            return (
+                concurrent.futures.ProcessPoolExecutor(
+                    self.max_workers,
+                    initializer=_start_worker,
+                    initargs=(self.cleaner,),
+                ),
+                _clean_in_worker,
+            )
+        msg = f"Unknown executor: {executor!r}."
+        raise ValueError(msg)
+
+    def _bind_loop(self) -> None:
+        """Creates the queue state for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        self._loop = loop
+        self._pending: List[_Item] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._room = asyncio.Semaphore(self.max_queue_size)
+        self._workers = asyncio.Semaphore(self.max_workers)
+        self._tasks: Set[asyncio.Task[None]] = set()
+
+    async def _submit(self, text: str) -> "asyncio.Future[str]":
+        """Adds a text to the next batch, once there is room in the queue.
+
+        Args:
+            text: The text to clean.
+
+        Returns:
+            A future for the cleaned text.
+        """
+        self._bind_loop()
+        await self._room.acquire()
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[str] = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_latency, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        """Starts cleaning the waiting texts."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            task = asyncio.ensure_future(self._process(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, batch: List[_Item]) -> None:
+        """Cleans a batch on the executor and resolves its futures.
+
+        Args:
+            batch: The texts and their futures.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._workers:
+                self.batches += 1
+                cleaned = await loop.run_in_executor(
+                    self.executor, self._clean, [text for text, _ in batch]
+                )
+        except Exception as e:  # noqa: BLE001
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), text in zip(batch, cleaned):
+                if not future.done():
+                    future.set_result(text)
+        finally:
+            for _ in batch:
+                self._room.release()
+
+
+async def _aiter(
+    texts: Union[Iterable[str], AsyncIterable[str]],
+) -> AsyncIterator[str]:
+    """Iterates over an iterable or an async iterable.
+
+    Args:
+        texts: An iterable or async iterable of texts.
+
+    Yields:
+        The texts.
+    """
+    if isinstance(texts, AsyncIterable):
+        async for text in texts:
+            yield text
+    else:
+        for text in texts:
+            yield text
+
+
+def _start_worker(cleaner: "cleaners.Cleaner") -> None:
+    """Keeps the cleaner of a process pool worker.
+
+    Args:
+        cleaner: The cleaner, unpickled once per worker.
+    """
+    global _worker_cleaner  # noqa: PLW0603
+    _worker_cleaner = cleaner
+
+
+def _clean_in_worker(texts: List[str]) -> List[str]:
+    """Cleans a batch with the cleaner of a process pool worker.
+
+    Args:
+        texts: The texts to clean.
+
+    Returns:
+        The cleaned texts.
+    """
+    assert _worker_cleaner is not None  # noqa: S101
+    return _worker_cleaner.clean(texts)
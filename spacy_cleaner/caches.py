@@ -0,0 +1,514 @@
+"""Caches that let `Cleaner` skip repeated work.
+
+A typical usage example:
+    ```python
+    import spacy
+    from spacy_cleaner import caches, processing
+
+    nlp = spacy.blank("en")
+    cache = caches.LexemeCache(
+        [processing.remove_stopword_token, processing.replace_number_token],
+        maxsize=1024,
+    )
+    [cache(tok) for tok in nlp("and ten and")]
+    cache.cache.info()
+    ```
+    The second `and` is served from the cache, so the info reports two misses
+    and one hit.
+"""
+
+import collections
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    OrderedDict,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from spacy import tokens
+
+from spacy_cleaner.processing import helpers
+
+_Key = TypeVar("_Key", bound=Hashable)
+_Value = TypeVar("_Value")
+_Text = TypeVar("_Text")
+
+# The hash of a text and its state, for texts that passed through a
+# `Deduplicator`.
+_Seen = Tuple[Optional[bytes], object]
+# A text and its cached result, for texts that passed through a
+# `PersistentCache`.
+_Lookup = Tuple[Optional[str], Optional[str]]
+
+_MISSING = object()
+_IN_FLIGHT = object()
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a cache, like `functools.lru_cache`."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache(Generic[_Key, _Value]):
+    """A bounded mapping that evicts the least recently used entry.
+
+    Args:
+        maxsize: The maximum number of entries.
+
+    Example:
+        ```python
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.get("a")
+        1
+        ```
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[_Key, _Value] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        """The number of cached entries."""
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        """Whether a key is cached, without marking it as recently used."""
+        return key in self._data
+
+    def get(
+        self, key: _Key, default: Optional[_Value] = None
+    ) -> Optional[_Value]:
+        """Looks up a key and marks it as recently used.
+
+        Args:
+            key: The key to look up.
+            default: The value to return if the key is not cached.
+
+        Returns:
+            The cached value, or `default` if the key is not cached.
+        """
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value  # type: ignore[return-value]
+
+    def put(self, key: _Key, value: _Value) -> None:
+        """Caches a value, evicting the least recently used entry if full.
+
+        Args:
+            key: The key to cache the value under.
+            value: The value to cache.
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all entries and resets the statistics."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Reports the cache statistics.
+
+        Returns:
+            The hits, misses, maximum size and current size of the cache.
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self))
+
+
+class LexemeCache:
+    """Caches the result of a chain of lexical processors by token `orth`.
+
+    Lexical processors only read lexeme attributes, so their result is the
+    same for every occurrence of a word. The chain is run once per word and
+    then served from an `LRUCache`. If no processor in the chain returns a
+    string, the token is returned unchanged so that later processors run.
+
+    Args:
+        processors: Callable token processors that only read lexeme
+            attributes.
+        maxsize: The maximum number of cached words.
+    """
+
+    def __init__(
+        self,
+        processors: Sequence[
+            Callable[[tokens.Token], Union[str, tokens.Token]]
+        ],
+        maxsize: int,
+    ) -> None:
+        self.processors = tuple(processors)
+        self.cache: LRUCache[int, Optional[str]] = LRUCache(maxsize)
+        self.requires = helpers.required_attrs(*self.processors)
+
+    def __call__(self, tok: tokens.Token) -> Union[str, tokens.Token]:
+        """Processes a token, using the cached result if there is one.
+
+        Args:
+            tok: The token to process.
+
+        Returns:
+            The string returned by the chain, or the original token.
+        """
+        result = self.cache.get(tok.orth, _MISSING)  # type: ignore[arg-type]
+        if result is _MISSING:
+            result = None
+            for processor in self.processors:
+                processed = processor(tok)
+                if isinstance(processed, str):
+                    result = processed
+                    break
+                if processed is not tok:
+                    return processed
+            self.cache.put(tok.orth, result)
+        return tok if result is None else result
+
+
+class Deduplicator:
+    """Sends each distinct text through the pipeline once.
+
+    `unique` replaces every text that has already been seen with an empty
+    placeholder, which costs next to nothing to parse, so the output of the
+    pipeline stays aligned with the input. `restore` then puts the cleaned
+    result of the first occurrence back in place of each placeholder. Texts
+    are identified by a BLAKE2 hash, and only the most recently seen
+    `maxsize` hashes are remembered.
+
+    Args:
+        maxsize: The maximum number of distinct texts to remember.
+
+    Example:
+        ```python
+        dedupe = Deduplicator(maxsize=1024)
+        texts = dedupe.unique(["a b", "c", "a b"])
+        cleaned = dedupe.restore(clean(text) for text in texts)
+        ```
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.seen: LRUCache[bytes, str] = LRUCache(maxsize)
+        self._pending: Deque[_Seen] = collections.deque()
+        self._in_flight: Dict[bytes, int] = {}
+        self._waiting: Dict[bytes, List[Any]] = {}
+
+    def unique(self, texts: Iterable[_Text]) -> Iterator[_Text]:
+        """Replaces texts that have been seen before with placeholders.
+
+        Args:
+            texts: An iterable of texts. Items that are not strings, such as
+                docs, are passed through.
+
+        Yields:
+            The first occurrence of each text, and an empty placeholder for
+                each later occurrence.
+        """
+        for text in texts:
+            if not isinstance(text, str):
+                self._pending.append((None, _MISSING))
+                yield text
+                continue
+            key = hashlib.blake2b(text.encode("utf8"), digest_size=16).digest()
+            cleaned = self.seen.get(key)
+            if cleaned is not None:
+                self._pending.append((key, cleaned))
+            elif key in self._in_flight:
+                self._in_flight[key] += 1
+                self._pending.append((key, _IN_FLIGHT))
+            else:
+                self._in_flight[key] = 0
+                self._pending.append((key, _MISSING))
+                yield text
+                continue
+            yield cast(_Text, "")
+
+    def restore(self, cleaned: Iterable[str]) -> Iterator[str]:
+        """Puts cleaned results back in place of the placeholders.
+
+        Args:
+            cleaned: The cleaned output for the texts yielded by `unique`, in
+                order.
+
+        Yields:
+            The cleaned output for every original text, in order.
+        """
+        for result in cleaned:
+            key, state = self._pending.popleft()
+            if key is None:
+                yield result
+            elif state is _MISSING:
+                self.seen.put(key, result)
+                waiting = self._in_flight.pop(key)
+                if waiting:
+                    self._waiting[key] = [result, waiting]
+                yield result
+            elif state is _IN_FLIGHT:
+                entry = self._waiting[key]
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._waiting[key]
+                yield entry[0]
+            else:
+                yield state  # type: ignore[misc]
+
+
+class PersistentCache:
+    """An on-disk cache of cleaned texts, backed by SQLite.
+
+    Entries are keyed by a hash of the text and a fingerprint of the cleaner
+    that produced them, see `Cleaner.fingerprint`, so a cleaner with a
+    different model or processor chain never sees stale results. When the
+    stored texts take more than `max_bytes`, the least recently used entries
+    are evicted.
+
+    Args:
+        path: The path of the SQLite database file.
+        max_bytes: The maximum size of the cached keys and texts.
+        commit_every: The number of writes between commits.
+
+    Example:
+        ```python
+        cache = PersistentCache("cleaned.sqlite")
+        cleaner = Cleaner(model, processing.remove_stopword_token, cache=cache)
+        cleaner.clean(texts)  # Parses the texts.
+        cleaner.clean(texts)  # Reads the texts from the cache.
+        ```
+    """
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        *,
+        max_bytes: int = 2**30,
+        commit_every: int = 1000,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.commit_every = commit_every
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            os.fspath(path), check_same_thread=False
+        )
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key BLOB PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                used INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_used ON entries (used);
+            """
+        )
+        size, used = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0), COALESCE(MAX(used), 0) FROM entries"
+        ).fetchone()
+        self._size: int = size
+        self._used: int = used
+        self._writes = 0
+
+    def __len__(self) -> int:
+        """The number of cached entries."""
+        with self._lock:
+            return int(
+                self._connection.execute(
+                    "SELECT COUNT(*) FROM entries"
+                ).fetchone()[0]
+            )
+
+    def get(self, text: str, fingerprint: str) -> Optional[str]:
+        """Looks up the cleaned version of a text.
+
+        Args:
+            text: The original text.
+            fingerprint: The fingerprint of the cleaner.
+
+        Returns:
+            The cached cleaned text, or `None` if it is not cached.
+        """
+        key = _persistent_key(text, fingerprint)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._used += 1
+            self._connection.execute(
+                "UPDATE entries SET used = ? WHERE key = ?", (self._used, key)
+            )
+            self._wrote()
+        return str(row[0])
+
+    def put(self, text: str, fingerprint: str, cleaned: str) -> None:
+        """Caches the cleaned version of a text.
+
+        Args:
+            text: The original text.
+            fingerprint: The fingerprint of the cleaner.
+            cleaned: The cleaned text.
+        """
+        key = _persistent_key(text, fingerprint)
+        size = len(key) + len(cleaned.encode("utf8"))
+        with self._lock:
+            self._used += 1
+            old = self._connection.execute(
+                "SELECT size FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, fingerprint, cleaned, size, self._used),
+            )
+            self._size += size - (old[0] if old else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+            self._wrote()
+
+    def invalidate(self, fingerprint: str) -> int:
+        """Removes the entries of every cleaner but one.
+
+        Call this after changing the model or processor chain of a cleaner
+            to free the space taken by results that can no longer be hit.
+
+        Args:
+            fingerprint: The fingerprint of the cleaner whose entries to
+                keep.
+
+        Returns:
+            The number of removed entries.
+        """
+        with self._lock:
+            removed = self._connection.execute(
+                "DELETE FROM entries WHERE fingerprint != ?", (fingerprint,)
+            ).rowcount
+            self._connection.commit()
+            self._writes = 0
+            self._size = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+        return int(removed)
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        with self._lock:
+            self._connection.execute("DELETE FROM entries")
+            self._connection.commit()
+            self._writes = 0
+            self._size = 0
+
+    def commit(self) -> None:
+        """Writes pending changes to disk."""
+        with self._lock:
+            self._connection.commit()
+            self._writes = 0
+
+    def close(self) -> None:
+        """Commits pending changes and closes the database."""
+        with self._lock:
+            self._connection.commit()
+            self._connection.close()
+
+    def cleaned(
+        self,
+        texts: Iterable[Any],
+        fingerprint: str,
+        clean: Callable[[Iterable[Any]], Iterable[str]],
+    ) -> Iterator[str]:
+        """Cleans texts, using and filling the cache.
+
+        Cached texts are replaced with empty placeholders before they reach
+            `clean`, so that its output stays aligned with the input, and
+            their cached result is put back afterwards.
+
+        Args:
+            texts: An iterable of texts. Items that are not strings, such as
+                docs, are always passed to `clean`.
+            fingerprint: The fingerprint of the cleaner.
+            clean: Cleans an iterable of texts, in order.
+
+        Yields:
+            The cleaned texts, in order.
+        """
+        pending: Deque[_Lookup] = collections.deque()
+
+        def misses() -> Iterator[Any]:
+            for text in texts:
+                if not isinstance(text, str):
+                    pending.append((None, None))
+                    yield text
+                    continue
+                hit = self.get(text, fingerprint)
+                pending.append((text, hit))
+                yield text if hit is None else ""
+
+        try:
+            for result in clean(misses()):
+                text, hit = pending.popleft()
+                if hit is not None:
+                    yield hit
+                    continue
+                if text is not None:
+                    self.put(text, fingerprint, result)
+                yield result
+        finally:
+            self.commit()
+
+    def _wrote(self) -> None:
+        self._writes += 1
+        if self._writes >= self.commit_every:
+            self._connection.commit()
+            self._writes = 0
+
+    def _evict(self) -> None:
+        excess = self._size - self.max_bytes
+        keys = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM entries ORDER BY used"
+        ):
+            if excess <= 0:
+                break
+            keys.append((key,))
+            excess -= size
+            self._size -= size
+        self._connection.executemany("DELETE FROM entries WHERE key = ?", keys)
+
+
+def _persistent_key(text: str, fingerprint: str) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(fingerprint.encode("utf8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf8"))
+    return digest.digest()
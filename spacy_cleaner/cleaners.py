@@ -1,25 +1,407 @@
-"""Class `Cleaner` allows for configurable cleaning of text using `spaCy`."""
+"""Class `Cleaner` allows for configurable cleaning of text using `spaCy`.
 
+Class `MultiCleaner` cleans each text with several processor chains from a
+single parse.
+"""
+
+import collections
+import contextlib
+import functools
+import hashlib
+import itertools
+import math
+import types
 from typing import (
     Any,
+    AsyncIterable,
+    AsyncIterator,
     Callable,
+    Deque,
     Dict,
+    FrozenSet,
     Iterable,
+    Iterator,
     List,
+    Literal,
+    Mapping,
     Optional,
+    Sequence,
+    Sized,
     Tuple,
     TypeVar,
     Union,
+    cast,
+    overload,
 )
 
+import numpy as np
 import spacy
 import tqdm
 from spacy import tokens, util
 
-from spacy_cleaner.processing import helpers
+from spacy_cleaner import batching, caches, components, outputs
+from spacy_cleaner import stats as stats_
+from spacy_cleaner.processing import helpers, transformers
 
 _AnyContext = TypeVar("_AnyContext")
 
+_Texts = Iterable[Union[str, tokens.Doc]]
+_Records = Iterable[Tuple[Union[str, tokens.Doc], _AnyContext]]
+
+_component_ids = itertools.count()
+
+_WORKER_PREFIX = "spacy_cleaner_"
+
+_END = object()
+
+# Token attributes that the components assigning an attribute rely on.
+_ATTR_DEPENDENCIES = {
+    "token.lemma": ("token.pos", "token.tag", "token.morph"),
+    "token.pos": ("token.tag", "token.morph"),
+}
+
+
+def _bind(
+    processor: Callable[..., Union[str, tokens.Token]],
+) -> Callable[[tokens.Token], Union[str, tokens.Token]]:
+    """Turns a partial of a transformer into a transformer.
+
+    For example, `functools.partial(replace_url_token, replace="URL")`
+        becomes `replace_url_token.with_replace("URL")`.
+
+    Args:
+        processor: A callable token processor.
+
+    Returns:
+        An equivalent processor.
+    """
+    if (
+        isinstance(processor, functools.partial)
+        and isinstance(processor.func, transformers.Transformer)
+        and not processor.args
+        and set(processor.keywords) == {"replace"}
+    ):
+        return processor.func.with_replace(processor.keywords["replace"])
+    return processor
+
+
+def _fuse(
+    processors: Tuple[Callable[[tokens.Token], Union[str, tokens.Token]], ...],
+) -> Tuple[Callable[[tokens.Token], Union[str, tokens.Token]], ...]:
+    """Fuses each run of consecutive transformers into one.
+
+    Args:
+        processors: Callable token processors.
+
+    Returns:
+        The processors, with `FusedTransformer` in place of each run of
+            `Transformer` processors.
+    """
+    fused: List[Callable[[tokens.Token], Union[str, tokens.Token]]] = []
+    for is_transformer, group in itertools.groupby(
+        processors, lambda p: isinstance(p, transformers.Transformer)
+    ):
+        if is_transformer:
+            run = cast(Iterator[transformers.Transformer], group)
+            fused.append(transformers.FusedTransformer(*run))
+        else:
+            fused.extend(group)
+    return tuple(fused)
+
+
+def _describe(  # noqa: C901, PLR0911
+    processor: Any,  # noqa: ANN401
+    seen: FrozenSet[int] = frozenset(),
+) -> str:
+    """Describes a processor in a way that is stable across processes.
+
+    Args:
+        processor: A callable token processor, or a value it holds.
+        seen: The IDs of the objects being described, to stop at cycles.
+
+    Returns:
+        The `repr` of plain values, and the import path of functions and
+            classes, with a digest of their code. Partials add their
+            arguments, and other objects add the values of their attributes.
+
+    Raises:
+        ValueError: If the processor holds an object that has neither
+            attributes nor a `repr` of its own, so its state is unknown.
+    """
+    if processor is None or isinstance(
+        processor, (bool, int, float, complex, str, bytes)
+    ):
+        return repr(processor)
+    if id(processor) in seen:
+        return "..."
+    seen = seen | {id(processor)}
+    if isinstance(processor, (list, tuple)):
+        items = ", ".join(_describe(value, seen) for value in processor)
+        return f"{type(processor).__name__}({items})"
+    if isinstance(processor, (set, frozenset)):
+        items = ", ".join(sorted(_describe(value, seen) for value in processor))
+        return f"{type(processor).__name__}({items})"
+    if isinstance(processor, dict):
+        items = ", ".join(
+            sorted(
+                f"{_describe(k, seen)}: {_describe(v, seen)}"
+                for k, v in processor.items()
+            )
+        )
+        return f"dict({items})"
+    if isinstance(processor, functools.partial):
+        args = ", ".join(
+            [
+                _describe(processor.func, seen),
+                *(_describe(value, seen) for value in processor.args),
+                *(
+                    f"{k}={_describe(v, seen)}"
+                    for k, v in sorted(processor.keywords.items())
+                ),
+            ]
+        )
+        return f"partial({args})"
+    if isinstance(processor, types.MethodType):
+        return f"{_describe(processor.__self__, seen)}.{processor.__name__}"
+    if isinstance(processor, types.ModuleType):
+        return processor.__name__
+    if isinstance(processor, (types.FunctionType, type)):
+        name = f"{processor.__module__}.{processor.__qualname__}"
+        return f"{name}[{_code_digest(processor, seen)}]"
+    if hasattr(processor, "__qualname__"):
+        return f"{processor.__module__}.{processor.__qualname__}"
+    state = _state(processor)
+    if state is not None:
+        args = ", ".join(f"{k}={_describe(v, seen)}" for k, v in state)
+        return f"{_describe(type(processor), seen)}({args})"
+    description = repr(processor)
+    if " at 0x" in description:
+        msg = (
+            f"Cannot describe {description} for the cache, as its state is "
+            "unknown. Give it a `__repr__` that shows its state."
+        )
+        raise ValueError(msg)
+    return description
+
+
+def _state(obj: Any) -> Optional[List[Tuple[str, Any]]]:  # noqa: ANN401
+    """Reads the attributes of an object.
+
+    Args:
+        obj: The object.
+
+    Returns:
+        The names and values of the instance and slot attributes, sorted by
+            name, or `None` if the object has neither.
+    """
+    names = [
+        name
+        for klass in type(obj).__mro__
+        for name in (
+            (klass.__dict__.get("__slots__", ()),)
+            if isinstance(klass.__dict__.get("__slots__"), str)
+            else klass.__dict__.get("__slots__", ())
+        )
+        if name not in ("__dict__", "__weakref__")
+    ]
+    if not names and not hasattr(obj, "__dict__"):
+        return None
+    state = dict(vars(obj)) if hasattr(obj, "__dict__") else {}
+    for name in names:
+        if hasattr(obj, name):
+            state[name] = getattr(obj, name)
+    return sorted(state.items())
+
+
+def _code_digest(
+    function: Union[types.FunctionType, type], seen: FrozenSet[int]
+) -> str:
+    """Digests what a function or the methods of a class compute.
+
+    Args:
+        function: The function or class.
+        seen: The IDs of the objects being described, to stop at cycles.
+
+    Returns:
+        A hexadecimal digest of the code, the default arguments and the
+            values a function closes over, or of the code and constants of
+            each class of the method resolution order.
+    """
+    if isinstance(function, type):
+        state: Any = [
+            (klass.__qualname__, name, _constant(value))
+            for klass in function.__mro__
+            if klass.__module__ != "builtins"
+            for name, value in vars(klass).items()
+            if not name.startswith("__") or name == "__call__"
+        ]
+    else:
+        state = (
+            _constant(function.__code__),
+            _describe(function.__defaults__, seen),
+            _describe(function.__kwdefaults__, seen),
+            [
+                _describe(_cell_contents(cell), seen)
+                for cell in function.__closure__ or ()
+            ],
+        )
+    return hashlib.blake2b(
+        repr(state).encode("utf8"), digest_size=16
+    ).hexdigest()
+
+
+def _cell_contents(cell: types.CellType) -> Any:  # noqa: ANN401
+    """Reads the value of a closure cell.
+
+    Args:
+        cell: The cell.
+
+    Returns:
+        The value of the cell, or `None` if it is not set yet.
+    """
+    try:
+        return cell.cell_contents
+    except ValueError:
+        return None
+
+
+def _constant(value: Any) -> Any:  # noqa: ANN401
+    """Makes a code object or class attribute comparable across processes.
+
+    Code objects keep their bytecode, names and constants, but not their
+        file name or line numbers. Sets are sorted, as their order depends
+        on the hash seed of the process.
+
+    Args:
+        value: The value.
+
+    Returns:
+        A value with a stable `repr`, or `None` for values other than code,
+            functions, plain values and their containers.
+    """
+    if isinstance(value, (classmethod, staticmethod)):
+        value = value.__func__
+    if isinstance(value, property):
+        value = value.fget
+    if isinstance(value, types.FunctionType):
+        value = value.__code__
+    if isinstance(value, types.CodeType):
+        return (
+            value.co_code,
+            value.co_names,
+            value.co_varnames,
+            value.co_freevars,
+            tuple(_constant(const) for const in value.co_consts),
+        )
+    if isinstance(value, (tuple, list)):
+        return tuple(_constant(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(repr(_constant(item)) for item in value)
+    if value is None or isinstance(
+        value, (bool, int, float, complex, str, bytes)
+    ):
+        return value
+    return None
+
+
+def _split_contexts(
+    records: Iterable[Tuple[Any, Any]], contexts: Deque[Any]
+) -> Iterator[Any]:
+    """Separates texts from their contexts.
+
+    Each context is added to `contexts` before its text is yielded, so the
+        contexts of texts that were read but not yet cleaned wait in order.
+
+    Args:
+        records: (text, context) tuples.
+        contexts: The contexts that are waiting for their cleaned text.
+
+    Yields:
+        The texts.
+    """
+    for text, context in records:
+        contexts.append(context)
+        yield text
+
+
+def _worker_cleaned(doc: tokens.Doc) -> str:
+    """Reads the string cleaned by a `spacy_cleaner` component.
+
+    Args:
+        doc: A doc returned by a worker process.
+
+    Returns:
+        The cleaned string.
+    """
+    return str(doc._.cleaned)  # noqa: SLF001
+
+
+def _has_commutative_run(
+    processors: Tuple[Callable[[tokens.Token], Union[str, tokens.Token]], ...],
+) -> bool:
+    """Whether two adjacent processors commute.
+
+    Args:
+        processors: Callable token processors.
+
+    Returns:
+        `True` if reordering could change the order of the processors.
+    """
+    return any(
+        helpers.commutes(a, b) for a, b in zip(processors, processors[1:])
+    )
+
+
+def _commutative_order(
+    processors: Tuple[Callable[[tokens.Token], Union[str, tokens.Token]], ...],
+    stats: Sequence[stats_.ProcessorStats],
+) -> Tuple[int, ...]:
+    """Sorts each run of processors of the same commutation group.
+
+    A processor that takes `c` seconds per call and matches a share `p` of
+        the tokens it sees should run before one with a larger `c / p`,
+        which minimises the expected cost per token of the run.
+
+    Args:
+        processors: Callable token processors.
+        stats: The measured counters of each processor.
+
+    Returns:
+        The positions of the processors in their new order.
+    """
+
+    def rank(i: int) -> float:
+        calls, matches = stats[i].calls, stats[i].matches
+        return stats[i].seconds / matches if calls and matches else math.inf
+
+    order: List[int] = []
+    for group, members in itertools.groupby(
+        range(len(processors)),
+        lambda i: helpers.commutation_group(processors[i]),
+    ):
+        run = list(members)
+        order.extend(sorted(run, key=rank) if group is not None else run)
+    return tuple(order)
+
+
+def _count_leading(
+    processors: Tuple[Callable[[tokens.Token], Union[str, tokens.Token]], ...],
+    predicate: Callable[..., bool],
+) -> int:
+    """Counts the leading processors that satisfy a predicate.
+
+    Args:
+        processors: Callable token processors.
+        predicate: The condition to check for each processor.
+
+    Returns:
+        The number of processors before the first that fails `predicate`.
+    """
+    return next(
+        (i for i, p in enumerate(processors) if not predicate(p)),
+        len(processors),
+    )
+
 
 class Cleaner:
     """Cleans a sequence of texts.
@@ -27,6 +409,41 @@ class Cleaner:
     Args:
         model: A `spaCy` model.
         *processors: Callable token processors.
+        auto_disable: Whether to disable the pipeline components that the
+            processors do not need. Only used when every processor declares
+            the token attributes it reads, see
+            `spacy_cleaner.processing.helpers.requires`.
+        lexeme_cache_size: The maximum number of words whose result is
+            cached for the leading lexical processors, see
+            `spacy_cleaner.caches.LexemeCache`. `0` disables the cache.
+        keep_whitespace: Whether to keep the original whitespace after each
+            kept token instead of joining tokens with single spaces.
+        cache: An on-disk cache of cleaned texts, shared between runs. Cached
+            texts are not parsed again, see
+            `spacy_cleaner.caches.PersistentCache`.
+        progress: Whether to show a progress bar while cleaning.
+        stats: Whether to collect statistics about each processor and batch,
+            see `spacy_cleaner.stats.Stats`. The processors then run one
+            after the other on each token, without fusing or caching, so
+            that each can be measured.
+        reorder_sample: The number of docs to sample before reordering
+            adjacent processors that commute, see
+            `spacy_cleaner.processing.helpers.commutes`: removers, or
+            processors declared with
+            `spacy_cleaner.processing.helpers.order_independent`. Each run of
+            such processors is sorted by cost per call divided by match
+            rate, as measured on the sample, so the cheapest and most
+            selective run first. Only docs cleaned in this process are
+            sampled: with `n_process != 1` the worker processes keep the
+            given order. `0` keeps the given order.
+
+    Attributes:
+        order: The positions in `processors` of the processors in the order
+            they run, once the sample has been measured.
+        stats: The statistics of the cleaner, if collected.
+        batcher: Gathers the texts of concurrent `aclean` calls into shared
+            batches. Created with default settings on the first call, or set
+            a `spacy_cleaner.batching.MicroBatcher` to configure it.
 
     Example:
         ```python
@@ -50,60 +467,964 @@ class Cleaner:
         ```
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         model: spacy.Language,
         *processors: Callable[[tokens.Token], Union[str, tokens.Token]],
+        auto_disable: bool = True,
+        lexeme_cache_size: int = 2**16,
+        keep_whitespace: bool = False,
+        cache: Optional[caches.PersistentCache] = None,
+        progress: bool = True,
+        stats: bool = False,
+        reorder_sample: int = 0,
     ) -> None:
         self.model = model
         self.processors = processors
+        self.auto_disable = auto_disable
+        self.keep_whitespace = keep_whitespace
+        self.cache = cache
+        self.progress = progress
+        self.stats = stats_.Stats() if stats else None
+        self.batcher: Optional[batching.MicroBatcher] = None
+        self.reorder_sample = reorder_sample
+        self.order: Optional[Tuple[int, ...]] = None
+        self.lexeme_cache: Optional[caches.LRUCache[int, Optional[str]]] = None
+        self._lexeme_cache_size = lexeme_cache_size
+        self._processors = self._compile(self.processors)
+        self._profile: Optional[Tuple[stats_.InstrumentedProcessor, ...]] = None
+        self._profiled_docs = 0
+        self._unprofiled = self._processors
+        if reorder_sample and _has_commutative_run(self.processors):
+            self._profile = (
+                cast(Tuple[stats_.InstrumentedProcessor, ...], self._processors)
+                if self.stats is not None
+                else tuple(map(stats_.Stats().instrument, self.processors))
+            )
+            self._processors = self._profile
+
+    @overload
+    def clean(  # noqa: PLR0913
+        self,
+        texts: _Texts,
+        *,
+        as_tuples: Literal[False] = ...,
+        batch_size: Optional[int] = ...,
+        disable: Iterable[str] = ...,
+        component_cfg: Optional[Dict[str, Dict[str, Any]]] = ...,
+        n_process: int = ...,
+        dedupe_size: int = ...,
+    ) -> List[str]:
+        ...
+
+    @overload
+    def clean(  # noqa: PLR0913
+        self,
+        texts: _Records[_AnyContext],
+        *,
+        as_tuples: Literal[True],
+        batch_size: Optional[int] = ...,
+        disable: Iterable[str] = ...,
+        component_cfg: Optional[Dict[str, Dict[str, Any]]] = ...,
+        n_process: int = ...,
+        dedupe_size: int = ...,
+    ) -> List[Tuple[str, _AnyContext]]:
+        ...
 
     # noinspection PyTypeChecker,PyDefaultArgumentdd,PyDefaultArgument
     def clean(  # noqa: PLR0913
         self,
-        texts: Union[
-            Iterable[Union[str, tokens.Doc]],
-            Iterable[Tuple[Union[str, tokens.Doc], _AnyContext]],
-        ],
+        texts: Union[_Texts, _Records[Any]],
         *,
         as_tuples: bool = False,
         batch_size: Optional[int] = None,
         disable: Iterable[str] = util.SimpleFrozenList(),
         component_cfg: Optional[Dict[str, Dict[str, Any]]] = None,
         n_process: int = 1,
-    ) -> List[str]:
+        dedupe_size: int = 0,
+    ) -> Union[List[str], List[Tuple[str, Any]]]:
         """Clean a stream of texts.
 
         Args:
             texts: A sequence of texts or docs to process.
             as_tuples: If set to True, inputs should be a sequence of
                 (text, context) tuples. Output will then be a sequence of
-                (doc, context) tuples.
+                (cleaned, context) tuples. Contexts are passed through as
+                they are: they are not copied, pickled or sent to worker
+                processes.
             batch_size: The number of texts to buffer.
             disable: The pipeline components to disable.
             component_cfg: An optional dictionary with extra keyword arguments
                 for specific components.
             n_process: Number of processors to process texts. If `-1`, set
-                `multiprocessing.cpu_count()`.
+                `multiprocessing.cpu_count()`. With more than one process, a
+                `spacy_cleaner` component is added to the model for the
+                duration of the call, so that texts are cleaned in the worker
+                processes and only the cleaned strings are sent back.
+            dedupe_size: The maximum number of distinct texts to remember for
+                duplicate detection. `0` disables duplicate detection.
 
         Returns:
-              A list of cleaned strings in the order of the original text.
+              A list of cleaned strings, or (cleaned, context) tuples, in the
+                order of the original text.
 
         References:
             https://spacy.io/api/language#pipe
         """
-        return [
-            helpers.clean_doc(doc, *self.processors)
-            for doc in tqdm.tqdm(
-                self.model.pipe(  # type: ignore[call-overload]
-                    texts,
-                    as_tuples=as_tuples,
-                    batch_size=batch_size,
-                    disable=disable,
-                    component_cfg=component_cfg,
-                    n_process=n_process,
-                ),
-                desc="Cleaning Progress",
-                total=len(texts),  # type: ignore[arg-type]
+        return list(
+            self.clean_iter(  # type: ignore[call-overload]
+                texts,
+                as_tuples=as_tuples,
+                batch_size=batch_size,
+                disable=disable,
+                component_cfg=component_cfg,
+                n_process=n_process,
+                dedupe_size=dedupe_size,
+            )
+        )
+
+    @overload
+    def clean_iter(  # noqa: PLR0913
+        self,
+        texts: _Texts,
+        *,
+        as_tuples: Literal[False] = ...,
+        batch_size: Optional[int] = ...,
+        disable: Iterable[str] = ...,
+        component_cfg: Optional[Dict[str, Dict[str, Any]]] = ...,
+        n_process: int = ...,
+        dedupe_size: int = ...,
+    ) -> Iterator[str]:
+        ...
+
+    @overload
+    def clean_iter(  # noqa: PLR0913
+        self,
+        texts: _Records[_AnyContext],
+        *,
+        as_tuples: Literal[True],
+        batch_size: Optional[int] = ...,
+        disable: Iterable[str] = ...,
+        component_cfg: Optional[Dict[str, Dict[str, Any]]] = ...,
+        n_process: int = ...,
+        dedupe_size: int = ...,
+    ) -> Iterator[Tuple[str, _AnyContext]]:
+        ...
+
+    # noinspection PyTypeChecker,PyDefaultArgumentdd,PyDefaultArgument
+    def clean_iter(  # noqa: PLR0913
+        self,
+        texts: Union[_Texts, _Records[Any]],
+        *,
+        as_tuples: bool = False,
+        batch_size: Optional[int] = None,
+        disable: Iterable[str] = util.SimpleFrozenList(),
+        component_cfg: Optional[Dict[str, Dict[str, Any]]] = None,
+        n_process: int = 1,
+        dedupe_size: int = 0,
+    ) -> Union[Iterator[str], Iterator[Tuple[str, Any]]]:
+        """Lazily clean a stream of texts.
+
+        Unlike `clean`, `texts` can be any iterable, such as a generator or a
+            file handle. Texts are read and cleaned one batch at a time, so
+            memory use is bounded by `batch_size` rather than by the number of
+            texts.
+
+        Args:
+            texts: An iterable of texts or docs to process.
+            as_tuples: If set to True, inputs should be a sequence of
+                (text, context) tuples. Output will then be a sequence of
+                (cleaned, context) tuples. Contexts are passed through as
+                they are: they are not copied, pickled or sent to worker
+                processes.
+            batch_size: The number of texts to buffer.
+            disable: The pipeline components to disable, in addition to
+                those disabled by `auto_disable`.
+            component_cfg: An optional dictionary with extra keyword arguments
+                for specific components.
+            n_process: Number of processors to process texts. If `-1`, set
+                `multiprocessing.cpu_count()`.
+            dedupe_size: The maximum number of distinct texts to remember for
+                duplicate detection. Exact duplicates of a remembered text are
+                not parsed again, see `spacy_cleaner.caches.Deduplicator`. `0`
+                disables duplicate detection.
+
+        Yields:
+            Cleaned strings, or (cleaned, context) tuples, in the order of the
+                original text.
+
+        References:
+            https://spacy.io/api/language#pipe
+        """
+        total = len(texts) if isinstance(texts, Sized) else None
+        contexts: Deque[Any] = collections.deque()
+        if as_tuples:
+            texts = _split_contexts(cast(_Records[Any], texts), contexts)
+
+        def clean(texts: Iterable[Any]) -> Iterator[str]:
+            dedupe = caches.Deduplicator(dedupe_size) if dedupe_size else None
+            cleaned = self._clean_stream(
+                texts if dedupe is None else dedupe.unique(texts),
+                total=total,
+                batch_size=batch_size,
+                disable=disable,
+                component_cfg=component_cfg,
+                n_process=n_process,
             )
+            yield from cleaned if dedupe is None else dedupe.restore(cleaned)
+
+        cleaned = (
+            clean(texts)
+            if self.cache is None
+            else self.cache.cleaned(texts, self.fingerprint(), clean)
+        )
+        if as_tuples:
+            for text in cleaned:
+                yield text, contexts.popleft()
+        else:
+            yield from cleaned
+
+    def clean_docs(self, docs: Iterable[tokens.Doc]) -> Iterator[str]:
+        """Lazily clean docs that were already parsed.
+
+        Unlike `clean_iter`, the docs do not go through the model, so this
+            is the way to clean the output of a previous parse, such as the
+            docs of a `spacy_cleaner.stores.DocStore`.
+
+        Args:
+            docs: An iterable of parsed docs.
+
+        Yields:
+            Cleaned strings in the order of the docs.
+        """
+        total = len(docs) if isinstance(docs, Sized) else None
+        for doc in tqdm.tqdm(
+            docs,
+            desc="Cleaning Progress",
+            total=total,
+            disable=not self.progress,
+        ):
+            yield self.clean_doc(doc)
+
+    def placeholder_ids(self) -> Dict[str, int]:
+        """Reserves an ID for each placeholder of the processors.
+
+        Placeholders are the non-blank replacements of the transformers of
+            the chain, such as `_IS_PUNCT_`. They get IDs from `1`, in chain
+            order, so that they cannot be mistaken for the hash of a word.
+
+        Returns:
+            The reserved ID of each placeholder.
+        """
+        replacements = [
+            transformer.replace
+            for processor in _fuse(tuple(_bind(p) for p in self.processors))
+            if isinstance(processor, transformers.FusedTransformer)
+            for transformer in processor.transformers
+            if transformer.replace.strip()
         ]
+        return {
+            replace: i
+            for i, replace in enumerate(dict.fromkeys(replacements), start=1)
+        }
+
+    # noinspection PyTypeChecker,PyDefaultArgumentdd,PyDefaultArgument
+    def token_ids(  # noqa: PLR0913
+        self,
+        texts: Iterable[Union[str, tokens.Doc]],
+        *,
+        placeholders: Optional[Mapping[str, int]] = None,
+        batch_size: Optional[int] = None,
+        disable: Iterable[str] = util.SimpleFrozenList(),
+        component_cfg: Optional[Dict[str, Dict[str, Any]]] = None,
+        n_process: int = 1,
+    ) -> Iterator[np.ndarray]:
+        """Lazily clean texts into arrays of token IDs.
+
+        No string is built: each kept token becomes its `orth` hash, the hash
+            of the string it was changed to, or the reserved ID of its
+            placeholder, see `spacy_cleaner.outputs`. Docs are cleaned in this
+            process, even with `n_process > 1`.
+
+        Args:
+            texts: An iterable of texts or docs to process.
+            placeholders: The reserved ID of each placeholder string. Defaults
+                to `placeholder_ids()`.
+            batch_size: The number of texts to buffer.
+            disable: The pipeline components to disable.
+            component_cfg: Extra keyword arguments for specific components.
+            n_process: Number of processors to parse texts.
+
+        Yields:
+            A `uint64` array for each text, in order.
+        """
+        if placeholders is None:
+            placeholders = self.placeholder_ids()
+        for doc in self.parse(
+            texts,
+            batch_size=batch_size,
+            disable=disable,
+            component_cfg=component_cfg,
+            n_process=n_process,
+        ):
+            yield outputs.token_ids(
+                doc, *self._processors, placeholders=placeholders
+            )
+
+    # noinspection PyTypeChecker,PyDefaultArgumentdd,PyDefaultArgument
+    def token_id_batches(  # noqa: PLR0913
+        self,
+        texts: Iterable[Union[str, tokens.Doc]],
+        *,
+        placeholders: Optional[Mapping[str, int]] = None,
+        batch_size: Optional[int] = None,
+        disable: Iterable[str] = util.SimpleFrozenList(),
+        component_cfg: Optional[Dict[str, Dict[str, Any]]] = None,
+        n_process: int = 1,
+    ) -> Iterator[outputs.RaggedArray]:
+        """Lazily clean texts into batches of token IDs.
+
+        Like `token_ids`, but the IDs of each batch are stored in a single
+            buffer, with the offsets of each text.
+
+        Args:
+            texts: An iterable of texts or docs to process.
+            placeholders: The reserved ID of each placeholder string. Defaults
+                to `placeholder_ids()`.
+            batch_size: The number of texts per batch. Defaults to the batch
+                size of the model.
+            disable: The pipeline components to disable.
+            component_cfg: Extra keyword arguments for specific components.
+            n_process: Number of processors to parse texts.
+
+        Yields:
+            A `RaggedArray` of `uint64` IDs for each batch, in order.
+        """
+        if placeholders is None:
+            placeholders = self.placeholder_ids()
+        batch_size = batch_size or self.model.batch_size
+        docs = self.parse(
+            texts,
+            batch_size=batch_size,
+            disable=disable,
+            component_cfg=component_cfg,
+            n_process=n_process,
+        )
+        for batch in util.minibatch(docs, size=batch_size):
+            yield outputs.RaggedArray.from_lists(
+                outputs.token_id_list(
+                    doc, *self._processors, placeholders=placeholders
+                )
+                for doc in batch
+            )
+
+    # noinspection PyTypeChecker,PyDefaultArgumentdd,PyDefaultArgument
+    def kept_tokens(  # noqa: PLR0913
+        self,
+        texts: Iterable[Union[str, tokens.Doc]],
+        *,
+        placeholders: Optional[Mapping[str, int]] = None,
+        batch_size: Optional[int] = None,
+        disable: Iterable[str] = util.SimpleFrozenList(),
+        component_cfg: Optional[Dict[str, Dict[str, Any]]] = None,
+        n_process: int = 1,
+    ) -> Iterator[outputs.KeptTokens]:
+        """Lazily clean texts into the positions of their kept tokens.
+
+        Instead of a cleaned string, each text gives the indices and
+            character offsets of the tokens that survive cleaning, with a
+            replacement code for each, see `spacy_cleaner.outputs.KeptTokens`.
+            Docs are cleaned in this process, even with `n_process > 1`.
+
+        Args:
+            texts: An iterable of texts or docs to process.
+            placeholders: The reserved ID of each placeholder string, used as
+                its replacement code. Defaults to `placeholder_ids()`.
+            batch_size: The number of texts to buffer.
+            disable: The pipeline components to disable.
+            component_cfg: Extra keyword arguments for specific components.
+            n_process: Number of processors to parse texts.
+
+        Yields:
+            The kept tokens of each text, in order.
+        """
+        if placeholders is None:
+            placeholders = self.placeholder_ids()
+        for doc in self.parse(
+            texts,
+            batch_size=batch_size,
+            disable=disable,
+            component_cfg=component_cfg,
+            n_process=n_process,
+        ):
+            yield outputs.kept_tokens(
+                doc, *self._processors, placeholders=placeholders
+            )
+
+    def fingerprint(self) -> str:
+        """Identifies the output of the cleaner.
+
+        Two cleaners with the same fingerprint produce the same cleaned
+            string for any text. The fingerprint covers the `spaCy` version,
+            the name, version and components of the model, the processors
+            and `keep_whitespace`. Processors are described by their code and
+            the values they hold.
+
+        Returns:
+            A hexadecimal digest.
+
+        Raises:
+            ValueError: If a processor holds an object whose state cannot be
+                described.
+        """
+        meta = self.model.meta
+        parts = [
+            spacy.__version__,
+            f"{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}",
+            ",".join(self.model.pipe_names),
+            *map(_describe, self.processors),
+            f"keep_whitespace={self.keep_whitespace}",
+        ]
+        return hashlib.blake2b(
+            "\n".join(parts).encode("utf8"), digest_size=16
+        ).hexdigest()
+
+    # noinspection PyTypeChecker,PyDefaultArgumentdd,PyDefaultArgument
+    def parse(  # noqa: PLR0913
+        self,
+        texts: Iterable[Any],
+        *,
+        as_tuples: bool = False,
+        batch_size: Optional[int] = None,
+        disable: Iterable[str] = util.SimpleFrozenList(),
+        component_cfg: Optional[Dict[str, Dict[str, Any]]] = None,
+        n_process: int = 1,
+    ) -> Iterator[Any]:
+        """Lazily parse texts with the components the processors need.
+
+        With `auto_disable`, unused components are disabled, and texts are
+            only tokenized if every processor reads lexeme attributes and no
+            enabled component retokenizes.
+
+        Args:
+            texts: An iterable of texts or docs to process.
+            as_tuples: Whether inputs are (text, context) tuples.
+            batch_size: The number of texts to buffer.
+            disable: The pipeline components to disable.
+            component_cfg: Extra keyword arguments for specific components.
+            n_process: Number of processors to process texts.
+
+        Yields:
+            Docs, or (doc, context) tuples, in the order of the texts.
+        """
+        yield from self._parse(
+            texts,
+            as_tuples=as_tuples,
+            batch_size=batch_size,
+            disable=disable,
+            component_cfg=component_cfg,
+            n_process=n_process,
+        )
+
+    def clean_doc(self, doc: tokens.Doc) -> str:
+        """Clean a doc that was already parsed.
+
+        Args:
+            doc: A parsed doc.
+
+        Returns:
+            The cleaned string.
+        """
+        cleaned = helpers.clean_doc(
+            doc, *self._processors, keep_whitespace=self.keep_whitespace
+        )
+        if self._profile is not None:
+            self._profiled_docs += 1
+            if self._profiled_docs >= self.reorder_sample:
+                self._reorder(self._profile)
+        return cleaned
+
+    async def aclean(self, texts: Iterable[str]) -> List[str]:
+        """Clean texts without blocking the event loop.
+
+        The texts of concurrent calls are gathered into shared batches and
+            cleaned on the executor of `batcher`, see
+            `spacy_cleaner.batching.MicroBatcher`.
+
+        Args:
+            texts: The texts to clean.
+
+        Returns:
+            A list of cleaned strings in the order of the original text.
+        """
+        return await self._batcher().clean(texts)
+
+    async def aclean_iter(
+        self, texts: Union[Iterable[str], AsyncIterable[str]]
+    ) -> AsyncIterator[str]:
+        """Lazily clean a stream of texts without blocking the event loop.
+
+        Like `aclean`, texts share batches with concurrent calls. When the
+            queue of `batcher` is full, reading from `texts` waits for room.
+
+        Args:
+            texts: An iterable or async iterable of texts.
+
+        Yields:
+            Cleaned strings in the order of the original text.
+        """
+        async for cleaned in self._batcher().clean_iter(texts):
+            yield cleaned
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickles the cleaner without its batcher, which owns an executor."""
+        state = self.__dict__.copy()
+        state["batcher"] = None
+        return state
+
+    def _batcher(self) -> batching.MicroBatcher:
+        """Returns the batcher, creating one with default settings if needed.
+
+        Returns:
+            The batcher of the cleaner.
+        """
+        if self.batcher is None:
+            self.batcher = batching.MicroBatcher(self)
+        return self.batcher
+
+    def _clean_stream(  # noqa: PLR0913
+        self,
+        texts: Iterable[Any],
+        *,
+        total: Optional[int],
+        batch_size: Optional[int],
+        disable: Iterable[str],
+        component_cfg: Optional[Dict[str, Dict[str, Any]]],
+        n_process: int,
+    ) -> Iterator[str]:
+        """Parses and cleans a stream of texts.
+
+        Args:
+            texts: An iterable of texts or docs to process.
+            total: The number of texts, if known, for the progress bar.
+            batch_size: The number of texts to buffer.
+            disable: The pipeline components to disable.
+            component_cfg: Extra keyword arguments for specific components.
+            n_process: Number of processors to process texts.
+
+        Yields:
+            Cleaned strings in the order of the original text.
+        """
+        in_workers = n_process != 1
+        with (
+            self._worker_component() if in_workers else contextlib.nullcontext()
+        ) as owned:
+            docs: Iterator[Any] = self._parse(
+                texts,
+                batch_size=batch_size,
+                disable=disable,
+                component_cfg=component_cfg,
+                n_process=n_process,
+                owned=owned,
+            )
+            if in_workers:
+                # `Language.pipe` binds its components and starts the worker
+                # processes on the first doc, after which the worker
+                # component can leave the shared model.
+                docs = itertools.chain(
+                    [doc for doc in [next(docs, _END)] if doc is not _END],
+                    docs,
+                )
+        clean: Callable[[tokens.Doc], str] = (
+            _worker_cleaned if in_workers else self.clean_doc
+        )
+        cleaned = (
+            map(clean, docs)
+            if self.stats is None
+            else self.stats.observe(
+                docs, clean, batch_size or self.model.batch_size
+            )
+        )
+        yield from tqdm.tqdm(
+            cleaned,
+            desc="Cleaning Progress",
+            total=total,
+            disable=not self.progress,
+        )
+
+    # noinspection PyTypeChecker,PyDefaultArgumentdd,PyDefaultArgument
+    def _parse(  # noqa: PLR0913
+        self,
+        texts: Iterable[Any],
+        *,
+        as_tuples: bool = False,
+        batch_size: Optional[int] = None,
+        disable: Iterable[str] = util.SimpleFrozenList(),
+        component_cfg: Optional[Dict[str, Dict[str, Any]]] = None,
+        n_process: int = 1,
+        owned: Optional[str] = None,
+    ) -> Iterator[Any]:
+        """Parses texts, with the worker component of this call, if any.
+
+        The worker components that other calls added to the model are
+            always disabled.
+
+        Args:
+            texts: An iterable of texts or docs to process.
+            as_tuples: Whether inputs are (text, context) tuples.
+            batch_size: The number of texts to buffer.
+            disable: The pipeline components to disable.
+            component_cfg: Extra keyword arguments for specific components.
+            n_process: Number of processors to process texts.
+            owned: The name of the worker component of this call.
+
+        Yields:
+            Docs, or (doc, context) tuples, in the order of the texts.
+        """
+        disable = [*disable, *self._worker_pipes(owned)]
+        if self.auto_disable:
+            disable = [*disable, *self._unused_pipes(owned)]
+        if (
+            self.auto_disable
+            and n_process == 1
+            and not as_tuples
+            and helpers.is_lexical(*self.processors)
+            and not self._retokenizes(disable)
+        ):
+            yield from self._tokenize(texts)
+            return
+        yield from self.model.pipe(  # type: ignore[call-overload]
+            texts,
+            as_tuples=as_tuples,
+            batch_size=batch_size,
+            disable=disable,
+            component_cfg=component_cfg,
+            n_process=n_process,
+        )
+
+    def _compile(
+        self,
+        processors: Tuple[
+            Callable[[tokens.Token], Union[str, tokens.Token]], ...
+        ],
+    ) -> Tuple[Callable[[tokens.Token], Union[str, tokens.Token]], ...]:
+        """Builds the processor chain that is run on each token.
+
+        Partials of transformers become transformers, and each run of
+            consecutive transformers is fused into a `FusedTransformer`. A
+            leading fused transformer is left for `helpers.clean_doc` to apply
+            to whole documents, and the lexical processors that follow it are
+            wrapped in a `LexemeCache`. When statistics are collected, each
+            processor is only wrapped to be measured.
+
+        Args:
+            processors: Callable token processors.
+
+        Returns:
+            Callable token processors equivalent to `processors`.
+        """
+        if self.stats is not None:
+            return tuple(map(self.stats.instrument, processors))
+        processors = _fuse(tuple(_bind(p) for p in processors))
+        start = _count_leading(
+            processors[:1],
+            lambda p: isinstance(p, transformers.FusedTransformer),
+        )
+        end = start + _count_leading(processors[start:], helpers.is_lexical)
+        if not self._lexeme_cache_size or start == end:
+            return processors
+        cache = caches.LexemeCache(
+            processors[start:end], maxsize=self._lexeme_cache_size
+        )
+        self.lexeme_cache = cache.cache
+        return (*processors[:start], cache, *processors[end:])
+
+    def _reorder(
+        self, profile: Tuple[stats_.InstrumentedProcessor, ...]
+    ) -> None:
+        """Reorders the processors by their measured cost and match rate.
+
+        Args:
+            profile: The measured processors, in the order of `processors`.
+        """
+        self._profile = None
+        self.order = _commutative_order(
+            self.processors, [processor.stats for processor in profile]
+        )
+        self._processors = (
+            tuple(profile[i] for i in self.order)
+            if self.stats is not None
+            else self._compile(tuple(self.processors[i] for i in self.order))
+        )
+
+    def _tokenize(
+        self, texts: Iterable[Union[str, tokens.Doc]]
+    ) -> Iterator[tokens.Doc]:
+        """Tokenizes texts without going through `Language.pipe`.
+
+        Used when every processor reads lexeme attributes only, so no
+            pipeline component needs to run. Docs are passed through as is.
+
+        Args:
+            texts: An iterable of texts or docs.
+
+        Yields:
+            Tokenized docs.
+        """
+        for text in texts:
+            yield (
+                text
+                if isinstance(text, tokens.Doc)
+                else self.model.make_doc(text)
+            )
+
+    def _unused_pipes(self, owned: Optional[str] = None) -> List[str]:
+        """Finds the pipeline components that the processors do not need.
+
+        A component is needed if it assigns a token attribute that a
+            processor reads, directly or through `_ATTR_DEPENDENCIES`.
+            Components that do not declare what they assign are kept, unless
+            the processors only read lexeme attributes, as are embedding
+            components that needed components listen to and the worker
+            component of the call. Components that retokenize change the
+            tokens themselves, so they are always kept, along with the
+            components that assign the attributes they require.
+
+        Args:
+            owned: The name of the worker component of the call, if any.
+
+        Returns:
+            The names of the unused components.
+        """
+        attrs = helpers.required_attrs(*self.processors)
+        if attrs is None:
+            return []
+        metas = {
+            name: self.model.get_pipe_meta(name)
+            for name in self.model.pipe_names
+        }
+        retokenizers = {
+            name for name, meta in metas.items() if meta.retokenizes
+        }
+        needed = set(attrs)
+        for name in retokenizers:
+            needed.update(metas[name].requires)
+        for attr in list(needed):
+            needed.update(_ATTR_DEPENDENCIES.get(attr, ()))
+        needed -= helpers.LEXICAL_ATTRS
+        keep = {
+            name
+            for name, meta in metas.items()
+            if name == owned
+            or name in retokenizers
+            or (needed and not meta.assigns)
+            or needed.intersection(meta.assigns)
+        }
+        keep.update(
+            name
+            for name, pipe in self.model.pipeline
+            if keep.intersection(getattr(pipe, "listening_components", ()))
+        )
+        return [name for name in self.model.pipe_names if name not in keep]
+
+    def _retokenizes(self, disable: Iterable[str]) -> bool:
+        """Whether any enabled component of the model retokenizes.
+
+        Args:
+            disable: The pipeline components that are disabled.
+
+        Returns:
+            `True` if a component that is not disabled changes the tokens.
+        """
+        disabled = set(disable)
+        return any(
+            self.model.get_pipe_meta(name).retokenizes
+            for name in self.model.pipe_names
+            if name not in disabled
+        )
+
+    def _worker_pipes(self, owned: Optional[str] = None) -> List[str]:
+        """Finds the worker components added to the model by other calls.
+
+        Args:
+            owned: The name of the worker component of this call, if any.
+
+        Returns:
+            The names of the worker components, except `owned`.
+        """
+        return [
+            name
+            for name in self.model.pipe_names
+            if name.startswith(_WORKER_PREFIX) and name != owned
+        ]
+
+    @contextlib.contextmanager
+    def _worker_component(self) -> Iterator[str]:
+        """Adds a `spacy_cleaner` component to the end of the model.
+
+        The component is removed again on exit. It is disabled in the calls
+            of other cleaners, see `_worker_pipes`.
+
+        Yields:
+            The name of the component, which is configured with the
+                processors of the cleaner.
+        """
+        name = f"{_WORKER_PREFIX}{next(_component_ids)}"
+        component = cast(
+            components.CleanerComponent,
+            self.model.add_pipe("spacy_cleaner", name=name, last=True),
+        )
+        # Worker processes cannot report their measurements, so they run
+        # the chain without the sampling wrappers.
+        component.processors = (
+            self._processors if self._profile is None else self._unprofiled
+        )
+        component.keep_whitespace = self.keep_whitespace
+        try:
+            yield name
+        finally:
+            self.model.remove_pipe(name)
+
+
+class MultiCleaner:
+    """Cleans a sequence of texts with several processor chains at once.
+
+    Each text is parsed once, with the components that any of the chains
+    need, and every chain cleans the same parsed doc.
+
+    Args:
+        model: A `spaCy` model.
+        chains: Callable token processors, by output name.
+        auto_disable: Whether to disable the pipeline components that none of
+            the chains need, see `Cleaner`.
+        lexeme_cache_size: The maximum number of words whose result is
+            cached for each chain, see `Cleaner`.
+        keep_whitespace: Whether to keep the original whitespace after each
+            kept token instead of joining tokens with single spaces.
+        progress: Whether to show a progress bar while cleaning.
+
+    Example:
+        ```python
+        cleaner = MultiCleaner(
+            model,
+            {
+                "topics": [
+                    processing.remove_stopword_token,
+                    processing.mutate_lemma_token,
+                ],
+                "classifier": [processing.replace_punctuation_token],
+            },
+        )
+        cleaner.clean(["Hello, my name is Cellan!"])
+        [{'topics': 'Hello , Cellan !',
+          'classifier': 'Hello _IS_PUNCT_ my name is Cellan _IS_PUNCT_'}]
+        ```
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        model: spacy.Language,
+        chains: Mapping[
+            str, Sequence[Callable[[tokens.Token], Union[str, tokens.Token]]]
+        ],
+        *,
+        auto_disable: bool = True,
+        lexeme_cache_size: int = 2**16,
+        keep_whitespace: bool = False,
+        progress: bool = True,
+    ) -> None:
+        self.model = model
+        self.progress = progress
+        self.cleaners = {
+            name: Cleaner(
+                model,
+                *processors,
+                auto_disable=auto_disable,
+                lexeme_cache_size=lexeme_cache_size,
+                keep_whitespace=keep_whitespace,
+            )
+            for name, processors in chains.items()
+        }
+        self._parser = Cleaner(
+            model,
+            *itertools.chain.from_iterable(chains.values()),
+            auto_disable=auto_disable,
+            lexeme_cache_size=0,
+        )
+
+    # noinspection PyTypeChecker,PyDefaultArgumentdd,PyDefaultArgument
+    def clean(  # noqa: PLR0913
+        self,
+        texts: Iterable[Union[str, tokens.Doc]],
+        *,
+        batch_size: Optional[int] = None,
+        disable: Iterable[str] = util.SimpleFrozenList(),
+        component_cfg: Optional[Dict[str, Dict[str, Any]]] = None,
+        n_process: int = 1,
+    ) -> List[Dict[str, str]]:
+        """Clean a stream of texts with every chain.
+
+        Args:
+            texts: A sequence of texts or docs to process.
+            batch_size: The number of texts to buffer.
+            disable: The pipeline components to disable.
+            component_cfg: An optional dictionary with extra keyword arguments
+                for specific components.
+            n_process: Number of processors to parse texts.
+
+        Returns:
+            A record of cleaned strings by chain name for each text, in the
+                order of the original text.
+        """
+        return list(
+            self.clean_iter(
+                texts,
+                batch_size=batch_size,
+                disable=disable,
+                component_cfg=component_cfg,
+                n_process=n_process,
+            )
+        )
+
+    # noinspection PyTypeChecker,PyDefaultArgumentdd,PyDefaultArgument
+    def clean_iter(  # noqa: PLR0913
+        self,
+        texts: Iterable[Union[str, tokens.Doc]],
+        *,
+        batch_size: Optional[int] = None,
+        disable: Iterable[str] = util.SimpleFrozenList(),
+        component_cfg: Optional[Dict[str, Dict[str, Any]]] = None,
+        n_process: int = 1,
+    ) -> Iterator[Dict[str, str]]:
+        """Lazily clean a stream of texts with every chain.
+
+        Args:
+            texts: An iterable of texts or docs to process.
+            batch_size: The number of texts to buffer.
+            disable: The pipeline components to disable.
+            component_cfg: An optional dictionary with extra keyword arguments
+                for specific components.
+            n_process: Number of processors to parse texts.
+
+        Yields:
+            A record of cleaned strings by chain name for each text, in the
+                order of the original text.
+        """
+        total = len(texts) if isinstance(texts, Sized) else None
+        docs = self._parser.parse(
+            texts,
+            batch_size=batch_size,
+            disable=disable,
+            component_cfg=component_cfg,
+            n_process=n_process,
+        )
+        for doc in tqdm.tqdm(
+            docs,
+            desc="Cleaning Progress",
+            total=total,
+            disable=not self.progress,
+        ):
+            yield {
+                name: cleaner.clean_doc(doc)
+                for name, cleaner in self.cleaners.items()
+            }
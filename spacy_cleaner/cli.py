@@ -0,0 +1,344 @@
+"""The `spacy-cleaner` command line interface.
+
+The `clean` command cleans a file of plain text lines, a JSONL file or a CSV
+file with a `spaCy` model and a list of processors, writing a file of the
+same format. Records are streamed, so memory use does not depend on the size
+of the file. With `--shard i/N`, only every N-th record, starting at record
+i, is cleaned, so a file can be split deterministically across machines. The
+`merge` command interleaves the shard outputs back into the original order.
+The `serve` command serves a cleaner over HTTP, see `spacy_cleaner.server`.
+
+A typical usage example:
+    ```bash
+    spacy-cleaner clean en_core_web_sm reviews.jsonl cleaned.jsonl \
+        --format jsonl --field body \
+        --processors remove_stopword_token mutate_lemma_token \
+        --n-process 4
+    ```
+
+    Split across two machines and merge the outputs:
+    ```bash
+    spacy-cleaner clean en_core_web_sm in.txt out.0.txt \
+        -p remove_stopword_token --shard 0/2
+    spacy-cleaner clean en_core_web_sm in.txt out.1.txt \
+        -p remove_stopword_token --shard 1/2
+    spacy-cleaner merge out.txt out.0.txt out.1.txt
+    ```
+"""
+
+import argparse
+import contextlib
+import csv
+import itertools
+import json
+import pathlib
+import sys
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+import spacy
+
+from spacy_cleaner import cleaners, components, server
+
+FORMATS = ("text", "jsonl", "csv")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Runs the command line interface.
+
+    Args:
+        argv: The command line arguments, without the program name. Defaults
+            to `sys.argv[1:]`.
+
+    Returns:
+        The exit status.
+    """
+    args = _parser().parse_args(argv)
+    return int(args.command(args))
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="spacy-cleaner", description="Easily clean text with spaCy!"
+    )
+    commands = parser.add_subparsers(required=True, metavar="command")
+
+    clean = commands.add_parser("clean", help="Clean a file of texts.")
+    clean.set_defaults(command=_clean)
+    clean.add_argument("model", help="The name or path of a spaCy model.")
+    clean.add_argument("input", type=pathlib.Path, help="The input file.")
+    clean.add_argument("output", type=pathlib.Path, help="The output file.")
+    clean.add_argument(
+        "-p",
+        "--processors",
+        nargs="+",
+        required=True,
+        help="Processors from spacy_cleaner.processing or import paths.",
+    )
+    _add_format_arguments(clean)
+    clean.add_argument(
+        "--output-field",
+        help="The JSONL field or CSV column for the cleaned text. "
+        "Defaults to --field.",
+    )
+    clean.add_argument("--batch-size", type=int, default=1000)
+    clean.add_argument(
+        "--n-process",
+        type=int,
+        default=1,
+        help="The number of worker processes. -1 uses every CPU.",
+    )
+    clean.add_argument(
+        "--shard",
+        type=_shard,
+        default=(0, 1),
+        metavar="i/N",
+        help="Only clean the records whose index modulo N is i.",
+    )
+    clean.add_argument(
+        "--keep-whitespace", action="store_true", help="Keep whitespace."
+    )
+
+    serve = commands.add_parser(
+        "serve", help="Serve a cleaner over HTTP, see spacy_cleaner.server."
+    )
+    serve.set_defaults(command=_serve)
+    serve.add_argument("model", help="The name or path of a spaCy model.")
+    serve.add_argument(
+        "-p",
+        "--processors",
+        nargs="+",
+        required=True,
+        help="Processors from spacy_cleaner.processing or import paths.",
+    )
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument(
+        "--max-latency",
+        type=float,
+        default=0.005,
+        help="The maximum time, in seconds, a text waits for a batch.",
+    )
+    serve.add_argument("--max-batch-size", type=int, default=256)
+    serve.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="The number of worker processes. 0 cleans in a thread.",
+    )
+    serve.add_argument(
+        "--keep-whitespace", action="store_true", help="Keep whitespace."
+    )
+
+    merge = commands.add_parser(
+        "merge", help="Merge the outputs of all shards, in order."
+    )
+    merge.set_defaults(command=_merge)
+    merge.add_argument("output", type=pathlib.Path, help="The output file.")
+    merge.add_argument(
+        "shards",
+        type=pathlib.Path,
+        nargs="+",
+        help="The shard outputs, from shard 0 to shard N-1.",
+    )
+    _add_format_arguments(merge)
+    return parser
+
+
+def _add_format_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=FORMATS,
+        default="text",
+        help="text: one text per line. jsonl: one JSON object per line. "
+        "csv: a CSV file with a header.",
+    )
+    parser.add_argument(
+        "--field",
+        default="text",
+        help="The JSONL field or CSV column holding the text.",
+    )
+
+
+def _shard(value: str) -> Tuple[int, int]:
+    """Parses a `--shard` argument.
+
+    Args:
+        value: The argument, e.g. `0/4`.
+
+    Returns:
+        The index of the shard and the number of shards.
+
+    Raises:
+        argparse.ArgumentTypeError: If the argument is not a valid shard.
+    """
+    index, _, count = value.partition("/")
+    try:
+        shard = int(index), int(count)
+    except ValueError:
+        shard = (-1, 0)
+    if not 0 <= shard[0] < shard[1]:
+        msg = f"Expected i/N with 0 <= i < N, got {value!r}."
+        raise argparse.ArgumentTypeError(msg)
+    return shard
+
+
+def _clean(args: argparse.Namespace) -> int:
+    cleaner = cleaners.Cleaner(
+        spacy.load(args.model),
+        *components.resolve_processors(args.processors),
+        keep_whitespace=args.keep_whitespace,
+    )
+    index, count = args.shard
+    output_field = args.output_field or args.field
+    with contextlib.ExitStack() as stack:
+        fieldnames, records = _read(stack, args.input, args.format)
+        if output_field not in fieldnames and args.format == "csv":
+            fieldnames = [*fieldnames, output_field]
+        numbered, sources = itertools.tee(
+            itertools.islice(enumerate(records, 1), index, None, count)
+        )
+        cleaned = cleaner.clean_iter(
+            (
+                _get(record, args.format, args.field, number)
+                for number, record in sources
+            ),
+            batch_size=args.batch_size,
+            n_process=args.n_process,
+        )
+        _write(
+            stack,
+            args.output,
+            args.format,
+            fieldnames,
+            (
+                _set(record, args.format, output_field, text)
+                for (_, record), text in zip(numbered, cleaned)
+            ),
+        )
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    cleaner = cleaners.Cleaner(
+        spacy.load(args.model),
+        *components.resolve_processors(args.processors),
+        keep_whitespace=args.keep_whitespace,
+        progress=False,
+    )
+    with server.CleanerServer(
+        (args.host, args.port),
+        cleaner,
+        max_latency=args.max_latency,
+        max_batch_size=args.max_batch_size,
+        workers=args.workers,
+    ) as httpd, contextlib.suppress(KeyboardInterrupt):
+        httpd.serve_forever()
+    return 0
+
+
+def _merge(args: argparse.Namespace) -> int:
+    with contextlib.ExitStack() as stack:
+        shards = [_read(stack, path, args.format) for path in args.shards]
+        fieldnames = shards[0][0]
+        merged = (
+            record
+            for records in itertools.zip_longest(
+                *(records for _, records in shards), fillvalue=_MISSING
+            )
+            for record in records
+            if record is not _MISSING
+        )
+        _write(stack, args.output, args.format, fieldnames, merged)
+    return 0
+
+
+_MISSING = object()
+
+
+def _read(
+    stack: contextlib.ExitStack, path: pathlib.Path, fmt: str
+) -> Tuple[List[str], Iterator[Any]]:
+    """Opens a file of records.
+
+    Args:
+        stack: Closes the file on exit.
+        path: The path of the file.
+        fmt: The format of the file.
+
+    Returns:
+        The CSV column names, or an empty list for other formats, and an
+            iterator over the records.
+    """
+    file = stack.enter_context(path.open(encoding="utf8", newline=""))
+    if fmt == "csv":
+        reader = csv.DictReader(file)
+        return list(reader.fieldnames or ()), iter(reader)
+    lines = (line.rstrip("\r\n") for line in file)
+    if fmt == "jsonl":
+        return [], (json.loads(line) for line in lines if line)
+    return [], lines
+
+
+def _write(
+    stack: contextlib.ExitStack,
+    path: pathlib.Path,
+    fmt: str,
+    fieldnames: List[str],
+    records: Iterator[Any],
+) -> None:
+    """Writes records to a file, one at a time.
+
+    Args:
+        stack: Closes the file on exit.
+        path: The path of the file.
+        fmt: The format of the file.
+        fieldnames: The CSV column names.
+        records: The records to write.
+    """
+    file = stack.enter_context(path.open("w", encoding="utf8", newline=""))
+    if fmt == "csv":
+        writer = csv.DictWriter(file, fieldnames)
+        writer.writeheader()
+        writer.writerows(records)
+        return
+    for record in records:
+        file.write(
+            f"{json.dumps(record, ensure_ascii=False)}\n"
+            if fmt == "jsonl"
+            else f"{record}\n"
+        )
+
+
+def _get(record: Any, fmt: str, field: str, number: int) -> str:  # noqa: ANN401
+    """Reads the text of a record.
+
+    Args:
+        record: The record.
+        fmt: The format of the file.
+        field: The JSONL field or CSV column holding the text.
+        number: The position of the record in the file, from 1.
+
+    Returns:
+        The text, or an empty string if the field is null.
+
+    Raises:
+        ValueError: If the record has no such field.
+    """
+    if fmt == "text":
+        return str(record)
+    if field not in record:
+        msg = f"Record {number} has no field {field!r}."
+        raise ValueError(msg)
+    value = record[field]
+    return "" if value is None else str(value)
+
+
+def _set(record: Any, fmt: str, field: str, text: str) -> Any:  # noqa: ANN401
+    if fmt == "text":
+        return text
+    return {**record, field: text}
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Run `spacy-cleaner` as a `spaCy` pipeline component.
+
+This module registers the `spacy_cleaner` factory. The component cleans each
+`Doc` with a chain of token processors and stores the result on the
+`Doc._.cleaned` extension.
+
+A typical usage example:
+    ```python
+    import spacy
+    import spacy_cleaner.components
+
+    nlp = spacy.blank("en")
+    nlp.add_pipe(
+        "spacy_cleaner",
+        config={
+            "processors": {
+                "@misc": "spacy_cleaner.processors.v1",
+                "names": ["remove_stopword_token", "replace_punctuation_token"],
+            },
+            "keep_doc": True,
+        },
+    )
+    nlp("Hello, my name is Cellan!")._.cleaned
+    ```
+    Calling the pipeline returns a `Doc` whose `cleaned` extension is
+    `Hello _IS_PUNCT_ Cellan _IS_PUNCT_`.
+"""
+
+import importlib
+from typing import Callable, List, Sequence, Tuple, Union
+
+import spacy
+from spacy import tokens
+
+from spacy_cleaner import processing
+from spacy_cleaner.processing import helpers
+
+Processor = Callable[[tokens.Token], Union[str, tokens.Token]]
+
+if not tokens.Doc.has_extension("cleaned"):
+    tokens.Doc.set_extension("cleaned", default=None)
+
+
+class CleanerComponent:
+    """Cleans a `Doc` and stores the cleaned string on `Doc._.cleaned`.
+
+    By default the component returns an empty `Doc` that only carries the
+    cleaned string. When `Language.pipe` runs with `n_process > 1`, each
+    `Doc` is serialised back to the parent process, so dropping the tokens
+    means only the cleaned string crosses the process boundary.
+
+    Args:
+        processors: Callable token processors.
+        keep_doc: Whether to return the original `Doc` instead of an empty
+            one.
+        keep_whitespace: Whether to keep the original whitespace of the kept
+            tokens, see `helpers.clean_doc`.
+    """
+
+    def __init__(
+        self,
+        processors: Sequence[Processor],
+        *,
+        keep_doc: bool = False,
+        keep_whitespace: bool = False,
+    ) -> None:
+        self.processors = tuple(processors)
+        self.keep_doc = keep_doc
+        self.keep_whitespace = keep_whitespace
+
+    def __call__(self, doc: tokens.Doc) -> tokens.Doc:
+        """Cleans a `Doc`.
+
+        Args:
+            doc: The `Doc` to clean.
+
+        Returns:
+            A `Doc` with the cleaned string set on `Doc._.cleaned`.
+        """
+        cleaned = helpers.clean_doc(
+            doc, *self.processors, keep_whitespace=self.keep_whitespace
+        )
+        if not self.keep_doc:
+            stub = tokens.Doc(doc.vocab)
+            stub._context = doc._context  # noqa: SLF001
+            doc = stub
+        doc._.cleaned = cleaned  # noqa: SLF001
+        return doc
+
+
+@spacy.registry.misc("spacy_cleaner.processors.v1")
+def resolve_processors(names: List[str]) -> Tuple[Processor, ...]:
+    """Resolves token processors by name.
+
+    Names are looked up in `spacy_cleaner.processing` first, then imported
+    as dotted paths, e.g. `my_package.module.my_processor`.
+
+    Args:
+        names: Names of the token processors.
+
+    Returns:
+        The token processors in the given order.
+    """
+    return tuple(_resolve_processor(name) for name in names)
+
+
+_PROCESSORS = frozenset(
+    name for name in processing.__all__ if callable(getattr(processing, name))
+)
+
+
+def _resolve_processor(name: str) -> Processor:
+    if name in _PROCESSORS:
+        return getattr(processing, name)  # type: ignore[no-any-return]
+    module_name, _, attr = name.rpartition(".")
+    if not module_name:
+        msg = f"Unknown processor: {name!r}."
+        raise ValueError(msg)
+    return getattr(  # type: ignore[no-any-return]
+        importlib.import_module(module_name), attr
+    )
+
+
+@spacy.Language.factory(
+    "spacy_cleaner",
+    assigns=["doc._.cleaned"],
+    default_config={
+        "processors": {"@misc": "spacy_cleaner.processors.v1", "names": []},
+        "keep_doc": False,
+        "keep_whitespace": False,
+    },
+)
+def make_cleaner_component(
+    nlp: spacy.Language,  # noqa: ARG001
+    name: str,  # noqa: ARG001
+    processors: Sequence[Processor],
+    keep_doc: bool,  # noqa: FBT001
+    keep_whitespace: bool,  # noqa: FBT001
+) -> CleanerComponent:
+    """Creates a `CleanerComponent`.
+
+    Args:
+        nlp: The `spaCy` pipeline.
+        name: The name of the component.
+        processors: Callable token processors.
+        keep_doc: Whether to return the original `Doc` instead of an empty
+            one.
+        keep_whitespace: Whether to keep the original whitespace of the kept
+            tokens.
+
+    Returns:
+        The component.
+    """
+    return CleanerComponent(
+        processors, keep_doc=keep_doc, keep_whitespace=keep_whitespace
+    )
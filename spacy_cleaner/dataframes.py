@@ -0,0 +1,293 @@
+"""Clean pandas and Arrow columns chunk by chunk.
+
+Converting a column to a Python list, cleaning it with `Cleaner.clean` and
+building a column from the result holds every text twice. The functions
+here read a column one chunk at a time, send the texts of all chunks
+through a single `Cleaner.clean_iter` stream, and build an Arrow string
+array as soon as each chunk is cleaned. Nulls stay null, and pandas output
+keeps the index of its input.
+
+`pandas` and `pyarrow` are optional dependencies: they are only imported
+when these functions are called. Install them with
+`pip install spacy-cleaner[dataframes]`.
+
+A typical usage example:
+    ```python
+    from spacy_cleaner import Cleaner, dataframes, processing
+
+    cleaner = Cleaner(model, processing.remove_stopword_token)
+    df["cleaned"] = dataframes.clean_series(cleaner, df["text"])
+    ```
+    Or, to write the cleaned column to Parquet as it is cleaned:
+    ```python
+    dataframes.write_parquet(cleaner, df["text"], "cleaned.parquet")
+    ```
+"""
+
+import collections
+import importlib
+import os
+from typing import (
+    Any,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from spacy_cleaner import cleaners
+
+_Path = Union[str, "os.PathLike[str]"]
+_Chunk = List[Optional[str]]
+
+
+def clean_arrow(  # noqa: PLR0913
+    cleaner: cleaners.Cleaner,
+    values: Any,  # noqa: ANN401
+    *,
+    chunk_size: int = 2**16,
+    batch_size: Optional[int] = None,
+    n_process: int = 1,
+) -> Any:  # noqa: ANN401
+    """Cleans an Arrow string array or chunked array.
+
+    Args:
+        cleaner: The cleaner to use.
+        values: A `pyarrow.Array` or `pyarrow.ChunkedArray` of strings.
+        chunk_size: The maximum number of values per output chunk.
+        batch_size: The number of texts to buffer.
+        n_process: Number of processors to process texts.
+
+    Returns:
+        A `pyarrow.ChunkedArray` of strings, with a null for each null of
+            `values`.
+    """
+    pa = _import("pyarrow")
+    return pa.chunked_array(
+        list(
+            clean_chunks(
+                cleaner,
+                values,
+                chunk_size=chunk_size,
+                batch_size=batch_size,
+                n_process=n_process,
+            )
+        ),
+        type=pa.string(),
+    )
+
+
+def clean_series(  # noqa: PLR0913
+    cleaner: cleaners.Cleaner,
+    series: Any,  # noqa: ANN401
+    *,
+    chunk_size: int = 2**16,
+    batch_size: Optional[int] = None,
+    n_process: int = 1,
+) -> Any:  # noqa: ANN401
+    """Cleans a pandas Series of strings.
+
+    Args:
+        cleaner: The cleaner to use.
+        series: A `pandas.Series` of strings. Missing values, such as `None`
+            or `NaN`, are not cleaned.
+        chunk_size: The number of values read from the series at a time.
+        batch_size: The number of texts to buffer.
+        n_process: Number of processors to process texts.
+
+    Returns:
+        A `pandas.Series` backed by a `pyarrow` string array, with the index
+            and name of `series` and a missing value for each missing value
+            of `series`.
+    """
+    pd = _import("pandas")
+    return pd.Series(
+        pd.arrays.ArrowExtensionArray(
+            clean_arrow(
+                cleaner,
+                series,
+                chunk_size=chunk_size,
+                batch_size=batch_size,
+                n_process=n_process,
+            )
+        ),
+        index=series.index,
+        name=series.name,
+    )
+
+
+def write_parquet(  # noqa: PLR0913
+    cleaner: cleaners.Cleaner,
+    values: Any,  # noqa: ANN401
+    path: _Path,
+    *,
+    column: str = "cleaned",
+    chunk_size: int = 2**16,
+    batch_size: Optional[int] = None,
+    n_process: int = 1,
+) -> int:
+    """Cleans a column into a Parquet file, one row group per chunk.
+
+    Each row group is written as soon as its chunk is cleaned, so memory use
+        does not grow with the size of the column.
+
+    Args:
+        cleaner: The cleaner to use.
+        values: A `pandas.Series`, `pyarrow.Array` or `pyarrow.ChunkedArray`
+            of strings.
+        path: The path of the Parquet file.
+        column: The name of the column in the file.
+        chunk_size: The maximum number of rows per row group.
+        batch_size: The number of texts to buffer.
+        n_process: Number of processors to process texts.
+
+    Returns:
+        The number of rows written.
+    """
+    pa = _import("pyarrow")
+    parquet = _import("pyarrow.parquet")
+    schema = pa.schema([(column, pa.string())])
+    rows = 0
+    with parquet.ParquetWriter(os.fspath(path), schema) as writer:
+        for chunk in clean_chunks(
+            cleaner,
+            values,
+            chunk_size=chunk_size,
+            batch_size=batch_size,
+            n_process=n_process,
+        ):
+            writer.write_table(pa.Table.from_arrays([chunk], schema=schema))
+            rows += len(chunk)
+    return rows
+
+
+def clean_chunks(  # noqa: PLR0913
+    cleaner: cleaners.Cleaner,
+    values: Any,  # noqa: ANN401
+    *,
+    chunk_size: int = 2**16,
+    batch_size: Optional[int] = None,
+    n_process: int = 1,
+) -> Iterator[Any]:
+    """Lazily cleans a column into Arrow string arrays.
+
+    The texts of every chunk go through a single `Cleaner.clean_iter`
+        stream, so batches of the model are not cut at chunk boundaries.
+
+    Args:
+        cleaner: The cleaner to use.
+        values: A `pandas.Series`, `pyarrow.Array` or `pyarrow.ChunkedArray`
+            of strings.
+        chunk_size: The maximum number of values per chunk.
+        batch_size: The number of texts to buffer.
+        n_process: Number of processors to process texts.
+
+    Yields:
+        A `pyarrow.Array` of strings for each chunk of `values`, in order.
+    """
+    pa = _import("pyarrow")
+    pending: Deque[Tuple[_Chunk, int]] = collections.deque()
+    cleaned: List[str] = []
+    for text in cleaner.clean_iter(
+        _read_chunks(_chunks(values, chunk_size), pending),
+        batch_size=batch_size,
+        n_process=n_process,
+    ):
+        while pending[0][1] == len(cleaned):
+            yield _fill(pa, pending.popleft()[0], cleaned)
+            cleaned = []
+        cleaned.append(text)
+    while pending:
+        yield _fill(pa, pending.popleft()[0], cleaned)
+        cleaned = []
+
+
+def _import(name: str) -> Any:  # noqa: ANN401
+    """Imports an optional dependency.
+
+    Args:
+        name: The name of the module.
+
+    Returns:
+        The module.
+
+    Raises:
+        ImportError: If the module is not installed.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        package = name.split(".", 1)[0]
+        msg = (
+            f"Cleaning columns requires `{package}`. Install it with "
+            f"`pip install {package}` or `pip install "
+            "spacy-cleaner[dataframes]`."
+        )
+        raise ImportError(msg) from e
+
+
+def _chunks(values: Any, chunk_size: int) -> Iterator[_Chunk]:  # noqa: ANN401
+    """Reads a column in chunks, with `None` for missing values.
+
+    Args:
+        values: A `pandas.Series`, `pyarrow.Array` or `pyarrow.ChunkedArray`.
+        chunk_size: The maximum number of values per chunk.
+
+    Yields:
+        The values of each chunk.
+    """
+    pa = _import("pyarrow")
+    if hasattr(values, "iloc"):
+        for start in range(0, len(values), chunk_size):
+            yield pa.array(
+                values.iloc[start : start + chunk_size],
+                type=pa.string(),
+                from_pandas=True,
+            ).to_pylist()
+        return
+    arrays = values.chunks if isinstance(values, pa.ChunkedArray) else [values]
+    for array in arrays:
+        for start in range(0, len(array), chunk_size):
+            yield array.slice(start, chunk_size).to_pylist()
+
+
+def _read_chunks(
+    chunks: Iterable[_Chunk], pending: Deque[Tuple[_Chunk, int]]
+) -> Iterator[str]:
+    """Yields the texts of each chunk, skipping missing values.
+
+    Before the texts of a chunk are yielded, the chunk and its number of
+        texts are added to `pending`.
+
+    Args:
+        chunks: The values of each chunk.
+        pending: The chunks that were read but not yet cleaned.
+
+    Yields:
+        The texts.
+    """
+    for chunk in chunks:
+        texts = [value for value in chunk if value is not None]
+        pending.append((chunk, len(texts)))
+        yield from texts
+
+
+def _fill(pa: Any, chunk: _Chunk, cleaned: List[str]) -> Any:  # noqa: ANN401
+    """Builds the cleaned array of a chunk.
+
+    Args:
+        pa: The `pyarrow` module.
+        chunk: The values of the chunk.
+        cleaned: The cleaned texts of the chunk, in order.
+
+    Returns:
+        A `pyarrow.Array` of strings, with nulls where `chunk` has `None`.
+    """
+    texts = iter(cleaned)
+    return pa.array(
+        [None if value is None else next(texts) for value in chunk],
+        type=pa.string(),
+    )
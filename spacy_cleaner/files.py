@@ -0,0 +1,291 @@
+"""Clean line-delimited files of any size.
+
+The input file is memory-mapped and split into ranges of whole lines, which
+are read one line at a time and cleaned as a stream. Cleaned lines are
+written to the output file as they come, so memory use depends on the batch
+size and the range size, not on the size of the file.
+
+A typical usage example:
+    ```python
+    import spacy
+    from spacy_cleaner import Cleaner, files, processing
+
+    cleaner = Cleaner(
+        spacy.load("en_core_web_sm"), processing.remove_stopword_token
+    )
+    files.clean_file(cleaner, "dump.txt", "cleaned.txt", n_process=4)
+    ```
+    Each line of `dump.txt` is cleaned into the same line of `cleaned.txt`.
+
+    To make a long job resumable, pass a checkpoint file:
+    ```python
+    files.clean_file(
+        cleaner, "dump.txt", "cleaned.txt", checkpoint="cleaned.checkpoint"
+    )
+    ```
+    If the job is stopped, running the same call again resumes after the
+    last committed range.
+"""
+
+import collections
+import contextlib
+import json
+import mmap
+import os
+import pathlib
+from typing import (
+    Deque,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from spacy_cleaner import cleaners
+
+_Path = Union[str, "os.PathLike[str]"]
+
+
+def line_ranges(
+    data: Union[bytes, mmap.mmap], range_size: int, start: int = 0
+) -> Iterator[Tuple[int, int]]:
+    """Splits data into ranges of whole lines.
+
+    Only the byte at the end of each range is looked at, so the data is not
+        read in full.
+
+    Args:
+        data: The data, such as a memory-mapped file.
+        range_size: The approximate number of bytes per range. A range ends
+            at the first line break after `range_size` bytes.
+        start: The offset of the first range, at the start of a line.
+
+    Yields:
+        The start and end offsets of each range.
+    """
+    size = len(data)
+    while start < size:
+        end = data.find(b"\n", min(start + range_size, size) - 1) + 1 or size
+        yield start, end
+        start = end
+
+
+def read_lines(
+    data: Union[bytes, mmap.mmap],
+    start: int,
+    end: int,
+    encoding: str = "utf8",
+) -> Iterator[str]:
+    """Reads the lines of a range, one at a time.
+
+    Args:
+        data: The data, such as a memory-mapped file.
+        start: The offset of the first line.
+        end: The offset after the last line.
+        encoding: The encoding of the data.
+
+    Yields:
+        The lines, without line breaks.
+    """
+    while start < end:
+        stop = data.find(b"\n", start, end)
+        stop = end if stop == -1 else stop
+        yield data[start:stop].rstrip(b"\r").decode(encoding)
+        start = stop + 1
+
+
+class Checkpoint(NamedTuple):
+    """The progress of a `clean_file` job.
+
+    Attributes:
+        source_size: The size of the input file, in bytes.
+        source_offset: The offset after the last input line whose output is
+            committed.
+        output_offset: The size of the committed output, in bytes.
+        lines: The number of committed lines.
+    """
+
+    source_size: int
+    source_offset: int
+    output_offset: int
+    lines: int
+
+    @classmethod
+    def load(cls: Type["Checkpoint"], path: _Path) -> Optional["Checkpoint"]:
+        """Reads a checkpoint file.
+
+        Args:
+            path: The path of the checkpoint file.
+
+        Returns:
+            The checkpoint, or `None` if the file does not exist.
+        """
+        try:
+            text = pathlib.Path(path).read_text(encoding="utf8")
+        except FileNotFoundError:
+            return None
+        return cls(**json.loads(text))
+
+    def save(self, path: _Path) -> None:
+        """Atomically replaces a checkpoint file.
+
+        Args:
+            path: The path of the checkpoint file.
+        """
+        path = pathlib.Path(path)
+        temporary = path.with_name(f"{path.name}.tmp")
+        with temporary.open("w", encoding="utf8") as file:
+            json.dump(self._asdict(), file)
+            file.flush()
+            os.fsync(file.fileno())
+        temporary.replace(path)
+
+
+def clean_file(  # noqa: PLR0913
+    cleaner: cleaners.Cleaner,
+    source: _Path,
+    destination: _Path,
+    *,
+    range_size: int = 2**24,
+    batch_size: Optional[int] = None,
+    n_process: int = 1,
+    encoding: str = "utf8",
+    checkpoint: Optional[_Path] = None,
+) -> int:
+    """Cleans each line of a file into a line of another file.
+
+    With a `checkpoint`, the output is committed one range at a time: once
+        every line of a range is written and synced to disk, the checkpoint
+        file records the offsets after it. If the job stops, calling
+        `clean_file` again with the same arguments drops any output written
+        after the last commit and resumes from the next range, so each line
+        is written exactly once.
+
+    Args:
+        cleaner: The cleaner to use.
+        source: The path of the line-delimited input file.
+        destination: The path of the output file.
+        range_size: The approximate number of bytes read from the input
+            before the pages read so far are released and, with a
+            `checkpoint`, before the output is committed.
+        batch_size: The number of texts to buffer.
+        n_process: Number of processors to process texts.
+        encoding: The encoding of both files.
+        checkpoint: The path of the checkpoint file, to make the job
+            resumable.
+
+    Returns:
+        The number of lines in the output file.
+
+    Raises:
+        ValueError: If the checkpoint was written for a file of another size.
+    """
+    with _open_map(source) as data:
+        done = Checkpoint.load(checkpoint) if checkpoint else None
+        if done is None:
+            done = Checkpoint(len(data), 0, 0, 0)
+        elif done.source_size != len(data):
+            msg = (
+                f"The checkpoint {os.fspath(checkpoint or '')!r} is for an "
+                f"input of {done.source_size} bytes, not {len(data)} bytes."
+            )
+            raise ValueError(msg)
+        pending: Deque[Tuple[int, int]] = collections.deque()
+        with pathlib.Path(destination).open(
+            "r+b" if done.output_offset else "wb"
+        ) as output:
+            output.truncate(done.output_offset)
+            output.seek(done.output_offset)
+            lines = done.lines
+            for cleaned in cleaner.clean_iter(
+                _read_ranges(
+                    data,
+                    line_ranges(data, range_size, done.source_offset),
+                    encoding,
+                    pending,
+                    lines,
+                ),
+                batch_size=batch_size,
+                n_process=n_process,
+            ):
+                output.write(f"{cleaned}\n".encode(encoding))
+                lines += 1
+                if not pending or pending[0][1] != lines:
+                    continue
+                offset = pending.popleft()[0]
+                if checkpoint:
+                    output.flush()
+                    os.fsync(output.fileno())
+                    state = Checkpoint(len(data), offset, output.tell(), lines)
+                    state.save(checkpoint)
+    return lines
+
+
+def _read_ranges(
+    data: Union[bytes, mmap.mmap],
+    ranges: Iterable[Tuple[int, int]],
+    encoding: str,
+    pending: Deque[Tuple[int, int]],
+    lines: int,
+) -> Iterator[str]:
+    """Reads the lines of each range, then releases its pages.
+
+    Before the last line of a range is yielded, the end offset of the range
+        and the number of lines up to it are added to `pending`.
+
+    Args:
+        data: The data, such as a memory-mapped file.
+        ranges: The start and end offsets of each range.
+        encoding: The encoding of the data.
+        pending: The ranges that were read but not yet committed.
+        lines: The number of lines before the first range.
+
+    Yields:
+        The lines, without line breaks.
+    """
+    for start, end in ranges:
+        range_lines = read_lines(data, start, end, encoding)
+        previous = next(range_lines)
+        for line in range_lines:
+            yield previous
+            previous = line
+            lines += 1
+        lines += 1
+        pending.append((end, lines))
+        yield previous
+        _release(data, start, end)
+
+
+def _release(data: Union[bytes, mmap.mmap], start: int, end: int) -> None:
+    """Lets the OS drop the pages of a range from memory, where supported.
+
+    Args:
+        data: The data, such as a memory-mapped file.
+        start: The start offset of the range.
+        end: The end offset of the range.
+    """
+    if isinstance(data, mmap.mmap) and hasattr(mmap, "MADV_DONTNEED"):
+        start -= start % mmap.PAGESIZE
+        data.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+
+@contextlib.contextmanager
+def _open_map(path: _Path) -> Iterator[Union[bytes, mmap.mmap]]:
+    """Memory-maps a file for reading.
+
+    Args:
+        path: The path of the file.
+
+    Yields:
+        The memory-mapped file, or empty bytes for an empty file, which
+            cannot be mapped.
+    """
+    with pathlib.Path(path).open("rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
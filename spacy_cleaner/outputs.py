@@ -0,0 +1,247 @@
+"""Clean docs into arrays instead of strings.
+
+`Cleaner.clean` joins the kept tokens of each doc into a string. Training
+code usually splits that string again to look up vocabulary IDs. The
+functions here skip the string: they return the `orth` hash of each kept
+token, the hash of its replacement, or a small reserved ID when the
+replacement is a placeholder such as `_IS_PUNCT_`. Hashes can be turned
+back into strings with `model.vocab.strings`.
+
+A typical usage example:
+    ```python
+    from spacy_cleaner import Cleaner, processing
+
+    cleaner = Cleaner(
+        model,
+        processing.remove_stopword_token,
+        processing.replace_punctuation_token,
+    )
+    for batch in cleaner.token_id_batches(texts, batch_size=256):
+        train(batch.data, batch.offsets)
+    ```
+    `batch.data` holds the IDs of every doc of the batch, one after the other,
+    and doc `i` is `batch.data[batch.offsets[i]:batch.offsets[i + 1]]`.
+
+    To find which parts of a text survive cleaning, without copying them:
+    ```python
+    kept = next(cleaner.kept_tokens([text]))
+    kept.offsets  # The (start, end) character offsets of each kept token.
+    list(kept.spans(text))
+    ```
+"""
+
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Type,
+    Union,
+)
+
+import numpy as np
+from spacy import tokens
+
+from spacy_cleaner.processing import helpers
+
+ID_DTYPE = np.uint64
+"""The type of token IDs, which is the type of `spaCy` hashes."""
+
+KEPT = 0
+"""The replacement code of a token that was kept unchanged."""
+
+CHANGED = -1
+"""The replacement code of a token changed to a string that is not a
+placeholder, such as its lemma."""
+
+
+class RaggedArray:
+    """A batch of arrays of different lengths, stored one after the other.
+
+    Args:
+        data: The items of every array, concatenated.
+        offsets: The start of each array in `data`, followed by the length
+            of `data`.
+    """
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray) -> None:
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_lists(
+        cls: Type["RaggedArray"],
+        lists: Iterable[List[int]],
+        dtype: type = ID_DTYPE,
+    ) -> "RaggedArray":
+        """Builds a batch from lists, with a single copy of the items.
+
+        Args:
+            lists: The items of each array.
+            dtype: The type of the items.
+
+        Returns:
+            The batch.
+        """
+        items: List[int] = []
+        offsets = [0]
+        for values in lists:
+            items.extend(values)
+            offsets.append(len(items))
+        return cls(
+            np.array(items, dtype=dtype), np.array(offsets, dtype=np.int64)
+        )
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """The length of each array."""
+        return np.diff(self.offsets)
+
+    def __len__(self) -> int:
+        """The number of arrays."""
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        """A view of an array.
+
+        Args:
+            i: The index of the array.
+
+        Returns:
+            The items of the array, without a copy.
+
+        Raises:
+            IndexError: If there is no array at `i`.
+        """
+        if not -len(self) <= i < len(self):
+            msg = "RaggedArray index out of range."
+            raise IndexError(msg)
+        i %= len(self)
+        return self.data[self.offsets[i] : self.offsets[i + 1]]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """Views of each array, in order."""
+        return (self[i] for i in range(len(self)))
+
+
+def token_id_list(
+    doc: tokens.Doc,
+    *processors: Callable[[tokens.Token], Union[str, tokens.Token]],
+    placeholders: Mapping[str, int],
+) -> List[int]:
+    """Cleans a document into a list of token IDs.
+
+    Like `helpers.clean_doc`, tokens that are processed to an empty or
+        whitespace-only string are left out.
+
+    Args:
+        doc: spaCy document to be cleaned.
+        *processors: Callable token processors.
+        placeholders: The reserved ID of each placeholder string. Reserved
+            IDs must not be `0`.
+
+    Returns:
+        The ID of each kept token: its reserved ID if its string is a
+            placeholder, else the hash of its string, which is the `orth` of
+            tokens that were not changed.
+    """
+    add = doc.vocab.strings.add
+    get = placeholders.get
+    return [
+        get(text) or add(text)
+        for text in helpers.token_texts(doc, *processors)
+        if text and not text.isspace()
+    ]
+
+
+def token_ids(
+    doc: tokens.Doc,
+    *processors: Callable[[tokens.Token], Union[str, tokens.Token]],
+    placeholders: Mapping[str, int],
+) -> np.ndarray:
+    """Cleans a document into an array of token IDs.
+
+    Args:
+        doc: spaCy document to be cleaned.
+        *processors: Callable token processors.
+        placeholders: The reserved ID of each placeholder string.
+
+    Returns:
+        The IDs of the kept tokens, see `token_id_list`.
+    """
+    return np.array(
+        token_id_list(doc, *processors, placeholders=placeholders),
+        dtype=ID_DTYPE,
+    )
+
+
+class KeptTokens(NamedTuple):
+    """The tokens of a document that survive cleaning.
+
+    Attributes:
+        indices: The index of each kept token in the document.
+        offsets: The `(start, end)` character offsets of each kept token in
+            the text of the document, with shape `(n, 2)`.
+        codes: The replacement code of each kept token: `KEPT`, `CHANGED`,
+            or the reserved ID of its placeholder.
+    """
+
+    indices: np.ndarray
+    offsets: np.ndarray
+    codes: np.ndarray
+
+    def spans(self, text: str) -> Iterator[str]:
+        """Lazily slices the kept tokens out of the original text.
+
+        Args:
+            text: The text of the document.
+
+        Yields:
+            The original text of each kept token.
+        """
+        for start, end in self.offsets.tolist():
+            yield text[start:end]
+
+
+def kept_tokens(
+    doc: tokens.Doc,
+    *processors: Callable[[tokens.Token], Union[str, tokens.Token]],
+    placeholders: Mapping[str, int],
+) -> KeptTokens:
+    """Cleans a document into the positions of its kept tokens.
+
+    The positions and codes are collected in the same pass over the tokens
+        that cleans them. Like `helpers.clean_doc`, tokens that are processed
+        to an empty or whitespace-only string are left out.
+
+    Args:
+        doc: spaCy document to be cleaned.
+        *processors: Callable token processors.
+        placeholders: The reserved ID of each placeholder string. Reserved
+            IDs must be positive.
+
+    Returns:
+        The indices, character offsets and replacement codes of the kept
+            tokens.
+    """
+    indices: List[int] = []
+    offsets: List[int] = []
+    codes: List[int] = []
+    for tok, text in zip(doc, helpers.token_texts(doc, *processors)):
+        if not text or text.isspace():
+            continue
+        indices.append(tok.i)
+        offsets.append(tok.idx)
+        offsets.append(tok.idx + len(tok))
+        codes.append(
+            KEPT if text == tok.text else placeholders.get(text, CHANGED)
+        )
+    return KeptTokens(
+        np.array(indices, dtype=np.int64),
+        np.array(offsets, dtype=np.int64).reshape(-1, 2),
+        np.array(codes, dtype=np.int64),
+    )
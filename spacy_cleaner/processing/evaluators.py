@@ -15,15 +15,59 @@ A typical usage example:
     evaluator.evaluate(tok)
     ```
     Calling evaluate returns `True` as `and` is a stopword.
+
+    To evaluate every token of a document at once:
+    ```python
+    evaluators.evaluate_doc(
+        nlp("and 9"),
+        evaluators.StopwordsEvaluator(),
+        evaluators.NumberEvaluator(),
+    )
+    ```
+    Calling evaluate_doc returns a boolean array with one row per token and
+    one column per evaluator.
 """
 
 import abc
+from typing import Any, ClassVar, FrozenSet, Optional
 
-from spacy import tokens
+import numpy as np
+from spacy import attrs, tokens
 
 
 class Evaluator(abc.ABC):
-    """Base class for evaluators."""
+    """Base class for evaluators.
+
+    Evaluators hold no state, so a single instance can be shared.
+
+    Attributes:
+        attr: The `spaCy` attribute ID that holds the evaluation, if there is
+            one. Evaluators with an `attr` are evaluated for a whole document
+            with `Doc.to_array`.
+        requires: The token attributes read by the evaluator, if declared.
+            See `spacy_cleaner.processing.helpers.requires`.
+
+    A subclass that overrides `evaluate` does not inherit `attr` or
+    `requires`, as they describe the `evaluate` of its parent. It can
+    declare its own.
+    """
+
+    __slots__ = ()
+
+    attr: ClassVar[Optional[int]] = None
+    requires: ClassVar[Optional[FrozenSet[str]]] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:  # noqa: ANN401
+        """Drops the inherited `attr` and `requires` if `evaluate` changes."""
+        super().__init_subclass__(**kwargs)
+        if "evaluate" in vars(cls):
+            for name in ("attr", "requires"):
+                if name not in vars(cls):
+                    setattr(cls, name, None)
+
+    def __repr__(self) -> str:
+        """The name of the evaluator class."""
+        return f"{type(self).__name__}()"
 
     @abc.abstractmethod
     def evaluate(self, tok: tokens.Token) -> bool:
@@ -36,10 +80,26 @@ class Evaluator(abc.ABC):
            Whether the token is evaluated to `True` or `False`.
         """
 
+    def evaluate_doc(self, doc: tokens.Doc) -> np.ndarray:
+        """Evaluates every token of a `spaCy` document.
+
+        Args:
+            doc: Document to evaluate.
+
+        Returns:
+            A boolean array with the evaluation of each token.
+        """
+        return evaluate_doc(doc, self)[:, 0]
+
 
 class StopwordsEvaluator(Evaluator):
     """Evaluates stopwords."""
 
+    __slots__ = ()
+
+    attr = attrs.IS_STOP
+    requires = frozenset({"token.is_stop"})
+
     def evaluate(self, tok: tokens.Token) -> bool:
         """If the given token is a stopword.
 
@@ -55,6 +115,11 @@ class StopwordsEvaluator(Evaluator):
 class PunctuationEvaluator(Evaluator):
     """Evaluates emails."""
 
+    __slots__ = ()
+
+    attr = attrs.IS_PUNCT
+    requires = frozenset({"token.is_punct"})
+
     def evaluate(self, tok: tokens.Token) -> bool:
         """If the given token is like an email.
 
@@ -70,6 +135,11 @@ class PunctuationEvaluator(Evaluator):
 class EmailEvaluator(Evaluator):
     """Evaluates emails."""
 
+    __slots__ = ()
+
+    attr = attrs.LIKE_EMAIL
+    requires = frozenset({"token.like_email"})
+
     def evaluate(self, tok: tokens.Token) -> bool:
         """If the given token is like an email.
 
@@ -85,6 +155,11 @@ class EmailEvaluator(Evaluator):
 class URLEvaluator(Evaluator):
     """Evaluates URLs."""
 
+    __slots__ = ()
+
+    attr = attrs.LIKE_URL
+    requires = frozenset({"token.like_url"})
+
     def evaluate(self, tok: tokens.Token) -> bool:
         """If the given token is like a URL.
 
@@ -100,6 +175,11 @@ class URLEvaluator(Evaluator):
 class NumberEvaluator(Evaluator):
     """Evaluates Numbers."""
 
+    __slots__ = ()
+
+    attr = attrs.LIKE_NUM
+    requires = frozenset({"token.like_num"})
+
     def evaluate(self, tok: tokens.Token) -> bool:
         """If the given token is like a number.
 
@@ -110,3 +190,31 @@ class NumberEvaluator(Evaluator):
             `True` if the token is like a number. `False` if not.
         """
         return tok.like_num
+
+
+def evaluate_doc(doc: tokens.Doc, *evaluators: Evaluator) -> np.ndarray:
+    """Evaluates every token of a `spaCy` document with several evaluators.
+
+    The columns of evaluators with an `attr` are read in a single
+        `Doc.to_array` call. Other evaluators fall back to calling `evaluate`
+        on each token.
+
+    Args:
+        doc: Document to evaluate.
+        *evaluators: Evaluators to apply.
+
+    Returns:
+        A boolean array of shape `(len(doc), len(evaluators))`.
+    """
+    masks = np.zeros((len(doc), len(evaluators)), dtype=bool)
+    columns = {
+        i: e.attr for i, e in enumerate(evaluators) if e.attr is not None
+    }
+    if columns:
+        masks[:, list(columns)] = doc.to_array(list(columns.values())).reshape(
+            len(doc), len(columns)
+        )
+    for i, evaluator in enumerate(evaluators):
+        if evaluator.attr is None:
+            masks[:, i] = [evaluator.evaluate(tok) for tok in doc]
+    return masks
@@ -1,10 +1,245 @@
 """Processing helper functions."""
 
+import functools
 import re
-from typing import Callable, Union
+from typing import (
+    Callable,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+    cast,
+)
 
 from spacy import tokens
 
+from spacy_cleaner.processing import transformers
+
+_Processor = TypeVar(
+    "_Processor", bound=Callable[..., Union[str, tokens.Token]]
+)
+
+LEXICAL_ATTRS = frozenset(
+    {
+        "token.text",
+        "token.orth",
+        "token.lower",
+        "token.shape",
+        "token.prefix",
+        "token.suffix",
+        "token.is_alpha",
+        "token.is_digit",
+        "token.is_lower",
+        "token.is_upper",
+        "token.is_title",
+        "token.is_punct",
+        "token.is_space",
+        "token.is_stop",
+        "token.like_num",
+        "token.like_url",
+        "token.like_email",
+    }
+)
+"""Token attributes that are set on the lexeme, not by pipeline components.
+
+`token.norm` is not one of them, as tokenizer exceptions and components such
+as `attribute_ruler` set it on each token.
+"""
+
+
+def requires(*attrs: str) -> Callable[[_Processor], _Processor]:
+    """Declares the token attributes that a processor reads.
+
+    Attributes use the `spaCy` pipe analysis notation, e.g. `token.lemma` or
+        `token.is_stop`. `Cleaner` uses the declarations to disable pipeline
+        components that no processor needs.
+
+    Args:
+        *attrs: The token attributes read by the processor.
+
+    Returns:
+        A decorator that sets `requires` on the processor.
+
+    Raises:
+        TypeError: If the decorator is applied to a `Transformer`, whose
+            attributes are declared by its evaluator.
+
+    Example:
+        ```python
+        @requires("token.pos")
+        def remove_verb_token(tok):
+            return "" if tok.pos_ == "VERB" else tok
+        ```
+    """
+
+    def decorator(processor: _Processor) -> _Processor:
+        if isinstance(processor, transformers.Transformer):
+            msg = (
+                "Transformers declare the attributes they read with "
+                "`Evaluator.requires`."
+            )
+            raise TypeError(msg)
+        processor.requires = frozenset(attrs)  # type: ignore[attr-defined]
+        return processor
+
+    return decorator
+
+
+def order_independent(processor: _Processor) -> _Processor:
+    """Declares that a processor gives the same output in any position.
+
+    `helpers.token_pipe` stops at the first processor that returns a string,
+        so processors can only be reordered when no token would be handled
+        differently, e.g. when they never match the same token. The
+        declaration only covers the other declared processors: `Cleaner`
+        may reorder adjacent declared processors, see its `reorder_sample`
+        argument and `commutes`.
+
+    Args:
+        processor: A callable token processor.
+
+    Returns:
+        The processor, with `order_independent` set. As transformers are
+            immutable, a `Transformer` is copied instead.
+
+    Example:
+        ```python
+        @order_independent
+        def remove_verb_token(tok):
+            return "" if tok.pos_ == "VERB" else tok
+        ```
+    """
+    if isinstance(processor, transformers.Transformer):
+        return cast(
+            _Processor,
+            transformers.Transformer(
+                processor.evaluator, processor.replace, order_independent=True
+            ),
+        )
+    processor.order_independent = True  # type: ignore[attr-defined]
+    return processor
+
+
+def is_order_independent(
+    processor: Callable[[tokens.Token], Union[str, tokens.Token]],
+) -> bool:
+    """Whether a processor is declared order-independent.
+
+    Args:
+        processor: A callable token processor.
+
+    Returns:
+        `True` if the processor, or the function of a partial, is decorated
+            with `order_independent` or is an order-independent
+            `Transformer`. A partial that changes the replacement of a
+            transformer is not order-independent.
+    """
+    while isinstance(processor, functools.partial):
+        if isinstance(processor.func, transformers.Transformer) and (
+            processor.args
+            or processor.keywords.get("replace", processor.func.replace)
+            != processor.func.replace
+        ):
+            return False
+        processor = processor.func
+    return bool(getattr(processor, "order_independent", False))
+
+
+def commutation_group(
+    processor: Callable[[tokens.Token], Union[str, tokens.Token]],
+) -> Optional[str]:
+    """The group of processors that a processor can be reordered within.
+
+    Transformers that replace tokens with an empty string form the
+        `"remove"` group: a token is dropped if any of them matches it,
+        whatever their order. Other processors declared with
+        `order_independent` form the `"declared"` group, as the declaration
+        says nothing about removers.
+
+    Args:
+        processor: A callable token processor.
+
+    Returns:
+        The name of the group, or `None` if the processor has to keep its
+            position.
+    """
+    replace = None
+    while isinstance(processor, functools.partial):
+        if isinstance(processor.func, transformers.Transformer):
+            if processor.args:
+                return None
+            replace = processor.keywords.get("replace", replace)
+        processor = processor.func
+    if isinstance(processor, transformers.Transformer):
+        if (processor.replace if replace is None else replace) == "":
+            return "remove"
+        if replace is not None and replace != processor.replace:
+            return None
+    return "declared" if is_order_independent(processor) else None
+
+
+def commutes(
+    a: Callable[[tokens.Token], Union[str, tokens.Token]],
+    b: Callable[[tokens.Token], Union[str, tokens.Token]],
+) -> bool:
+    """Whether two processors give the same output in either order.
+
+    Args:
+        a: A callable token processor.
+        b: Another callable token processor.
+
+    Returns:
+        `True` if both processors are in the same `commutation_group`.
+    """
+    group = commutation_group(a)
+    return group is not None and group == commutation_group(b)
+
+
+def required_attrs(
+    *processors: Callable[[tokens.Token], Union[str, tokens.Token]],
+) -> Optional[FrozenSet[str]]:
+    """Collects the token attributes required by processors.
+
+    Args:
+        *processors: Callable token processors.
+
+    Returns:
+        The union of the declared attributes, or `None` if any processor
+            does not declare the attributes it reads.
+    """
+    attrs: FrozenSet[str] = frozenset()
+    for processor in processors:
+        func = processor
+        while isinstance(func, functools.partial):
+            func = func.func
+        declared = getattr(func, "requires", None)
+        if declared is None:
+            return None
+        attrs |= declared
+    return attrs
+
+
+def is_lexical(
+    *processors: Callable[[tokens.Token], Union[str, tokens.Token]],
+) -> bool:
+    """Whether processors only read lexeme attributes.
+
+    The result of a lexical processor depends on nothing but the word, so it
+        is the same for every occurrence of that word and needs no pipeline
+        component.
+
+    Args:
+        *processors: Callable token processors.
+
+    Returns:
+        `True` if every processor declares lexeme attributes only.
+    """
+    attrs = required_attrs(*processors)
+    return attrs is not None and attrs <= LEXICAL_ATTRS
+
 
 def replace_multi_whitespace(s: str, replace: str = " ") -> str:
     """Replace multiple whitespace characters with a single space.
@@ -42,18 +277,112 @@ def token_pipe(
     return str(tok)
 
 
+def transform_doc(
+    doc: tokens.Doc,
+    transformers_: Sequence[transformers.Transformer],
+    *processors: Callable[[tokens.Token], Union[str, tokens.Token]],
+) -> List[str]:
+    """Applies transformers to a whole document, then processors per token.
+
+    The evaluators of all transformers are applied in one vectorised step,
+        see `transformers.FusedTransformer.transform_doc`. Each token takes
+        the replacement of the first transformer that matches it, as
+        `token_pipe` would. Tokens that no transformer matches go through
+        `token_pipe` with `processors`.
+
+    Args:
+        doc: spaCy document to be transformed.
+        transformers_: Transformers to apply first.
+        *processors: Callable token processors to apply after the
+            transformers.
+
+    Returns:
+        A string for each token in the document.
+    """
+    return list(
+        _fused_token_texts(
+            doc, transformers.FusedTransformer(*transformers_), processors
+        )
+    )
+
+
+def token_texts(
+    doc: tokens.Doc,
+    *processors: Callable[[tokens.Token], Union[str, tokens.Token]],
+) -> Iterator[str]:
+    """Lazily applies processors to each token of a document.
+
+    If the chain starts with a `FusedTransformer` or with `Transformer`
+        processors, they are applied to the whole document at once.
+
+    Args:
+        doc: spaCy document to be processed.
+        *processors: Callable token processors.
+
+    Returns:
+        An iterator of a string for each token in the document.
+    """
+    if processors and isinstance(processors[0], transformers.FusedTransformer):
+        return _fused_token_texts(doc, processors[0], processors[1:])
+    n_transformers = next(
+        (
+            i
+            for i, processor in enumerate(processors)
+            if not isinstance(processor, transformers.Transformer)
+        ),
+        len(processors),
+    )
+    if n_transformers:
+        return _fused_token_texts(
+            doc,
+            transformers.FusedTransformer(
+                *processors[:n_transformers]  # type: ignore[arg-type]
+            ),
+            processors[n_transformers:],
+        )
+    return (token_pipe(tok, *processors) for tok in doc)
+
+
+def _fused_token_texts(
+    doc: tokens.Doc,
+    fused: transformers.FusedTransformer,
+    processors: Sequence[Callable[[tokens.Token], Union[str, tokens.Token]]],
+) -> Iterator[str]:
+    return (
+        replacement if replacement is not None else token_pipe(tok, *processors)
+        for tok, replacement in zip(doc, fused.transform_doc(doc))
+    )
+
+
 def clean_doc(
     doc: tokens.Doc,
     *processors: Callable[[tokens.Token], Union[str, tokens.Token]],
+    keep_whitespace: bool = False,
 ) -> str:
     """Cleans a spaCy document and returns a cleaned string.
 
+    The output is built in a single pass over the tokens. Tokens that are
+        processed to an empty or whitespace-only string are left out.
+
     Args:
         doc: spaCy document to be cleaned.
         *processors: Callable token processors.
+        keep_whitespace: Whether to follow each kept token with its original
+            trailing whitespace, instead of joining tokens with single spaces.
+            When a token is left out, its whitespace goes to the kept token
+            before it, if that token has none, so that words are not joined.
 
     Returns:
         A string of the cleaned text.
     """
-    s = " ".join([token_pipe(tok, *processors) for tok in doc])
-    return replace_multi_whitespace(s)
+    texts = token_texts(doc, *processors)
+    if keep_whitespace:
+        parts: List[str] = []
+        for tok, text in zip(doc, texts):
+            if text:
+                parts.append(text)
+                parts.append(tok.whitespace_)
+            elif parts and not parts[-1]:
+                parts[-1] = tok.whitespace_
+        return "".join(parts).strip()
+    return " ".join([text for text in texts if text and not text.isspace()])
@@ -18,7 +18,10 @@ A typical usage example:
 
 from spacy import tokens
 
+from spacy_cleaner.processing import helpers
 
+
+@helpers.requires("token.lemma")
 def mutate_lemma_token(tok: tokens.Token) -> str:
     """Mutate a token to its lemma.
 
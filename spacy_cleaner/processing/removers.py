@@ -16,78 +16,64 @@ A typical usage example:
     `and` is a stopword so an empty string is returned.
 """
 
-from typing import Union
-
-from spacy import tokens
-
 from spacy_cleaner.processing import evaluators, transformers
 
+remove_stopword_token = transformers.Transformer(
+    evaluators.StopwordsEvaluator(), replace=""
+)
+"""If the token is a stopword, replace it with an empty string.
 
-def remove_stopword_token(tok: tokens.Token) -> Union[str, tokens.Token]:
-    """If the token is a stopword, replace it with an empty string.
-
-    Args:
-      tok: A `spaCy` token.
-
-    Returns:
-      An empty string or the original token.
-    """
-    return transformers.Transformer(
-        evaluators.StopwordsEvaluator(), replace=""
-    ).transform(tok)
-
-
-def remove_punctuation_token(tok: tokens.Token) -> Union[str, tokens.Token]:
-    """If the token is punctuation, replace it with an empty string.
+Args:
+  tok: A `spaCy` token.
 
-    Args:
-      tok: A `spaCy` token.
-
-    Returns:
-      An empty string or the original token.
-    """
-    return transformers.Transformer(
-        evaluators.PunctuationEvaluator(), replace=""
-    ).transform(tok)
+Returns:
+  An empty string or the original token.
+"""
 
+remove_punctuation_token = transformers.Transformer(
+    evaluators.PunctuationEvaluator(), replace=""
+)
+"""If the token is punctuation, replace it with an empty string.
 
-def remove_email_token(tok: tokens.Token) -> Union[str, tokens.Token]:
-    """If the token is like an email, replace it with an empty string.
+Args:
+  tok: A `spaCy` token.
 
-    Args:
-      tok: A `spaCy` token.
+Returns:
+  An empty string or the original token.
+"""
 
-    Returns:
-      An empty string or the original token.
-    """
-    return transformers.Transformer(
-        evaluators.EmailEvaluator(), replace=""
-    ).transform(tok)
+remove_email_token = transformers.Transformer(
+    evaluators.EmailEvaluator(), replace=""
+)
+"""If the token is like an email, replace it with an empty string.
 
+Args:
+  tok: A `spaCy` token.
 
-def remove_url_token(tok: tokens.Token) -> Union[str, tokens.Token]:
-    """If the token is like a URL, replace it with an empty string.
+Returns:
+  An empty string or the original token.
+"""
 
-    Args:
-      tok: A `spaCy` token.
+remove_url_token = transformers.Transformer(
+    evaluators.URLEvaluator(), replace=""
+)
+"""If the token is like a URL, replace it with an empty string.
 
-    Returns:
-      An empty string or the original token.
-    """
-    return transformers.Transformer(
-        evaluators.URLEvaluator(), replace=""
-    ).transform(tok)
+Args:
+  tok: A `spaCy` token.
 
+Returns:
+  An empty string or the original token.
+"""
 
-def remove_number_token(tok: tokens.Token) -> Union[str, tokens.Token]:
-    """If the token is like a number, replace it with an empty string.
+remove_number_token = transformers.Transformer(
+    evaluators.NumberEvaluator(), replace=""
+)
+"""If the token is like a number, replace it with an empty string.
 
-    Args:
-      tok: A `spaCy` token.
+Args:
+  tok: A `spaCy` token.
 
-    Returns:
-      An empty string or the original token.
-    """
-    return transformers.Transformer(
-        evaluators.NumberEvaluator(), replace=""
-    ).transform(tok)
+Returns:
+  An empty string or the original token.
+"""
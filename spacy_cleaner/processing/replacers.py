@@ -16,93 +16,69 @@ A typical usage example:
     `,` is replaced with `_IS_PUNCT_`.
 """
 
-from typing import Union
+from spacy_cleaner.processing import evaluators, transformers
 
-from spacy import tokens
+replace_stopword_token = transformers.Transformer(
+    evaluators.StopwordsEvaluator(), replace="_IS_STOP_"
+)
+"""If the token is a stopword, replace it with the string `_IS_STOP_`.
 
-from spacy_cleaner.processing import evaluators, transformers
+Args:
+  tok: A `spaCy` token.
+  replace: The replacement string.
+
+Returns:
+  The replacement string or the original token.
+"""
+
+replace_punctuation_token = transformers.Transformer(
+    evaluators.PunctuationEvaluator(), replace="_IS_PUNCT_"
+)
+"""If the token is punctuation, replace it with the string `_IS_PUNCT_`.
+
+Args:
+  tok: A `spaCy` token.
+  replace: The replacement string.
+
+Returns:
+  The replacement string or the original token.
+"""
+
+replace_email_token = transformers.Transformer(
+    evaluators.EmailEvaluator(), replace="_LIKE_EMAIL_"
+)
+"""If the token is like an email, replace it with the string `_LIKE_EMAIL_`.
 
+Args:
+  tok: A `spaCy` token.
+  replace: The replacement string.
 
-def replace_stopword_token(
-    tok: tokens.Token, replace: str = "_IS_STOP_"
-) -> Union[str, tokens.Token]:
-    """If the token is a stopword, replace it with the string `_IS_STOP_`.
-
-    Args:
-      tok: A `spaCy` token.
-      replace: The replacement string.
-
-    Returns:
-      The replacement string or the original token.
-    """
-    return transformers.Transformer(
-        evaluators.StopwordsEvaluator(), replace
-    ).transform(tok)
-
-
-def replace_punctuation_token(
-    tok: tokens.Token, replace: str = "_IS_PUNCT_"
-) -> Union[str, tokens.Token]:
-    """If the token is punctuation, replace it with the string `_IS_PUNCT_`.
-
-    Args:
-      tok: A `spaCy` token.
-      replace: The replacement string.
-
-    Returns:
-      The replacement string or the original token.
-    """
-    return transformers.Transformer(
-        evaluators.PunctuationEvaluator(), replace
-    ).transform(tok)
-
-
-def replace_email_token(
-    tok: tokens.Token, replace: str = "_LIKE_EMAIL_"
-) -> Union[str, tokens.Token]:
-    """If the token is like an email, replace it with the string `_LIKE_EMAIL_`.
-
-    Args:
-      tok: A `spaCy` token.
-      replace: The replacement string.
-
-    Returns:
-      The replacement string or the original token.
-    """
-    return transformers.Transformer(
-        evaluators.EmailEvaluator(), replace
-    ).transform(tok)
-
-
-def replace_url_token(
-    tok: tokens.Token, replace: str = "_LIKE_URL_"
-) -> Union[str, tokens.Token]:
-    """If the token is like a URL, replace it with the string `_LIKE_URL_`.
-
-    Args:
-      tok: A `spaCy` token.
-      replace: The replacement string.
-
-    Returns:
-      The replacement string or the original token.
-    """
-    return transformers.Transformer(
-        evaluators.URLEvaluator(), replace
-    ).transform(tok)
-
-
-def replace_number_token(
-    tok: tokens.Token, replace: str = "_LIKE_NUM_"
-) -> Union[str, tokens.Token]:
-    """If the token is like a number, replace it with the string `_LIKE_NUM_`.
-
-    Args:
-      tok: A `spaCy` token.
-      replace: The replacement string.
-
-    Returns:
-      The replacement string or the original token.
-    """
-    return transformers.Transformer(
-        evaluators.NumberEvaluator(), replace
-    ).transform(tok)
+Returns:
+  The replacement string or the original token.
+"""
+
+replace_url_token = transformers.Transformer(
+    evaluators.URLEvaluator(), replace="_LIKE_URL_"
+)
+"""If the token is like a URL, replace it with the string `_LIKE_URL_`.
+
+Args:
+  tok: A `spaCy` token.
+  replace: The replacement string.
+
+Returns:
+  The replacement string or the original token.
+"""
+
+replace_number_token = transformers.Transformer(
+    evaluators.NumberEvaluator(), replace="_LIKE_NUM_"
+)
+"""If the token is like a number, replace it with the string `_LIKE_NUM_`.
+
+Args:
+  tok: A `spaCy` token.
+  replace: The replacement string.
+
+Returns:
+  The replacement string or the original token.
+"""
@@ -1,8 +1,8 @@
-"""Class `TokenTransformer` allows for transformation of `spaCy` tokens."""
+"""Classes that allow for transformation of `spaCy` tokens."""
 
-from typing import Union
+from typing import Any, FrozenSet, List, Optional, Tuple, Type, Union
 
-from spacy import tokens
+from spacy import attrs, tokens
 
 from spacy_cleaner.processing import evaluators
 
@@ -10,9 +10,15 @@ from spacy_cleaner.processing import evaluators
 class Transformer:
     """Transforms a token using the evaluator.
 
+    Transformers are immutable, so a single instance can be built once and
+    shared by any number of cleaners and threads.
+
     Args:
         evaluator: Evaluates if the token should be processed or not.
         replace: Replaces token based on the token evaluation.
+        order_independent: Whether the transformer gives the same output in
+            any position among other order-independent processors, see
+            `spacy_cleaner.processing.helpers.order_independent`.
 
     Example:
         ```python
@@ -21,11 +27,73 @@ class Transformer:
         transformer = Transformer(StopwordsEvaluator(), replace="")
         transformer.transform(tok)
         ```
+
+        A `Transformer` is itself a token processor, so it can be passed to
+        `Cleaner` or `helpers.clean_doc` directly. A run of transformers at the
+        start of the chain is evaluated for the whole document at once, see
+        `spacy_cleaner.processing.evaluators.evaluate_doc`.
     """
 
-    def __init__(self, evaluator: evaluators.Evaluator, replace: str) -> None:
-        self.evaluator = evaluator
-        self.replace = replace
+    __slots__ = ("evaluator", "replace", "order_independent")
+
+    evaluator: evaluators.Evaluator
+    replace: str
+    order_independent: bool
+
+    def __init__(
+        self,
+        evaluator: evaluators.Evaluator,
+        replace: str,
+        order_independent: bool = False,  # noqa: FBT001, FBT002
+    ) -> None:
+        object.__setattr__(self, "evaluator", evaluator)
+        object.__setattr__(self, "replace", replace)
+        object.__setattr__(self, "order_independent", order_independent)
+
+    def __setattr__(self, name: str, value: Any) -> None:  # noqa: ANN401
+        """Prevents changes, as transformers are shared."""
+        msg = f"{type(self).__name__} is immutable."
+        raise AttributeError(msg)
+
+    def __reduce__(
+        self,
+    ) -> Tuple[Type["Transformer"], Tuple[evaluators.Evaluator, str, bool]]:
+        """Pickles the transformer by its arguments."""
+        return type(self), (
+            self.evaluator,
+            self.replace,
+            self.order_independent,
+        )
+
+    def __repr__(self) -> str:
+        """The evaluator and replacement of the transformer."""
+        flags = ", order_independent=True" if self.order_independent else ""
+        return (
+            f"{type(self).__name__}({self.evaluator!r}, "
+            f"replace={self.replace!r}{flags})"
+        )
+
+    @property
+    def requires(self) -> Optional[FrozenSet[str]]:
+        """The token attributes read by the evaluator, if declared."""
+        return self.evaluator.requires
+
+    def with_replace(self, replace: str) -> "Transformer":
+        """Creates a transformer with the same evaluator.
+
+        Args:
+            replace: The replacement string of the new transformer.
+
+        Returns:
+            A transformer that replaces with `replace`. It is only
+                order-independent if this one is and the replacement is the
+                same.
+        """
+        return type(self)(
+            self.evaluator,
+            replace,
+            self.order_independent and replace == self.replace,
+        )
 
     def transform(self, tok: tokens.Token) -> Union[str, tokens.Token]:
         """Processes a token using the evaluator.
@@ -37,3 +105,142 @@ class Transformer:
             A string or token depending on evaluation.
         """
         return self.replace if self.evaluator.evaluate(tok) else tok
+
+    def __call__(
+        self, tok: tokens.Token, replace: Optional[str] = None
+    ) -> Union[str, tokens.Token]:
+        """Processes a token using the evaluator.
+
+        Args:
+            tok: The token to be evaluated.
+            replace: Replaces token instead of the transformer's own
+                replacement, if given.
+
+        Returns:
+            A string or token depending on evaluation.
+        """
+        if not self.evaluator.evaluate(tok):
+            return tok
+        return self.replace if replace is None else replace
+
+
+class FusedTransformer:
+    """Applies a chain of transformers in a single pass over a token.
+
+    The transformers are compiled into a decision table of evaluators and
+    replacements. A token takes the replacement of the first evaluator that
+    matches it, exactly as if the transformers were applied one after the
+    other. Evaluators whose attribute is a lexeme flag are checked with
+    `Token.check_flag`, without a call to the evaluator.
+
+    Args:
+        *transformers: The transformers to fuse, in order.
+
+    Example:
+        ```python
+        from spacy_cleaner import processing
+
+        fused = FusedTransformer(
+            processing.remove_stopword_token,
+            processing.replace_punctuation_token,
+        )
+        fused(tok)
+        ```
+    """
+
+    __slots__ = ("transformers", "_table")
+
+    transformers: Tuple[Transformer, ...]
+    _table: Tuple[Tuple[Optional[int], evaluators.Evaluator, str], ...]
+
+    def __init__(self, *transformers: Transformer) -> None:
+        object.__setattr__(self, "transformers", transformers)
+        object.__setattr__(
+            self,
+            "_table",
+            tuple(
+                (
+                    t.evaluator.attr if _is_flag(t.evaluator.attr) else None,
+                    t.evaluator,
+                    t.replace,
+                )
+                for t in transformers
+            ),
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:  # noqa: ANN401
+        """Prevents changes, as transformers are shared."""
+        msg = f"{type(self).__name__} is immutable."
+        raise AttributeError(msg)
+
+    def __reduce__(
+        self,
+    ) -> Tuple[Type["FusedTransformer"], Tuple[Transformer, ...]]:
+        """Pickles the transformer by its arguments."""
+        return type(self), self.transformers
+
+    def __repr__(self) -> str:
+        """The fused transformers."""
+        return f"{type(self).__name__}{self.transformers!r}"
+
+    @property
+    def requires(self) -> Optional[FrozenSet[str]]:
+        """The token attributes read by the evaluators, if declared."""
+        required: FrozenSet[str] = frozenset()
+        for transformer in self.transformers:
+            if transformer.requires is None:
+                return None
+            required |= transformer.requires
+        return required
+
+    def __call__(self, tok: tokens.Token) -> Union[str, tokens.Token]:
+        """Processes a token using the decision table.
+
+        Args:
+            tok: The token to be evaluated.
+
+        Returns:
+            The replacement of the first matching evaluator, or the token.
+        """
+        check_flag = tok.check_flag  # type: ignore[attr-defined]
+        for flag, evaluator, replace in self._table:
+            if (
+                check_flag(flag)
+                if flag is not None
+                else evaluator.evaluate(tok)
+            ):
+                return replace
+        return tok
+
+    def transform_doc(self, doc: tokens.Doc) -> List[Optional[str]]:
+        """Processes every token of a document in one vectorised step.
+
+        Args:
+            doc: The document to be evaluated.
+
+        Returns:
+            The replacement of the first matching evaluator for each token,
+                or `None` if no evaluator matches it.
+        """
+        masks = evaluators.evaluate_doc(
+            doc, *(evaluator for _, evaluator, _ in self._table)
+        )
+        replacements = [replace for _, _, replace in self._table]
+        return [
+            replacements[first] if matched else None
+            for matched, first in zip(
+                masks.any(axis=1).tolist(), masks.argmax(axis=1).tolist()
+            )
+        ]
+
+
+def _is_flag(attr: Optional[int]) -> bool:
+    """Whether a `spaCy` attribute ID is a lexeme flag.
+
+    Args:
+        attr: The attribute ID.
+
+    Returns:
+        `True` if `Token.check_flag` can read the attribute.
+    """
+    return attr is not None and 0 < attr < attrs.ID
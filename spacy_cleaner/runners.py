@@ -0,0 +1,290 @@
+"""Run reading, parsing, cleaning and writing as concurrent stages.
+
+`Cleaner.clean` reads, parses, cleans and writes one step after the other,
+so the CPU-bound parse waits while input is read or decompressed and while
+output is written. `PipelinedRunner` runs each step in its own thread,
+joined by bounded queues, so that I/O overlaps with parsing and a slow
+stage holds back the others instead of filling memory.
+
+A typical usage example:
+    ```python
+    import gzip
+
+    from spacy_cleaner import runners
+
+    runner = runners.PipelinedRunner(cleaner, queue_size=1000)
+    with gzip.open("in.txt.gz", "rt") as source, open("out.txt", "w") as out:
+        metrics = runner.run(
+            (line.rstrip() for line in source),
+            lambda text: print(text, file=out),
+        )
+    metrics.stages["parse"].throughput
+    ```
+"""
+
+import queue
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+if TYPE_CHECKING:
+    from spacy_cleaner import cleaners
+
+STAGES = ("read", "parse", "clean", "write")
+
+
+class StageMetrics(NamedTuple):
+    """The work done by one stage of a run.
+
+    Attributes:
+        items: The number of items the stage produced.
+        busy_seconds: The time spent working, not waiting on queues.
+        blocked_seconds: The time spent waiting for input or for room in
+            the output queue.
+    """
+
+    items: int
+    busy_seconds: float
+    blocked_seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """The number of items per second of work."""
+        return self.items / self.busy_seconds if self.busy_seconds else 0.0
+
+
+class RunMetrics(NamedTuple):
+    """The metrics of a run.
+
+    Attributes:
+        stages: The metrics of each stage, by name, see `STAGES`.
+        elapsed_seconds: The wall time of the run.
+    """
+
+    stages: Dict[str, StageMetrics]
+    elapsed_seconds: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Exports the metrics.
+
+        Returns:
+            The metrics as plain data, with the throughput of each stage.
+        """
+        return {
+            "stages": {
+                name: {**stage._asdict(), "throughput": stage.throughput}
+                for name, stage in self.stages.items()
+            },
+            "elapsed_seconds": self.elapsed_seconds,
+        }
+
+
+class PipelinedRunner:
+    """Cleans a stream of texts with a thread per stage.
+
+    The stages are: reading texts from the source, parsing them with
+    `Cleaner.parse`, cleaning the docs with `Cleaner.clean_doc` and
+    writing the results. Docs are cleaned in the runner, even with
+    `n_process > 1`.
+
+    Args:
+        cleaner: The cleaner to use.
+        queue_size: The maximum number of items between two stages.
+        batch_size: The number of texts to buffer in `Language.pipe`.
+        n_process: Number of processors to parse texts.
+    """
+
+    def __init__(
+        self,
+        cleaner: "cleaners.Cleaner",
+        *,
+        queue_size: int = 1024,
+        batch_size: Optional[int] = None,
+        n_process: int = 1,
+    ) -> None:
+        self.cleaner = cleaner
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.n_process = n_process
+
+    def run(
+        self, source: Iterable[Any], write: Callable[[str], object]
+    ) -> RunMetrics:
+        """Cleans every text of a source.
+
+        Args:
+            source: The texts to clean. It is iterated in the reader thread,
+                so reading and decompressing overlap with parsing.
+            write: Called in the writer thread with each cleaned text, in
+                order.
+
+        Returns:
+            The metrics of the run.
+
+        Raises:
+            Exception: The first error raised by a stage, after every stage
+                has stopped.
+        """
+        stop = threading.Event()
+        stages = {name: _Stage(name, stop) for name in STAGES}
+        queues: List[queue.Queue[Any]] = [
+            queue.Queue(self.queue_size) for _ in STAGES[1:]
+        ]
+        work: Dict[str, Callable[[], None]] = {
+            "read": lambda: stages["read"].feed(iter(source), queues[0]),
+            "parse": lambda: stages["parse"].feed(
+                self.cleaner.parse(
+                    stages["parse"].drain(queues[0]),
+                    batch_size=self.batch_size,
+                    n_process=self.n_process,
+                ),
+                queues[1],
+            ),
+            "clean": lambda: stages["clean"].feed(
+                map(self.cleaner.clean_doc, stages["clean"].drain(queues[1])),
+                queues[2],
+            ),
+            "write": lambda: stages["write"].feed(
+                map(write, stages["write"].drain(queues[2])), None
+            ),
+        }
+        start = time.perf_counter()
+        threads = [
+            threading.Thread(
+                target=stages[name].run,
+                args=(work[name],),
+                name=f"spacy-cleaner-{name}",
+                daemon=True,
+            )
+            for name in STAGES
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        errors = [stage.error for stage in stages.values() if stage.error]
+        if errors:
+            raise errors[0]
+        return RunMetrics(
+            {name: stage.metrics() for name, stage in stages.items()}, elapsed
+        )
+
+
+_END = object()
+
+
+class _Failed(Exception):  # noqa: N818
+    """Raised in a stage when another stage has failed."""
+
+
+class _Stage:
+    """The counters and queue handling of one stage.
+
+    Args:
+        name: The name of the stage.
+        stop: Set when any stage fails, so that the others stop waiting.
+    """
+
+    def __init__(self, name: str, stop: threading.Event) -> None:
+        self.name = name
+        self.stop = stop
+        self.items = 0
+        self.seconds = 0.0
+        self.input_seconds = 0.0
+        self.output_seconds = 0.0
+        self.error: Optional[BaseException] = None
+
+    def run(self, work: Callable[[], None]) -> None:
+        """Runs the work of the stage, recording its error.
+
+        Args:
+            work: The body of the stage.
+        """
+        try:
+            work()
+        except _Failed:
+            pass
+        except BaseException as e:  # noqa: BLE001
+            self.error = e
+            self.stop.set()
+
+    def drain(self, source: "queue.Queue[Any]") -> Iterator[Any]:
+        """Yields the items of the input queue until its end marker.
+
+        Args:
+            source: The input queue.
+
+        Yields:
+            The items.
+        """
+        while True:
+            started = time.perf_counter()
+            item = self._wait(lambda: source.get(timeout=0.1))
+            self.input_seconds += time.perf_counter() - started
+            if item is _END:
+                return
+            yield item
+
+    def feed(
+        self, items: Iterator[Any], target: Optional["queue.Queue[Any]"]
+    ) -> None:
+        """Moves items to the output queue, then adds the end marker.
+
+        Args:
+            items: The output of the stage.
+            target: The output queue, or `None` for the last stage.
+        """
+        while True:
+            started = time.perf_counter()
+            item = next(items, _END)
+            self.seconds += time.perf_counter() - started
+            if item is not _END:
+                self.items += 1
+            if target is None:
+                if item is _END:
+                    return
+                continue
+            started = time.perf_counter()
+            self._wait(lambda: target.put(item, timeout=0.1))  # noqa: B023
+            self.output_seconds += time.perf_counter() - started
+            if item is _END:
+                return
+
+    def metrics(self) -> StageMetrics:
+        """The metrics of the stage."""
+        return StageMetrics(
+            self.items,
+            self.seconds - self.input_seconds,
+            self.input_seconds + self.output_seconds,
+        )
+
+    def _wait(self, call: Callable[[], Any]) -> Any:  # noqa: ANN401
+        """Retries a blocking queue call until it succeeds or a stage fails.
+
+        Args:
+            call: A queue call with a timeout.
+
+        Returns:
+            The result of the call.
+
+        Raises:
+            _Failed: If another stage has failed.
+        """
+        while True:
+            if self.stop.is_set():
+                raise _Failed
+            try:
+                return call()
+            except (queue.Empty, queue.Full):
+                continue
@@ -0,0 +1,172 @@
+"""Serve a `Cleaner` over HTTP.
+
+`CleanerServer` is a small HTTP server from the standard library. Each
+request is handled in its own thread, and the texts of concurrent requests
+are gathered into shared batches by a `spacy_cleaner.batching.MicroBatcher`,
+so the model sees large batches even when clients send one text at a time.
+
+Endpoints:
+    `POST /clean` with a JSON body `{"texts": [...]}` returns
+    `{"cleaned": [...]}`, and with `{"text": "..."}` returns
+    `{"cleaned": "..."}`. `GET /health` returns `{"status": "ok"}`.
+
+A typical usage example:
+    ```python
+    from spacy_cleaner import Cleaner, processing, server
+
+    cleaner = Cleaner(model, processing.remove_stopword_token, progress=False)
+    with server.CleanerServer(("127.0.0.1", 8000), cleaner) as httpd:
+        httpd.serve_forever()
+    ```
+    Or from the command line:
+    ```bash
+    spacy-cleaner serve en_core_web_sm -p remove_stopword_token --port 8000
+    ```
+"""
+
+import asyncio
+import http
+import http.server
+import json
+import threading
+from typing import TYPE_CHECKING, Any, List, Tuple
+
+from spacy_cleaner import batching
+
+if TYPE_CHECKING:
+    from spacy_cleaner import cleaners
+
+
+class CleanerServer(http.server.ThreadingHTTPServer):
+    """An HTTP server that cleans texts in shared batches.
+
+    Args:
+        address: The host and port to listen on. Port `0` picks a free port.
+        cleaner: The cleaner to serve.
+        max_latency: The maximum time, in seconds, that a text waits for
+            texts of other requests before its batch is cleaned.
+        max_batch_size: The maximum number of texts per batch.
+        workers: The number of worker processes that clean batches. `0`
+            cleans batches in a thread of the server process.
+        max_queue_size: The maximum number of texts waiting to be cleaned,
+            after which requests wait for room.
+    """
+
+    daemon_threads = True
+
+    def __init__(  # noqa: PLR0913
+        self,
+        address: Tuple[str, int],
+        cleaner: "cleaners.Cleaner",
+        *,
+        max_latency: float = 0.005,
+        max_batch_size: int = 256,
+        workers: int = 0,
+        max_queue_size: int = 4096,
+    ) -> None:
+        super().__init__(address, _CleanerHandler)
+        self.batcher = batching.MicroBatcher(
+            cleaner,
+            executor="process" if workers else "thread",
+            max_workers=max(workers, 1),
+            max_batch_size=max_batch_size,
+            max_latency=max_latency,
+            max_queue_size=max_queue_size,
+        )
+        self.loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self.loop.run_forever, name="spacy-cleaner-batcher"
+        )
+        self._loop_thread.daemon = True
+        self._loop_thread.start()
+
+    def clean(self, texts: List[str]) -> List[str]:
+        """Cleans texts from a request thread, in a shared batch.
+
+        Args:
+            texts: The texts to clean.
+
+        Returns:
+            The cleaned texts, in order.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.batcher.clean(texts), self.loop
+        ).result()
+
+    def server_close(self) -> None:
+        """Stops the batching loop and the workers, then closes the socket."""
+        super().server_close()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._loop_thread.join()
+        self.loop.close()
+        self.batcher.close()
+
+
+class _CleanerHandler(http.server.BaseHTTPRequestHandler):
+    """Handles the requests of a `CleanerServer`."""
+
+    server: CleanerServer
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Reports the health of the server."""
+        if self.path != "/health":
+            self._send(http.HTTPStatus.NOT_FOUND, {"error": "Not found."})
+            return
+        self._send(http.HTTPStatus.OK, {"status": "ok"})
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Cleans the texts of a request."""
+        if self.path != "/clean":
+            self._send(http.HTTPStatus.NOT_FOUND, {"error": "Not found."})
+            return
+        try:
+            texts, single = _parse_texts(
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            )
+        except ValueError:
+            self._send(
+                http.HTTPStatus.BAD_REQUEST,
+                {"error": 'Expected {"texts": [...]} or {"text": "..."}.'},
+            )
+            return
+        try:
+            cleaned = self.server.clean(texts)
+        except Exception as e:  # noqa: BLE001
+            self._send(http.HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+            return
+        self._send(
+            http.HTTPStatus.OK, {"cleaned": cleaned[0] if single else cleaned}
+        )
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        """Silences the log line of each request."""
+
+    def _send(self, status: http.HTTPStatus, body: Any) -> None:  # noqa: ANN401
+        data = json.dumps(body).encode("utf8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _parse_texts(data: bytes) -> Tuple[List[str], bool]:
+    """Reads the texts of a `/clean` request.
+
+    Args:
+        data: The body of the request.
+
+    Returns:
+        The texts, and whether the request holds a single text.
+
+    Raises:
+        ValueError: If the body is not a valid request.
+    """
+    body = json.loads(data)
+    if isinstance(body, dict) and isinstance(body.get("text"), str):
+        return [body["text"]], True
+    texts = body.get("texts") if isinstance(body, dict) else None
+    if not (isinstance(texts, list) and all(isinstance(t, str) for t in texts)):
+        msg = "Expected a list of texts."
+        raise ValueError(msg)
+    return texts, False
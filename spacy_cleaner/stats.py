@@ -0,0 +1,317 @@
+"""Collect statistics about cleaning.
+
+A `Stats` collector records, for each processor of a chain, how many tokens
+it was called on, how many it matched, how many of those it removed or
+replaced and how long it took, along with the time spent parsing and
+cleaning each batch of docs. Statistics are opt-in: a `Cleaner` without
+`stats=True` runs exactly the same code as before.
+
+A typical usage example:
+    ```python
+    from spacy_cleaner import Cleaner, processing
+
+    cleaner = Cleaner(
+        model,
+        processing.remove_stopword_token,
+        processing.replace_punctuation_token,
+        stats=True,
+    )
+    cleaner.clean(texts)
+    cleaner.stats.to_dict()
+    print(cleaner.stats.to_prometheus())
+    ```
+"""
+
+import collections
+import functools
+import time
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    TypeVar,
+    Union,
+)
+
+from spacy import tokens
+
+from spacy_cleaner import processing
+
+_Doc = TypeVar("_Doc")
+
+
+class ProcessorStats:
+    """The counters of one processor.
+
+    Attributes:
+        calls: The number of tokens the processor was called on.
+        matches: The number of tokens it turned into a string.
+        removed: The number of tokens it turned into an empty string.
+        replaced: The number of tokens it turned into a non-empty string.
+        seconds: The time spent in the processor.
+    """
+
+    __slots__ = ("calls", "matches", "removed", "replaced", "seconds")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Sets every counter back to zero."""
+        self.calls = 0
+        self.matches = 0
+        self.removed = 0
+        self.replaced = 0
+        self.seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Union[int, float]]:
+        """The counters, by name."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class BatchStats(NamedTuple):
+    """The timings of one batch of docs.
+
+    Attributes:
+        docs: The number of docs in the batch.
+        parse_seconds: The time spent waiting for `Language.pipe`.
+        clean_seconds: The time spent cleaning the docs.
+    """
+
+    docs: int
+    parse_seconds: float
+    clean_seconds: float
+
+
+class InstrumentedProcessor:
+    """Calls a processor and counts its results.
+
+    Args:
+        processor: A callable token processor.
+        stats: The counters to update.
+    """
+
+    __slots__ = ("processor", "stats")
+
+    def __init__(
+        self,
+        processor: Callable[[tokens.Token], Union[str, tokens.Token]],
+        stats: ProcessorStats,
+    ) -> None:
+        self.processor = processor
+        self.stats = stats
+
+    def __call__(self, tok: tokens.Token) -> Union[str, tokens.Token]:
+        """Processes a token and updates the counters.
+
+        Args:
+            tok: The token to process.
+
+        Returns:
+            The result of the processor.
+        """
+        start = time.perf_counter()
+        result = self.processor(tok)
+        stats = self.stats
+        stats.seconds += time.perf_counter() - start
+        stats.calls += 1
+        if isinstance(result, str):
+            stats.matches += 1
+            if result:
+                stats.replaced += 1
+            else:
+                stats.removed += 1
+        return result
+
+
+class Stats:
+    """Collects statistics about the processors and batches of a cleaner.
+
+    Processor statistics are only collected for docs cleaned in the
+    current process. With `n_process > 1`, docs are cleaned in the worker
+    processes, so the parse time of a batch includes cleaning.
+
+    Args:
+        batch_history: The number of most recent batches to keep timings
+            for.
+
+    Attributes:
+        processors: The counters of each processor, by name.
+        docs: The number of cleaned docs.
+        batches: The number of batches.
+        parse_seconds: The time spent waiting for `Language.pipe`.
+        clean_seconds: The time spent cleaning docs.
+        recent_batches: The timings of the most recent batches.
+    """
+
+    def __init__(self, batch_history: int = 128) -> None:
+        self.processors: Dict[str, ProcessorStats] = {}
+        self.recent_batches: Deque[BatchStats] = collections.deque(
+            maxlen=batch_history
+        )
+        self.reset()
+
+    def reset(self) -> None:
+        """Sets every counter back to zero."""
+        for stats in self.processors.values():
+            stats.reset()
+        self.docs = 0
+        self.batches = 0
+        self.parse_seconds = 0.0
+        self.clean_seconds = 0.0
+        self.recent_batches.clear()
+
+    def instrument(
+        self, processor: Callable[[tokens.Token], Union[str, tokens.Token]]
+    ) -> InstrumentedProcessor:
+        """Wraps a processor so that its calls are counted.
+
+        Args:
+            processor: A callable token processor.
+
+        Returns:
+            A processor that updates the counters of `processor`.
+        """
+        name = base = processor_name(processor)
+        copies = 1
+        while name in self.processors:
+            copies += 1
+            name = f"{base}#{copies}"
+        self.processors[name] = ProcessorStats()
+        return InstrumentedProcessor(processor, self.processors[name])
+
+    def observe(
+        self,
+        docs: Iterable[_Doc],
+        clean: Callable[[_Doc], str],
+        batch_size: int,
+    ) -> Iterator[str]:
+        """Cleans docs while timing parsing and cleaning.
+
+        Args:
+            docs: A lazy stream of docs, such as the output of
+                `Language.pipe`.
+            clean: Cleans one doc.
+            batch_size: The number of docs per recorded batch.
+
+        Yields:
+            The cleaned docs, in order.
+        """
+        perf_counter = time.perf_counter
+        docs = iter(docs)
+        count, parse_seconds, clean_seconds = 0, 0.0, 0.0
+        while True:
+            start = perf_counter()
+            doc = next(docs, _END)
+            parsed = perf_counter()
+            if doc is _END:
+                break
+            cleaned = clean(doc)  # type: ignore[arg-type]
+            parse_seconds += parsed - start
+            clean_seconds += perf_counter() - parsed
+            count += 1
+            if count == batch_size:
+                self._record(BatchStats(count, parse_seconds, clean_seconds))
+                count, parse_seconds, clean_seconds = 0, 0.0, 0.0
+            yield cleaned
+        if count:
+            self._record(BatchStats(count, parse_seconds, clean_seconds))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Exports the statistics.
+
+        Returns:
+            The statistics as plain data.
+        """
+        return {
+            "processors": {
+                name: stats.to_dict() for name, stats in self.processors.items()
+            },
+            "docs": self.docs,
+            "batches": self.batches,
+            "parse_seconds": self.parse_seconds,
+            "clean_seconds": self.clean_seconds,
+            "recent_batches": [
+                batch._asdict() for batch in self.recent_batches
+            ],
+        }
+
+    def to_prometheus(self, prefix: str = "spacy_cleaner") -> str:
+        """Exports the statistics in the Prometheus text format.
+
+        Args:
+            prefix: The prefix of the metric names.
+
+        Returns:
+            The metrics, one sample per line.
+        """
+        lines: List[str] = []
+        for field, help_text in _PROCESSOR_METRICS.items():
+            metric = f"{prefix}_processor_{field}_total"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(
+                f'{metric}{{processor="{_escape(name)}"}} '
+                f"{getattr(stats, field)}"
+                for name, stats in self.processors.items()
+            )
+        for field, help_text in _TOTAL_METRICS.items():
+            metric = f"{prefix}_{field}_total"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {getattr(self, field)}")
+        return "\n".join(lines) + "\n"
+
+    def _record(self, batch: BatchStats) -> None:
+        self.docs += batch.docs
+        self.batches += 1
+        self.parse_seconds += batch.parse_seconds
+        self.clean_seconds += batch.clean_seconds
+        self.recent_batches.append(batch)
+
+
+def processor_name(processor: Any) -> str:  # noqa: ANN401
+    """Names a processor.
+
+    Built-in processors are named as in `spacy_cleaner.processing`, other
+        functions by their name.
+
+    Args:
+        processor: A callable token processor.
+
+    Returns:
+        The name of the processor.
+    """
+    if isinstance(processor, functools.partial):
+        return processor_name(processor.func)
+    for name in processing.__all__:
+        if getattr(processing, name) is processor:
+            return name
+    return getattr(processor, "__name__", None) or repr(processor)
+
+
+_END = object()
+
+_PROCESSOR_METRICS = {
+    "calls": "Tokens passed to each processor.",
+    "matches": "Tokens each processor turned into a string.",
+    "removed": "Tokens each processor turned into an empty string.",
+    "replaced": "Tokens each processor turned into a non-empty string.",
+    "seconds": "Time spent in each processor.",
+}
+
+_TOTAL_METRICS = {
+    "docs": "Cleaned docs.",
+    "batches": "Batches of docs.",
+    "parse_seconds": "Time spent waiting for the spaCy pipeline.",
+    "clean_seconds": "Time spent cleaning docs.",
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
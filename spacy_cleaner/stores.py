@@ -0,0 +1,133 @@
+"""Store parsed `spaCy` documents on disk to clean them again later.
+
+Parsing is usually the slowest part of cleaning. A `DocStore` keeps the
+output of `Language.pipe` in `DocBin` files, so that several processor
+chains can be tried on the same corpus while the pipeline runs only once.
+
+A typical usage example:
+    ```python
+    import spacy
+    from spacy_cleaner import Cleaner, processing, stores
+
+    nlp = spacy.load("en_core_web_md")
+    store = stores.DocStore("corpus")
+    store.write(nlp, texts)
+
+    cleaner = Cleaner(nlp, processing.remove_stopword_token)
+    cleaner.clean_docs(store.docs(nlp.vocab))
+    ```
+    Calling clean_docs cleans the stored docs without running the pipeline.
+"""
+
+import os
+import pathlib
+from typing import Iterable, Iterator, List, Optional, Union
+
+import spacy
+from spacy import tokens
+
+
+class DocStore:
+    """A directory of `DocBin` files holding parsed documents, in order.
+
+    Documents are written in shards of `shard_size` documents, so memory
+    use is bounded by the shard size rather than by the size of the corpus.
+
+    Args:
+        path: The directory of the store. It is created if needed.
+        shard_size: The number of documents per `DocBin` file.
+    """
+
+    suffix = ".spacy"
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        *,
+        shard_size: int = 10_000,
+    ) -> None:
+        self.path = pathlib.Path(path)
+        self.shard_size = shard_size
+
+    def __len__(self) -> int:
+        """The number of stored documents."""
+        return sum(
+            len(tokens.DocBin().from_disk(shard)) for shard in self.shards()
+        )
+
+    def shards(self) -> List[pathlib.Path]:
+        """Lists the `DocBin` files of the store.
+
+        Returns:
+            The paths of the files, in the order of the documents.
+        """
+        if not self.path.is_dir():
+            return []
+        return sorted(self.path.glob(f"*{self.suffix}"))
+
+    def add(self, docs: Iterable[tokens.Doc]) -> int:
+        """Appends documents to the store.
+
+        Args:
+            docs: The documents to store.
+
+        Returns:
+            The number of stored documents.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        index = len(self.shards())
+        count = 0
+        doc_bin = tokens.DocBin()
+        for doc in docs:
+            doc_bin.add(doc)
+            count += 1
+            if len(doc_bin) == self.shard_size:
+                self._write_shard(doc_bin, index)
+                index += 1
+                doc_bin = tokens.DocBin()
+        if len(doc_bin):
+            self._write_shard(doc_bin, index)
+        return count
+
+    def write(
+        self,
+        model: spacy.Language,
+        texts: Iterable[Union[str, tokens.Doc]],
+        *,
+        batch_size: Optional[int] = None,
+        n_process: int = 1,
+    ) -> int:
+        """Parses texts with every component of a model and stores the docs.
+
+        Args:
+            model: A `spaCy` model.
+            texts: An iterable of texts or docs to parse.
+            batch_size: The number of texts to buffer.
+            n_process: Number of processors to parse texts.
+
+        Returns:
+            The number of stored documents.
+        """
+        return self.add(
+            model.pipe(texts, batch_size=batch_size, n_process=n_process)
+        )
+
+    def docs(self, vocab: spacy.Vocab) -> Iterator[tokens.Doc]:
+        """Streams the stored documents, one shard at a time.
+
+        Args:
+            vocab: The vocabulary of the model that parsed the documents.
+
+        Yields:
+            The stored documents, in order.
+        """
+        for shard in self.shards():
+            yield from tokens.DocBin().from_disk(shard).get_docs(vocab)
+
+    def clear(self) -> None:
+        """Removes every stored document."""
+        for shard in self.shards():
+            shard.unlink()
+
+    def _write_shard(self, doc_bin: tokens.DocBin, index: int) -> None:
+        doc_bin.to_disk(self.path / f"{index:08d}{self.suffix}")
@@ -1,13 +1,38 @@
 """Tests for `spacy_cleaner.processing.evaluators`."""
 
 import spacy
+from spacy import tokens
 
 from spacy_cleaner.processing.evaluators import (
     EmailEvaluator,
+    Evaluator,
+    NumberEvaluator,
     PunctuationEvaluator,
     StopwordsEvaluator,
     URLEvaluator,
+    evaluate_doc,
 )
+from spacy_cleaner.processing.helpers import clean_doc
+from spacy_cleaner.processing.transformers import (
+    FusedTransformer,
+    Transformer,
+)
+
+
+class TitleEvaluator(Evaluator):
+    """Evaluates title case tokens, without a vectorised form."""
+
+    def evaluate(self, tok: tokens.Token) -> bool:
+        """If the given token is title case."""
+        return tok.is_title
+
+
+class StopKeepNegationEvaluator(StopwordsEvaluator):
+    """Evaluates stopwords other than negations."""
+
+    def evaluate(self, tok: tokens.Token) -> bool:
+        """If the given token is a stopword but not a negation."""
+        return super().evaluate(tok) and tok.lower_ != "not"
 
 
 class TestStopwordsEvaluator:
@@ -80,3 +105,46 @@ class TestURLEvaluator:
         tok = doc[0]
         evaluator = URLEvaluator()
         assert evaluator.evaluate(tok) is False
+
+
+class TestEvaluateDoc:
+    """Tests for `evaluate_doc`."""
+
+    def test_evaluate_doc(self, model: spacy.Language) -> None:
+        """Test that each evaluator gives a column of the array."""
+        doc = model("and London 9 .")
+        masks = evaluate_doc(
+            doc, StopwordsEvaluator(), TitleEvaluator(), NumberEvaluator()
+        )
+        assert masks.tolist() == [
+            [True, False, False],
+            [False, True, False],
+            [False, False, True],
+            [False, False, False],
+        ]
+
+    def test_evaluate_doc_method(self, model: spacy.Language) -> None:
+        """Test that an evaluator can evaluate a whole document."""
+        doc = model("and London")
+        assert StopwordsEvaluator().evaluate_doc(doc).tolist() == [True, False]
+        assert TitleEvaluator().evaluate_doc(doc).tolist() == [False, True]
+
+    def test_evaluate_doc_subclass(self, model: spacy.Language) -> None:
+        """Test that a subclass overriding `evaluate` is not vectorised."""
+        assert StopKeepNegationEvaluator.attr is None
+        assert StopKeepNegationEvaluator.requires is None
+        doc = model("I do not like it")
+        remove = Transformer(StopKeepNegationEvaluator(), replace="")
+        assert StopKeepNegationEvaluator().evaluate_doc(doc).tolist() == [
+            True,
+            True,
+            False,
+            False,
+            True,
+        ]
+        assert clean_doc(doc, remove) == "not like"
+        assert clean_doc(doc, FusedTransformer(remove)) == "not like"
+
+    def test_evaluate_doc_empty(self, model: spacy.Language) -> None:
+        """Test that an empty document gives an empty array."""
+        assert evaluate_doc(model(""), StopwordsEvaluator()).shape == (0, 1)
@@ -1,12 +1,33 @@
 """Tests for `spacy_cleaner.processing.helpers`."""
 
+import functools
+import pickle
+
+import pytest
 import spacy
 
-from spacy_cleaner.processing import mutate_lemma_token, remove_stopword_token
+from spacy_cleaner.processing import (
+    mutate_lemma_token,
+    remove_punctuation_token,
+    remove_stopword_token,
+    replace_punctuation_token,
+)
+from spacy_cleaner.processing.evaluators import (
+    PunctuationEvaluator,
+    StopwordsEvaluator,
+)
 from spacy_cleaner.processing.helpers import (
+    clean_doc,
+    commutation_group,
+    commutes,
+    is_order_independent,
+    order_independent,
     replace_multi_whitespace,
+    required_attrs,
+    requires,
     token_pipe,
 )
+from spacy_cleaner.processing.transformers import Transformer
 
 
 class TestReplaceMultiWhitespace:
@@ -45,3 +66,146 @@ class TestTokenPipe:
             )
             == "swimming"
         )
+
+
+class TestRequiredAttrs:
+    """Tests for `requires` and `required_attrs`."""
+
+    def test_required_attrs(self) -> None:
+        """Test that declared attributes are collected."""
+        assert required_attrs(
+            remove_stopword_token,
+            functools.partial(replace_punctuation_token, replace="_P_"),
+            mutate_lemma_token,
+        ) == {"token.is_stop", "token.is_punct", "token.lemma"}
+
+    def test_required_attrs_undeclared(self) -> None:
+        """Test that an undeclared processor gives `None`."""
+        assert required_attrs(remove_stopword_token, str) is None
+
+    def test_requires(self) -> None:
+        """Test that `requires` declares attributes on a processor."""
+
+        @requires("token.pos")
+        def remove_verb_token(tok: spacy.tokens.Token) -> str:
+            return "" if tok.pos_ == "VERB" else tok.text
+
+        assert required_attrs(remove_verb_token) == {"token.pos"}
+
+
+class TestOrderIndependent:
+    """Tests for `order_independent`."""
+
+    def test_order_independent(self) -> None:
+        """Test that the declaration is found through partials."""
+
+        @order_independent
+        def remove_verb_token(tok: spacy.tokens.Token, tag: str) -> str:
+            return "" if tok.pos_ == tag else tok.text
+
+        assert is_order_independent(
+            functools.partial(remove_verb_token, tag="VERB")
+        )
+        assert not is_order_independent(replace_punctuation_token)
+
+    def test_commutes(self) -> None:
+        """Test that removers only commute with other removers."""
+
+        @order_independent
+        def replace_digit_token(tok: spacy.tokens.Token) -> str:
+            return "<N>" if tok.is_digit else tok.text
+
+        assert commutes(remove_stopword_token, remove_punctuation_token)
+        assert commutes(
+            functools.partial(remove_stopword_token, replace=""),
+            remove_punctuation_token,
+        )
+        assert not commutes(
+            functools.partial(remove_stopword_token, replace="_"),
+            remove_punctuation_token,
+        )
+        assert not commutes(
+            remove_stopword_token.with_replace("_"), remove_punctuation_token
+        )
+        assert not commutes(remove_stopword_token, replace_digit_token)
+        assert commutes(replace_digit_token, replace_digit_token)
+        assert not commutes(
+            replace_punctuation_token, replace_punctuation_token
+        )
+        assert commutation_group(remove_stopword_token) == "remove"
+
+    def test_transformer(self) -> None:
+        """Test that decorating a transformer returns a flagged copy."""
+        transformer = Transformer(PunctuationEvaluator(), replace="")
+        decorated = order_independent(transformer)
+        assert decorated is not transformer
+        assert is_order_independent(decorated)
+        assert not is_order_independent(transformer)
+        assert is_order_independent(pickle.loads(pickle.dumps(decorated)))  # noqa: S301
+
+    def test_requires_transformer(self) -> None:
+        """Test that `requires` rejects transformers."""
+        with pytest.raises(TypeError, match="Evaluator.requires"):
+            requires("token.pos")(remove_stopword_token)
+
+
+class TestCleanDoc:
+    """Tests for `clean_doc`."""
+
+    def test_clean_doc(self, model: spacy.Language) -> None:
+        """Test that processors are applied to each token."""
+        doc = model("I love swimming!")
+        assert (
+            clean_doc(
+                doc,
+                remove_stopword_token,
+                replace_punctuation_token,
+                mutate_lemma_token,
+            )
+            == "love swim _IS_PUNCT_"
+        )
+
+    def test_clean_doc_transformers(self, model: spacy.Language) -> None:
+        """Test that leading transformers give the same result."""
+        doc = model("I love swimming!")
+        assert (
+            clean_doc(
+                doc,
+                Transformer(StopwordsEvaluator(), replace=""),
+                Transformer(PunctuationEvaluator(), replace="_IS_PUNCT_"),
+                mutate_lemma_token,
+            )
+            == "love swim _IS_PUNCT_"
+        )
+
+    def test_clean_doc_skips_whitespace(self, model: spacy.Language) -> None:
+        """Test that removed and whitespace tokens are left out."""
+        doc = model("I  love\n\nswimming !")
+        assert (
+            clean_doc(doc, remove_stopword_token, remove_punctuation_token)
+            == "love swimming"
+        )
+
+    def test_clean_doc_keep_whitespace(self, model: spacy.Language) -> None:
+        """Test that the original whitespace of kept tokens is kept."""
+        doc = model("I love swimming, and\ndiving!")
+        assert (
+            clean_doc(
+                doc,
+                remove_stopword_token,
+                replace_punctuation_token,
+                keep_whitespace=True,
+            )
+            == "love swimming_IS_PUNCT_ \ndiving_IS_PUNCT_"
+        )
+
+    def test_clean_doc_keep_whitespace_removed(
+        self, model: spacy.Language
+    ) -> None:
+        """Test that removed tokens do not join the words around them."""
+        assert [
+            clean_doc(
+                model(text), remove_punctuation_token, keep_whitespace=True
+            )
+            for text in ["Hello, world", "I said (hi) there.", "a , b"]
+        ] == ["Hello world", "I said hi there", "a b"]
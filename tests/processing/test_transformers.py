@@ -1,10 +1,24 @@
 """Tests for `spacy_cleaner.processing.transformers`."""
 
+import pickle
+from typing import List
+
 import pytest
 import spacy
+from spacy import tokens
+
+from spacy_cleaner import processing
+from spacy_cleaner.processing.evaluators import Evaluator, PunctuationEvaluator
+from spacy_cleaner.processing.helpers import token_pipe
+from spacy_cleaner.processing.transformers import FusedTransformer, Transformer
+
 
-from spacy_cleaner.processing.evaluators import PunctuationEvaluator
-from spacy_cleaner.processing.transformers import Transformer
+class TitleEvaluator(Evaluator):
+    """Evaluates title case tokens, without an attribute ID."""
+
+    def evaluate(self, tok: tokens.Token) -> bool:
+        """If the given token is title case."""
+        return tok.is_title
 
 
 class TestTransformer:
@@ -35,3 +49,72 @@ class TestTransformer:
         doc = model("London")
         tok = doc[0]
         assert transformer.transform(tok) == tok
+
+    def test_call_replace(
+        self, model: spacy.Language, transformer: Transformer
+    ) -> None:
+        """Test that the replacement can be overridden per call."""
+        doc = model(".")
+        tok = doc[0]
+        assert transformer(tok) == "_IS_PUNCT_"
+        assert transformer(tok, replace="P") == "P"
+
+    def test_immutable(self, transformer: Transformer) -> None:
+        """Test that transformers cannot be changed."""
+        with pytest.raises(AttributeError, match="immutable"):
+            transformer.replace = ""
+
+    def test_pickle(self, transformer: Transformer) -> None:
+        """Test that transformers can be pickled."""
+        assert repr(pickle.loads(pickle.dumps(transformer))) == repr(  # noqa: S301
+            transformer
+        )
+
+    def test_with_replace(self, transformer: Transformer) -> None:
+        """Test that a transformer can be copied with a new replacement."""
+        other = transformer.with_replace("P")
+        assert other.replace == "P"
+        assert other.evaluator is transformer.evaluator
+
+
+class TestFusedTransformer:
+    """Tests for `FusedTransformer`."""
+
+    @pytest.fixture()
+    def chain(self) -> List[Transformer]:
+        """Return transformers with overlapping evaluators."""
+        return [
+            processing.replace_stopword_token,
+            Transformer(TitleEvaluator(), replace="_IS_TITLE_"),
+            processing.replace_punctuation_token,
+            processing.replace_number_token,
+        ]
+
+    def test_call(
+        self, model: spacy.Language, chain: List[Transformer]
+    ) -> None:
+        """Test that the first matching transformer wins."""
+        fused = FusedTransformer(*chain)
+        for tok in model("The London ten 9 . swim"):
+            assert token_pipe(tok, fused) == token_pipe(tok, *chain)
+
+    def test_transform_doc(
+        self, model: spacy.Language, chain: List[Transformer]
+    ) -> None:
+        """Test that documents are transformed in one step."""
+        fused = FusedTransformer(*chain)
+        assert fused.transform_doc(model("The London 9 . swim")) == [
+            "_IS_STOP_",
+            "_IS_TITLE_",
+            "_LIKE_NUM_",
+            "_IS_PUNCT_",
+            None,
+        ]
+
+    def test_requires(self, chain: List[Transformer]) -> None:
+        """Test that undeclared evaluators make the requirements unknown."""
+        assert FusedTransformer(*chain).requires is None
+        assert FusedTransformer(*chain[2:]).requires == {
+            "token.is_punct",
+            "token.like_num",
+        }
@@ -0,0 +1,112 @@
+"""Tests for `spacy_cleaner.batching`."""
+
+import asyncio
+import pickle
+from typing import AsyncIterator, List
+
+import pytest
+import spacy
+
+from spacy_cleaner import Cleaner, processing
+from spacy_cleaner.batching import MicroBatcher
+
+
+@pytest.fixture()
+def cleaner(model: spacy.Language) -> Cleaner:
+    """Return a cleaner without a progress bar."""
+    return Cleaner(
+        model,
+        processing.remove_stopword_token,
+        processing.replace_punctuation_token,
+        progress=False,
+    )
+
+
+class TestMicroBatcher:
+    """Tests for `MicroBatcher`."""
+
+    def test_clean_coalesces(self, cleaner: Cleaner, texts: List[str]) -> None:
+        """Test that concurrent calls share batches."""
+        batcher = MicroBatcher(cleaner, max_latency=0.05)
+
+        async def main() -> List[List[str]]:
+            return list(
+                await asyncio.gather(*(batcher.clean([text]) for text in texts))
+            )
+
+        assert asyncio.run(main()) == [[text] for text in cleaner.clean(texts)]
+        assert batcher.batches == 1
+        batcher.close()
+
+    def test_clean_max_batch_size(
+        self, cleaner: Cleaner, texts: List[str]
+    ) -> None:
+        """Test that batches are split at `max_batch_size`."""
+        batcher = MicroBatcher(cleaner, max_batch_size=3, max_latency=1)
+        assert asyncio.run(batcher.clean(texts * 2)) == cleaner.clean(texts * 2)
+        assert batcher.batches == 3
+        batcher.close()
+
+    def test_clean_iter_backpressure(
+        self, cleaner: Cleaner, texts: List[str]
+    ) -> None:
+        """Test that a stream larger than the queue is cleaned in order."""
+        batcher = MicroBatcher(cleaner, max_batch_size=2, max_queue_size=3)
+
+        async def stream() -> AsyncIterator[str]:
+            for text in texts * 3:
+                yield text
+
+        async def main() -> List[str]:
+            return [text async for text in batcher.clean_iter(stream())]
+
+        assert asyncio.run(main()) == cleaner.clean(texts * 3)
+        batcher.close()
+
+    def test_clean_error(self, model: spacy.Language) -> None:
+        """Test that errors reach every caller of the batch."""
+
+        def fail(tok: spacy.tokens.Token) -> str:
+            raise RuntimeError(tok.text)
+
+        batcher = MicroBatcher(Cleaner(model, fail, progress=False))
+        with pytest.raises(RuntimeError):
+            asyncio.run(batcher.clean(["a", "b"]))
+        batcher.close()
+
+    def test_process_executor(self, cleaner: Cleaner, texts: List[str]) -> None:
+        """Test that batches can be cleaned in worker processes."""
+        batcher = MicroBatcher(cleaner, executor="process")
+        assert asyncio.run(batcher.clean(texts)) == cleaner.clean(texts)
+        batcher.close()
+
+    def test_unknown_executor(self, cleaner: Cleaner) -> None:
+        """Test that unknown executors are rejected."""
+        with pytest.raises(ValueError, match="Unknown executor"):
+            MicroBatcher(cleaner, executor="fibre")
+
+
+class TestCleanerAsync:
+    """Tests for `Cleaner.aclean` and `Cleaner.aclean_iter`."""
+
+    def test_aclean(self, cleaner: Cleaner, texts: List[str]) -> None:
+        """Test that `aclean` matches `clean`."""
+        assert asyncio.run(cleaner.aclean(texts)) == cleaner.clean(texts)
+
+    def test_aclean_iter(self, cleaner: Cleaner, texts: List[str]) -> None:
+        """Test that `aclean_iter` matches `clean`."""
+
+        async def main() -> List[str]:
+            return [text async for text in cleaner.aclean_iter(texts)]
+
+        assert asyncio.run(main()) == cleaner.clean(texts)
+        assert asyncio.run(main()) == cleaner.clean(texts)
+
+    def test_pickle_without_batcher(
+        self, cleaner: Cleaner, texts: List[str]
+    ) -> None:
+        """Test that the batcher is not pickled with the cleaner."""
+        asyncio.run(cleaner.aclean(texts))
+        assert cleaner.batcher is not None
+        restored = pickle.loads(pickle.dumps(cleaner))  # noqa: S301
+        assert restored.batcher is None
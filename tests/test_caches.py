@@ -0,0 +1,139 @@
+"""Tests for `spacy_cleaner.caches`."""
+
+import pathlib
+from typing import Iterable, Iterator
+
+import spacy
+
+from spacy_cleaner import processing
+from spacy_cleaner.caches import (
+    CacheInfo,
+    Deduplicator,
+    LexemeCache,
+    LRUCache,
+    PersistentCache,
+)
+
+
+class TestLRUCache:
+    """Tests for `LRUCache`."""
+
+    def test_get_put(self) -> None:
+        """Test that values are cached and statistics are counted."""
+        cache: LRUCache[str, int] = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.info() == CacheInfo(
+            hits=1, misses=1, maxsize=2, currsize=1
+        )
+
+    def test_put_evicts_least_recently_used(self) -> None:
+        """Test that the least recently used entry is evicted."""
+        cache: LRUCache[str, int] = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+
+
+class TestLexemeCache:
+    """Tests for `LexemeCache`."""
+
+    def test_call(self, model: spacy.Language) -> None:
+        """Test that results are cached per word."""
+        cache = LexemeCache(
+            [processing.remove_stopword_token, processing.replace_number_token],
+            maxsize=16,
+        )
+        doc = model("and 9 swim and 9 swim")
+        assert [cache(tok) for tok in doc] == [
+            "",
+            "_LIKE_NUM_",
+            doc[2],
+            "",
+            "_LIKE_NUM_",
+            doc[5],
+        ]
+        assert cache.cache.info() == CacheInfo(
+            hits=3, misses=3, maxsize=16, currsize=3
+        )
+
+
+class TestDeduplicator:
+    """Tests for `Deduplicator`."""
+
+    def test_unique_restore(self) -> None:
+        """Test that duplicates are replaced and restored in order."""
+        dedupe = Deduplicator(maxsize=8)
+        unique = list(dedupe.unique(["a", "b", "a", "a", "b"]))
+        assert unique == ["a", "b", "", "", ""]
+        assert list(dedupe.restore(text.upper() for text in unique)) == [
+            "A",
+            "B",
+            "A",
+            "A",
+            "B",
+        ]
+
+    def test_unique_seen(self) -> None:
+        """Test that cleaned texts are served from the table of seen texts."""
+        dedupe = Deduplicator(maxsize=1)
+        restored = dedupe.restore(
+            text.upper() for text in dedupe.unique(["a", "a", "b", "a", "b"])
+        )
+        assert list(restored) == ["A", "A", "B", "A", "B"]
+        assert dedupe.seen.info().currsize == 1
+
+
+class TestPersistentCache:
+    """Tests for `PersistentCache`."""
+
+    def test_get_put(self, tmp_path: pathlib.Path) -> None:
+        """Test that entries survive reopening and are scoped by fingerprint."""
+        cache = PersistentCache(tmp_path / "cache.sqlite")
+        cache.put("a", "first", "A")
+        cache.close()
+        cache = PersistentCache(tmp_path / "cache.sqlite")
+        assert cache.get("a", "first") == "A"
+        assert cache.get("a", "second") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_put_evicts_least_recently_used(
+        self, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that the oldest entries are evicted above `max_bytes`."""
+        cache = PersistentCache(tmp_path / "cache.sqlite", max_bytes=40)
+        cache.put("a", "f", "A")
+        cache.put("b", "f", "B")
+        cache.get("a", "f")
+        cache.put("c", "f", "C")
+        assert len(cache) == 2
+        assert cache.get("b", "f") is None
+        assert cache.get("a", "f") == "A"
+
+    def test_invalidate(self, tmp_path: pathlib.Path) -> None:
+        """Test that entries of other fingerprints are removed."""
+        cache = PersistentCache(tmp_path / "cache.sqlite")
+        cache.put("a", "old", "A")
+        cache.put("a", "new", "a")
+        assert cache.invalidate("new") == 1
+        assert len(cache) == 1
+
+    def test_cleaned(self, tmp_path: pathlib.Path) -> None:
+        """Test that only texts missing from the cache are cleaned."""
+        cache = PersistentCache(tmp_path / "cache.sqlite")
+        cache.put("a", "f", "A")
+        seen = []
+
+        def clean(texts: Iterable[str]) -> Iterator[str]:
+            for text in texts:
+                seen.append(text)
+                yield text.upper()
+
+        assert list(cache.cleaned(["a", "b"], "f", clean)) == ["A", "B"]
+        assert seen == ["", "b"]
+        assert cache.get("b", "f") == "B"
@@ -1,9 +1,68 @@
 """Test the `Cleaner` class."""
-from typing import List
+import functools
+import pathlib
+from typing import Callable, Dict, Iterator, List, Union
 
+import pytest
 import spacy
+from spacy import tokens
 
-from spacy_cleaner import Cleaner, processing
+from spacy_cleaner import (
+    Cleaner,
+    MultiCleaner,
+    caches,
+    components,
+    processing,
+    stats,
+)
+from spacy_cleaner.processing import helpers
+
+
+@spacy.Language.component("fail_on_call", assigns=["token.tag"])
+def fail_on_call(doc: tokens.Doc) -> tokens.Doc:  # noqa: ARG001
+    """Raise an error if the component is run."""
+    msg = "Component should be disabled."
+    raise RuntimeError(msg)
+
+
+@helpers.requires("token.is_title")
+def remove_title_token(tok: tokens.Token) -> Union[str, tokens.Token]:
+    """Remove title case tokens."""
+    return "" if tok.is_title else tok
+
+
+@helpers.order_independent
+def remove_digit_token(tok: tokens.Token) -> Union[str, tokens.Token]:
+    """Remove digit tokens."""
+    return "" if tok.is_digit else tok
+
+
+@helpers.order_independent
+def remove_alpha_token(tok: tokens.Token) -> Union[str, tokens.Token]:
+    """Remove alphabetic tokens."""
+    return "" if tok.is_alpha else tok
+
+
+class ShortEvaluator(processing.evaluators.Evaluator):
+    """Evaluate tokens shorter than a given length."""
+
+    def __init__(self, length: int) -> None:
+        self.length = length
+
+    def evaluate(self, tok: tokens.Token) -> bool:
+        """If the token is shorter than `length`."""
+        return len(tok) < self.length
+
+
+class ReplaceDigits:
+    """Replace digit tokens with a given string."""
+
+    def __init__(self, replace: str) -> None:
+        self.replace = replace
+
+    def __call__(self, tok: tokens.Token) -> Union[str, tokens.Token]:
+        """Replace the token if it is a digit."""
+        return self.replace if tok.is_digit else tok
 
 
 class TestCleaner:
@@ -26,3 +85,482 @@ class TestCleaner:
             "favourite Anime _IS_PUNCT_ Demon Slayer awesome _IS_PUNCT_",
             "Annie travel London 9",
         ]
+
+    def test_clean_n_process(
+        self, model: spacy.Language, texts: List[str]
+    ) -> None:
+        """Test that cleaning in worker processes gives the same result."""
+        cleaner = Cleaner(
+            model,
+            processing.remove_stopword_token,
+            processing.replace_punctuation_token,
+            processing.mutate_lemma_token,
+        )
+        assert cleaner.clean(texts, n_process=2) == cleaner.clean(texts)
+        assert model.pipe_names == ["lemmatizer"]
+
+    def test_clean_iter_n_process_interleaved(
+        self, model: spacy.Language, texts: List[str]
+    ) -> None:
+        """Test that a suspended worker stream leaves the model unchanged."""
+        workers = Cleaner(
+            model, processing.remove_stopword_token, progress=False
+        )
+        expected = workers.clean(texts)
+        stream = workers.clean_iter(texts, n_process=2)
+        assert next(stream) == expected[0]
+        assert model.pipe_names == ["lemmatizer"]
+        assert model("I love swimming").text == "I love swimming"
+        other = Cleaner(model, processing.mutate_lemma_token, progress=False)
+        assert other.clean(["I love swimming"]) == ["I love swim"]
+        assert list(stream) == expected[1:]
+
+    def test_clean_iter(self, model: spacy.Language, texts: List[str]) -> None:
+        """Test that `clean_iter` accepts unsized iterables."""
+        cleaner = Cleaner(
+            model,
+            processing.remove_stopword_token,
+            processing.replace_punctuation_token,
+            processing.mutate_lemma_token,
+        )
+        cleaned = cleaner.clean_iter(text for text in texts)
+        assert isinstance(cleaned, Iterator)
+        assert list(cleaned) == cleaner.clean(texts)
+
+    @pytest.mark.parametrize(
+        ("n_process", "dedupe_size"), [(1, 0), (1, 2), (2, 0)]
+    )
+    def test_clean_as_tuples(
+        self,
+        model: spacy.Language,
+        texts: List[str],
+        n_process: int,
+        dedupe_size: int,
+    ) -> None:
+        """Test that contexts are passed through in order, uncopied."""
+        cleaner = Cleaner(
+            model,
+            processing.remove_stopword_token,
+            processing.mutate_lemma_token,
+        )
+        duplicated = [*texts, texts[1], texts[0]]
+        contexts = [{"id": i} for i in range(len(duplicated))]
+        cleaned = cleaner.clean(
+            list(zip(duplicated, contexts)),
+            as_tuples=True,
+            n_process=n_process,
+            dedupe_size=dedupe_size,
+        )
+        assert [text for text, _ in cleaned] == cleaner.clean(duplicated)
+        assert all(
+            context is expected
+            for (_, context), expected in zip(cleaned, contexts)
+        )
+
+    def test_clean_iter_as_tuples(
+        self, model: spacy.Language, texts: List[str]
+    ) -> None:
+        """Test that `clean_iter` streams (cleaned, context) tuples."""
+        cleaner = Cleaner(model, processing.remove_stopword_token)
+        cleaned = cleaner.clean_iter(
+            ((text, i) for i, text in enumerate(texts)), as_tuples=True
+        )
+        assert isinstance(cleaned, Iterator)
+        assert list(cleaned) == list(
+            zip(cleaner.clean(texts), range(len(texts)))
+        )
+
+    def test_clean_auto_disable(self, model: spacy.Language) -> None:
+        """Test that components not needed by the processors are disabled."""
+        model.add_pipe("fail_on_call")
+        cleaner = Cleaner(model, processing.remove_stopword_token)
+        assert cleaner.clean(["I love to swim"]) == ["love swim"]
+
+    def test_clean_auto_disable_off(self, model: spacy.Language) -> None:
+        """Test that all components run when `auto_disable` is off."""
+        model.add_pipe("fail_on_call")
+        cleaner = Cleaner(
+            model, processing.remove_stopword_token, auto_disable=False
+        )
+        with pytest.raises(RuntimeError, match="should be disabled"):
+            cleaner.clean(["I love to swim"])
+
+    def test_clean_auto_disable_keeps_needed(
+        self, model: spacy.Language
+    ) -> None:
+        """Test that components assigning required attributes are kept."""
+        model.add_pipe("fail_on_call")
+        cleaner = Cleaner(model, processing.mutate_lemma_token)
+        with pytest.raises(RuntimeError, match="should be disabled"):
+            cleaner.clean(["I love to swim"])
+
+    def test_clean_auto_disable_keeps_retokenizers(
+        self, model: spacy.Language
+    ) -> None:
+        """Test that retokenizers and the components they need are kept."""
+        ruler = model.add_pipe("entity_ruler")
+        ruler.add_patterns(  # type: ignore[attr-defined]
+            [{"label": "ORG", "pattern": "The Who"}]
+        )
+        model.add_pipe("merge_entities")
+        processors = (
+            processing.remove_stopword_token,
+            processing.mutate_lemma_token,
+        )
+        texts = ["I saw The Who in concert"]
+        assert Cleaner(model, *processors).clean(texts) == Cleaner(
+            model, *processors, auto_disable=False
+        ).clean(texts)
+        assert Cleaner(model, *processors).clean(texts) == [
+            "see The Who concert"
+        ]
+
+    def test_clean_tokenizer_only_retokenizers(
+        self, model: spacy.Language
+    ) -> None:
+        """Test that lexical chains are parsed when a component retokenizes."""
+        ruler = model.add_pipe("entity_ruler")
+        ruler.add_patterns(  # type: ignore[attr-defined]
+            [{"label": "ORG", "pattern": "The Who"}]
+        )
+        model.add_pipe("merge_entities")
+        cleaner = Cleaner(model, processing.remove_stopword_token)
+        assert cleaner.clean(["I saw The Who in concert"]) == [
+            "saw The Who concert"
+        ]
+
+    def test_clean_tokenizer_only(
+        self, model: spacy.Language, texts: List[str]
+    ) -> None:
+        """Test that lexical chains match the full pipeline output."""
+        processors = (
+            processing.remove_stopword_token,
+            processing.replace_url_token,
+            processing.remove_number_token,
+        )
+        docs: List[Union[str, tokens.Doc]] = [*texts[:-1], model(texts[-1])]
+        assert Cleaner(model, *processors).clean(docs) == Cleaner(
+            model, *processors, auto_disable=False
+        ).clean(texts)
+
+    def test_clean_lexeme_cache(
+        self, model: spacy.Language, texts: List[str]
+    ) -> None:
+        """Test that the lexeme cache does not change the output."""
+        processors = (
+            processing.remove_stopword_token,
+            remove_title_token,
+            processing.mutate_lemma_token,
+        )
+        cleaner = Cleaner(model, *processors)
+        assert cleaner.clean(texts) == Cleaner(
+            model, *processors, lexeme_cache_size=0
+        ).clean(texts)
+        assert cleaner.lexeme_cache is not None
+        assert cleaner.lexeme_cache.hits > 0
+
+    def test_clean_lexeme_cache_norm(self, model: spacy.Language) -> None:
+        """Test that norms, which are set per token, are not cached."""
+
+        @helpers.requires("token.norm")
+        def mutate_norm_token(tok: tokens.Token) -> str:
+            return tok.norm_
+
+        texts = ["let's go, he's here", "he's here, let's go"]
+        assert Cleaner(model, mutate_norm_token).clean(texts) == Cleaner(
+            model, mutate_norm_token, lexeme_cache_size=0
+        ).clean(texts)
+
+    def test_clean_partial_transformer(
+        self, model: spacy.Language, texts: List[str]
+    ) -> None:
+        """Test that partials of transformers keep their replacement."""
+        cleaner = Cleaner(
+            model,
+            functools.partial(processing.replace_url_token, replace="URL"),
+        )
+        assert cleaner.clean(texts)[0].endswith("issue here : URL .")
+
+    def test_clean_dedupe(
+        self, model: spacy.Language, texts: List[str]
+    ) -> None:
+        """Test that duplicates are cleaned once and put back in order."""
+        cleaner = Cleaner(
+            model,
+            processing.remove_stopword_token,
+            processing.mutate_lemma_token,
+        )
+        duplicated = [*texts, texts[1], texts[0], texts[1], *texts]
+        assert cleaner.clean(duplicated, dedupe_size=2) == cleaner.clean(
+            duplicated
+        )
+
+    def test_clean_persistent_cache(
+        self,
+        model: spacy.Language,
+        texts: List[str],
+        tmp_path: pathlib.Path,
+    ) -> None:
+        """Test that cached texts are not parsed again."""
+        cache = caches.PersistentCache(tmp_path / "cache.sqlite")
+        cleaner = Cleaner(model, processing.remove_stopword_token, cache=cache)
+        expected = cleaner.clean(texts)
+        model.add_pipe("fail_on_call")
+        cleaner = Cleaner(
+            model,
+            processing.remove_stopword_token,
+            auto_disable=False,
+            cache=cache,
+        )
+        with pytest.raises(RuntimeError):
+            cleaner.clean(texts)
+        model.remove_pipe("fail_on_call")
+        cleaner = Cleaner(
+            model,
+            processing.remove_stopword_token,
+            auto_disable=False,
+            cache=cache,
+        )
+        assert cleaner.clean(texts) == expected
+        assert cache.hits == len(texts)
+
+    def test_fingerprint(self, model: spacy.Language) -> None:
+        """Test that the fingerprint follows the processor chain."""
+        cleaner = Cleaner(model, processing.remove_stopword_token)
+        fingerprint = cleaner.fingerprint()
+        assert (
+            Cleaner(model, processing.remove_stopword_token).fingerprint()
+            == fingerprint
+        )
+        assert (
+            Cleaner(
+                model,
+                functools.partial(processing.replace_url_token, replace="URL"),
+            ).fingerprint()
+            != Cleaner(model, processing.replace_url_token).fingerprint()
+        )
+        assert (
+            Cleaner(model, processing.remove_number_token).fingerprint()
+            != fingerprint
+        )
+
+    def test_fingerprint_local_functions(self, model: spacy.Language) -> None:
+        """Test that lambdas and closures are told apart by what they do."""
+
+        def replace_with(
+            replace: str,
+        ) -> Callable[[tokens.Token], Union[str, tokens.Token]]:
+            def replace_token(tok: tokens.Token) -> Union[str, tokens.Token]:
+                return replace if tok.is_digit else tok
+
+            return replace_token
+
+        fingerprints = [
+            Cleaner(model, processor).fingerprint()
+            for processor in [
+                lambda tok: tok.text.upper(),
+                lambda tok: tok.text.lower(),
+                replace_with("NUM"),
+                replace_with("DIGIT"),
+            ]
+        ]
+        assert len(set(fingerprints)) == len(fingerprints)
+        assert (
+            Cleaner(model, replace_with("NUM")).fingerprint() == fingerprints[2]
+        )
+
+    def test_fingerprint_state(self, model: spacy.Language) -> None:
+        """Test that processors with different state are told apart."""
+        processors: List[components.Processor] = [
+            processing.transformers.Transformer(ShortEvaluator(3), ""),
+            processing.transformers.Transformer(ShortEvaluator(10), ""),
+            ReplaceDigits("NUM"),
+            ReplaceDigits("DIGIT"),
+        ]
+        fingerprints = [
+            Cleaner(model, processor).fingerprint() for processor in processors
+        ]
+        assert len(set(fingerprints)) == len(fingerprints)
+        assert (
+            Cleaner(model, ReplaceDigits("NUM")).fingerprint()
+            == fingerprints[2]
+        )
+
+    def test_fingerprint_function_code(self, model: spacy.Language) -> None:
+        """Test that functions with the same name are told apart by code."""
+
+        def upper(tok: tokens.Token) -> str:
+            return tok.text.upper()
+
+        def lower(tok: tokens.Token) -> str:
+            return tok.text.lower()
+
+        lower.__qualname__ = upper.__qualname__ = "replace_token"
+        assert (
+            Cleaner(model, upper).fingerprint()
+            != Cleaner(model, lower).fingerprint()
+        )
+
+    def test_fingerprint_unknown_state(self, model: spacy.Language) -> None:
+        """Test that processors with unknown state are not fingerprinted."""
+        state = object()
+
+        def replace_token(tok: tokens.Token) -> Union[str, tokens.Token]:
+            return tok if state else ""
+
+        cleaner = Cleaner(model, replace_token)
+        with pytest.raises(ValueError, match="Cannot describe"):
+            cleaner.fingerprint()
+
+    def test_clean_persistent_cache_state(
+        self, model: spacy.Language, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that evaluators with different state do not share results."""
+        cache = caches.PersistentCache(tmp_path / "cache.sqlite")
+        short, long = (
+            Cleaner(
+                model,
+                processing.transformers.Transformer(ShortEvaluator(length), ""),
+                cache=cache,
+            )
+            for length in (3, 10)
+        )
+        assert short.clean(["hello a bb"]) == ["hello"]
+        assert long.clean(["hello a bb"]) == [""]
+        cache.close()
+
+    def test_clean_persistent_cache_lambdas(
+        self, model: spacy.Language, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that two lambda chains do not share cached results."""
+        cache = caches.PersistentCache(tmp_path / "cache.sqlite")
+        upper = Cleaner(model, lambda tok: tok.text.upper(), cache=cache)
+        lower = Cleaner(model, lambda tok: tok.text.lower(), cache=cache)
+        assert upper.clean(["Hi there"]) == ["HI THERE"]
+        assert lower.clean(["Hi there"]) == ["hi there"]
+        cache.close()
+
+    def test_clean_reorder(
+        self, model: spacy.Language, texts: List[str]
+    ) -> None:
+        """Test that order-independent processors are reordered."""
+        processors = (
+            remove_digit_token,
+            remove_alpha_token,
+            processing.replace_punctuation_token,
+            remove_title_token,
+        )
+        cleaner = Cleaner(model, *processors, reorder_sample=2)
+        expected = Cleaner(model, *processors).clean(texts)
+        assert cleaner.clean(texts) == expected
+        assert cleaner.order == (1, 0, 2, 3)
+        assert cleaner.clean(texts) == expected
+
+    def test_clean_reorder_removers(
+        self, model: spacy.Language, texts: List[str]
+    ) -> None:
+        """Test that a chain of built-in removers can be reordered."""
+        processors = (
+            processing.remove_number_token,
+            processing.remove_stopword_token,
+            processing.remove_punctuation_token,
+        )
+        cleaner = Cleaner(model, *processors, reorder_sample=2)
+        expected = Cleaner(model, *processors).clean(texts)
+        assert cleaner.clean(texts) == expected
+        assert cleaner.order is not None
+        assert sorted(cleaner.order) == [0, 1, 2]
+        assert cleaner.clean(texts) == expected
+
+    def test_clean_reorder_mixed(
+        self, model: spacy.Language, texts: List[str]
+    ) -> None:
+        """Test that removers are not reordered with declared processors."""
+
+        @helpers.order_independent
+        def replace_digit_token(tok: tokens.Token) -> Union[str, tokens.Token]:
+            return "<N>" if tok.is_digit else tok
+
+        processors = (processing.remove_stopword_token, replace_digit_token)
+        cleaner = Cleaner(model, *processors, reorder_sample=1)
+        expected = Cleaner(model, *processors).clean(texts)
+        assert cleaner.clean(texts) == expected
+        assert cleaner.clean(texts) == expected
+        assert cleaner.order is None
+
+    def test_clean_reorder_n_process(
+        self, model: spacy.Language, texts: List[str]
+    ) -> None:
+        """Test that worker processes run the chain without sampling."""
+        processors = (
+            processing.remove_number_token,
+            processing.remove_stopword_token,
+        )
+        cleaner = Cleaner(model, *processors, reorder_sample=1)
+        expected = Cleaner(model, *processors).clean(texts)
+        assert cleaner.clean(texts, n_process=2) == expected
+        assert cleaner.order is None
+        with cleaner._worker_component() as name:  # noqa: SLF001
+            component = model.get_pipe(name)
+            assert isinstance(component, components.CleanerComponent)
+            assert not any(
+                isinstance(processor, stats.InstrumentedProcessor)
+                for processor in component.processors
+            )
+        assert cleaner.clean(texts) == expected
+        assert cleaner.order is not None
+
+    def test_clean_reorder_with_stats(
+        self, model: spacy.Language, texts: List[str]
+    ) -> None:
+        """Test that reordering keeps the statistics of each processor."""
+        cleaner = Cleaner(
+            model,
+            remove_digit_token,
+            remove_alpha_token,
+            reorder_sample=1,
+            stats=True,
+        )
+        cleaner.clean(texts)
+        assert cleaner.order == (1, 0)
+        assert cleaner.stats is not None
+        assert set(cleaner.stats.processors) == {
+            "remove_digit_token",
+            "remove_alpha_token",
+        }
+
+
+class TestMultiCleaner:
+    """Test the `MultiCleaner` class."""
+
+    def test_clean(self, model: spacy.Language, texts: List[str]) -> None:
+        """Test that each chain matches a `Cleaner` with the same chain."""
+        chains: Dict[str, List[components.Processor]] = {
+            "topics": [
+                processing.remove_stopword_token,
+                processing.mutate_lemma_token,
+            ],
+            "classifier": [
+                processing.replace_punctuation_token,
+                processing.replace_url_token,
+            ],
+        }
+        records = MultiCleaner(model, chains).clean(texts)
+        for name, chain in chains.items():
+            assert [record[name] for record in records] == Cleaner(
+                model, *chain
+            ).clean(texts)
+
+    def test_clean_auto_disable(
+        self, model: spacy.Language, texts: List[str]
+    ) -> None:
+        """Test that pipes no chain needs are disabled."""
+        model.add_pipe("fail_on_call")
+        cleaner = MultiCleaner(
+            model,
+            {
+                "titles": [remove_title_token],
+                "stopwords": [processing.remove_stopword_token],
+            },
+        )
+        assert len(cleaner.clean(texts)) == len(texts)
@@ -0,0 +1,193 @@
+"""Tests for `spacy_cleaner.cli`."""
+
+import csv
+import json
+import pathlib
+from typing import List
+
+import pytest
+
+from spacy_cleaner import cli
+
+
+@pytest.fixture()
+def lines() -> List[str]:
+    """Return lines of text."""
+    return [
+        "Hello, my name is Cellan!",
+        "I love to swim 9 times",
+        "",
+        "and the",
+        "last one",
+    ]
+
+
+class TestClean:
+    """Tests for the `clean` command."""
+
+    def test_text(self, lines: List[str], tmp_path: pathlib.Path) -> None:
+        """Test that each line is cleaned."""
+        source = tmp_path / "in.txt"
+        source.write_text("\n".join(lines) + "\n", encoding="utf8")
+        assert (
+            cli.main(
+                [
+                    "clean",
+                    "blank:en",
+                    str(source),
+                    str(tmp_path / "out.txt"),
+                    "-p",
+                    "remove_stopword_token",
+                    "replace_punctuation_token",
+                ]
+            )
+            == 0
+        )
+        assert (tmp_path / "out.txt").read_text(encoding="utf8").split(
+            "\n"
+        ) == [
+            "Hello _IS_PUNCT_ Cellan _IS_PUNCT_",
+            "love swim 9 times",
+            "",
+            "",
+            "",
+            "",
+        ]
+
+    def test_jsonl(self, tmp_path: pathlib.Path) -> None:
+        """Test that the selected field is cleaned into the output field."""
+        source = tmp_path / "in.jsonl"
+        source.write_text(
+            json.dumps({"id": 1, "body": "I love to swim"}) + "\n",
+            encoding="utf8",
+        )
+        cli.main(
+            [
+                "clean",
+                "blank:en",
+                str(source),
+                str(tmp_path / "out.jsonl"),
+                "-p",
+                "remove_stopword_token",
+                "--format",
+                "jsonl",
+                "--field",
+                "body",
+                "--output-field",
+                "cleaned",
+            ]
+        )
+        assert json.loads(
+            (tmp_path / "out.jsonl").read_text(encoding="utf8")
+        ) == {"id": 1, "body": "I love to swim", "cleaned": "love swim"}
+
+    def test_jsonl_values(self, tmp_path: pathlib.Path) -> None:
+        """Test that null fields are empty and other values are kept."""
+        source = tmp_path / "in.jsonl"
+        source.write_text(
+            "\n".join(json.dumps({"text": text}) for text in [None, 0, False]),
+            encoding="utf8",
+        )
+        cli.main(
+            [
+                "clean",
+                "blank:en",
+                str(source),
+                str(tmp_path / "out.jsonl"),
+                "-p",
+                "remove_stopword_token",
+                "--format",
+                "jsonl",
+            ]
+        )
+        assert [
+            json.loads(line)["text"]
+            for line in (tmp_path / "out.jsonl")
+            .read_text(encoding="utf8")
+            .splitlines()
+        ] == ["", "0", "False"]
+
+    def test_jsonl_missing_field(self, tmp_path: pathlib.Path) -> None:
+        """Test that a record without the field is an error."""
+        source = tmp_path / "in.jsonl"
+        source.write_text(
+            json.dumps({"text": "the sea"}) + "\n" + json.dumps({"body": "a"}),
+            encoding="utf8",
+        )
+        with pytest.raises(ValueError, match="Record 2 has no field 'text'"):
+            cli.main(
+                [
+                    "clean",
+                    "blank:en",
+                    str(source),
+                    str(tmp_path / "out.jsonl"),
+                    "-p",
+                    "remove_stopword_token",
+                    "--format",
+                    "jsonl",
+                ]
+            )
+
+    def test_csv(self, tmp_path: pathlib.Path) -> None:
+        """Test that the selected column is cleaned in place."""
+        source = tmp_path / "in.csv"
+        source.write_text(
+            'id,text\n1,"I love to swim, daily"\n', encoding="utf8"
+        )
+        cli.main(
+            [
+                "clean",
+                "blank:en",
+                str(source),
+                str(tmp_path / "out.csv"),
+                "-p",
+                "remove_stopword_token",
+                "-f",
+                "csv",
+            ]
+        )
+        with (tmp_path / "out.csv").open(encoding="utf8") as file:
+            assert list(csv.DictReader(file)) == [
+                {"id": "1", "text": "love swim , daily"}
+            ]
+
+    def test_shard_merge(
+        self, lines: List[str], tmp_path: pathlib.Path
+    ) -> None:
+        """Test that merged shards match a single run."""
+        source = tmp_path / "in.txt"
+        source.write_text("\n".join(lines) + "\n", encoding="utf8")
+        clean = ["clean", "blank:en", str(source)]
+        processors = ["-p", "remove_stopword_token"]
+        cli.main([*clean, str(tmp_path / "all.txt"), *processors])
+        for i in range(3):
+            cli.main(
+                [
+                    *clean,
+                    str(tmp_path / f"{i}.txt"),
+                    *processors,
+                    "--shard",
+                    f"{i}/3",
+                ]
+            )
+        assert len(
+            (tmp_path / "0.txt").read_text(encoding="utf8").splitlines()
+        ) == len(lines[::3])
+        cli.main(
+            [
+                "merge",
+                str(tmp_path / "merged.txt"),
+                *(str(tmp_path / f"{i}.txt") for i in range(3)),
+            ]
+        )
+        assert (tmp_path / "merged.txt").read_text(encoding="utf8") == (
+            tmp_path / "all.txt"
+        ).read_text(encoding="utf8")
+
+    @pytest.mark.parametrize("shard", ["2/2", "a/2", "1"])
+    def test_invalid_shard(self, shard: str) -> None:
+        """Test that invalid shards are rejected."""
+        with pytest.raises(SystemExit):
+            cli.main(
+                ["clean", "blank:en", "in", "out", "-p", "x", "--shard", shard]
+            )
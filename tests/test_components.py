@@ -0,0 +1,59 @@
+"""Tests for `spacy_cleaner.components`."""
+
+import pytest
+import spacy
+
+from spacy_cleaner import processing
+from spacy_cleaner.components import CleanerComponent, resolve_processors
+
+
+class TestCleanerComponent:
+    """Tests for `CleanerComponent`."""
+
+    def test_call(self, model: spacy.Language) -> None:
+        """Test that the cleaned string is set on an empty `Doc`."""
+        component = CleanerComponent([processing.remove_stopword_token])
+        doc = component(model("I love to swim"))
+        assert doc._.cleaned == "love swim"  # noqa: SLF001
+        assert len(doc) == 0
+
+    def test_call_keep_doc(self, model: spacy.Language) -> None:
+        """Test that the original `Doc` is kept."""
+        component = CleanerComponent(
+            [processing.remove_stopword_token], keep_doc=True
+        )
+        doc = component(model("I love to swim"))
+        assert doc._.cleaned == "love swim"  # noqa: SLF001
+        assert len(doc) == 4
+
+    def test_factory(self, model: spacy.Language) -> None:
+        """Test that the component can be added by name."""
+        model.add_pipe(
+            "spacy_cleaner",
+            config={
+                "processors": {
+                    "@misc": "spacy_cleaner.processors.v1",
+                    "names": [
+                        "remove_stopword_token",
+                        "spacy_cleaner.processing.mutate_lemma_token",
+                    ],
+                },
+                "keep_doc": True,
+            },
+        )
+        assert model("I love swimming")._.cleaned == "love swim"  # noqa: SLF001
+
+
+class TestResolveProcessors:
+    """Tests for `resolve_processors`."""
+
+    def test_resolve_processors_unknown(self) -> None:
+        """Test that unknown names raise an error."""
+        with pytest.raises(ValueError, match="Unknown processor"):
+            resolve_processors(["remove_everything"])
+
+    @pytest.mark.parametrize("name", ["helpers", "evaluators", "transformers"])
+    def test_resolve_processors_modules(self, name: str) -> None:
+        """Test that the modules of `spacy_cleaner.processing` are rejected."""
+        with pytest.raises(ValueError, match="Unknown processor"):
+            resolve_processors([name])
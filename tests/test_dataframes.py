@@ -0,0 +1,107 @@
+"""Tests for `spacy_cleaner.dataframes`."""
+
+import pathlib
+import sys
+from typing import Any
+
+import pytest
+import spacy
+
+from spacy_cleaner import Cleaner, dataframes, processing
+
+
+@pytest.fixture()
+def pa() -> Any:  # noqa: ANN401
+    """Return the `pyarrow` module, or skip the test."""
+    return pytest.importorskip("pyarrow")
+
+
+@pytest.fixture()
+def cleaner(model: spacy.Language) -> Cleaner:
+    """Return a cleaner that removes stopwords."""
+    return Cleaner(model, processing.remove_stopword_token, progress=False)
+
+
+class TestCleanArrow:
+    """Tests for `clean_arrow`."""
+
+    def test_clean_arrow(self, cleaner: Cleaner, pa: Any) -> None:  # noqa: ANN401
+        """Test that chunks are cleaned in order and nulls are kept."""
+        values = pa.chunked_array(
+            [["I love the sea", None], [], [None, None], ["the cat", "and"]],
+            type=pa.string(),
+        )
+        cleaned = dataframes.clean_arrow(cleaner, values, chunk_size=1)
+        assert cleaned.type == pa.string()
+        assert cleaned.num_chunks == 6
+        assert cleaned.to_pylist() == [
+            "love sea",
+            None,
+            None,
+            None,
+            "cat",
+            "",
+        ]
+
+    def test_array(self, cleaner: Cleaner, pa: Any) -> None:  # noqa: ANN401
+        """Test that a plain array is cleaned."""
+        cleaned = dataframes.clean_arrow(cleaner, pa.array(["the cat", None]))
+        assert cleaned.to_pylist() == ["cat", None]
+
+
+class TestCleanSeries:
+    """Tests for `clean_series`."""
+
+    def test_clean_series(self, cleaner: Cleaner, pa: Any) -> None:  # noqa: ANN401
+        """Test that the index, name and missing values are kept."""
+        pd = pytest.importorskip("pandas")
+        series = pd.Series(
+            ["the cat", None, float("nan"), "I love the sea"],
+            index=[10, 5, 7, 1],
+            name="text",
+        )
+        cleaned = dataframes.clean_series(cleaner, series, chunk_size=3)
+        assert cleaned.index.tolist() == [10, 5, 7, 1]
+        assert cleaned.name == "text"
+        assert cleaned.dtype == pd.ArrowDtype(pa.string())
+        assert cleaned.isna().tolist() == [False, True, True, False]
+        assert cleaned[1] == "love sea"
+
+
+class TestWriteParquet:
+    """Tests for `write_parquet`."""
+
+    def test_write_parquet(
+        self,
+        cleaner: Cleaner,
+        pa: Any,  # noqa: ANN401
+        tmp_path: pathlib.Path,
+    ) -> None:
+        """Test that each chunk is written as a row group."""
+        parquet = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "cleaned.parquet"
+        values = pa.array(["the cat", None, "a dog", "I run", "the sea"])
+        assert (
+            dataframes.write_parquet(
+                cleaner, values, path, column="text", chunk_size=2
+            )
+            == 5
+        )
+        file = parquet.ParquetFile(path)
+        assert file.num_row_groups == 3
+        assert file.read().column("text").to_pylist() == [
+            "cat",
+            None,
+            "dog",
+            "run",
+            "sea",
+        ]
+
+
+def test_missing_dependency(
+    cleaner: Cleaner, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a missing optional dependency has a helpful error."""
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(ImportError, match="pip install pyarrow"):
+        dataframes.clean_arrow(cleaner, [])
@@ -0,0 +1,115 @@
+"""Tests for `spacy_cleaner.files`."""
+
+import functools
+import pathlib
+from typing import List, Union
+
+import pytest
+import spacy
+from spacy import tokens
+
+from spacy_cleaner import Cleaner, files, processing
+
+
+class TestLineRanges:
+    """Tests for `line_ranges`."""
+
+    @pytest.mark.parametrize("range_size", [1, 4, 7, 100])
+    def test_whole_lines(self, range_size: int) -> None:
+        """Test that ranges cover the data and end after line breaks."""
+        data = b"ab\ncdef\n\ngh"
+        ranges = list(files.line_ranges(data, range_size))
+        assert b"".join(data[start:end] for start, end in ranges) == data
+        assert all(data[end - 1 : end] == b"\n" for _, end in ranges[:-1])
+
+    def test_read_lines(self) -> None:
+        """Test that lines are read without line breaks."""
+        data = b"ab\r\ncd\n\nef"
+        assert [
+            line
+            for start, end in files.line_ranges(data, 3)
+            for line in files.read_lines(data, start, end)
+        ] == ["ab", "cd", "", "ef"]
+
+
+class TestCleanFile:
+    """Tests for `clean_file`."""
+
+    def test_clean_file(
+        self, model: spacy.Language, texts: List[str], tmp_path: pathlib.Path
+    ) -> None:
+        """Test that each line is cleaned in order."""
+        source = tmp_path / "in.txt"
+        source.write_text("\n".join(texts * 5) + "\n", encoding="utf8")
+        cleaner = Cleaner(model, processing.remove_stopword_token)
+        count = files.clean_file(
+            cleaner, source, tmp_path / "out.txt", range_size=64
+        )
+        assert count == len(texts) * 5
+        assert (tmp_path / "out.txt").read_text(
+            encoding="utf8"
+        ).splitlines() == cleaner.clean(texts * 5)
+
+    def test_clean_empty_file(
+        self, model: spacy.Language, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that an empty file gives an empty file."""
+        (tmp_path / "in.txt").touch()
+        cleaner = Cleaner(model, processing.remove_stopword_token)
+        assert (
+            files.clean_file(cleaner, tmp_path / "in.txt", tmp_path / "out.txt")
+            == 0
+        )
+        assert (tmp_path / "out.txt").read_text(encoding="utf8") == ""
+
+    def test_clean_file_resume(
+        self, model: spacy.Language, texts: List[str], tmp_path: pathlib.Path
+    ) -> None:
+        """Test that a stopped job resumes with each line written once."""
+        source = tmp_path / "in.txt"
+        source.write_text(
+            "\n".join([*texts, "boom", *texts]) + "\n", encoding="utf8"
+        )
+        checkpoint = tmp_path / "out.checkpoint"
+        failures = [RuntimeError("Preempted.")]
+
+        def fail_once(tok: tokens.Token) -> Union[str, tokens.Token]:
+            if tok.text == "boom" and failures:
+                error = failures.pop()
+                raise error
+            return tok
+
+        cleaner = Cleaner(model, processing.remove_stopword_token, fail_once)
+        clean = functools.partial(
+            files.clean_file,
+            cleaner,
+            source,
+            tmp_path / "out.txt",
+            range_size=64,
+            batch_size=1,
+            checkpoint=checkpoint,
+        )
+        with pytest.raises(RuntimeError):
+            clean()
+        stopped = files.Checkpoint.load(checkpoint)
+        assert stopped is not None
+        assert 0 < stopped.lines <= len(texts)
+        assert clean() == len(texts) * 2 + 1
+        assert (tmp_path / "out.txt").read_text(
+            encoding="utf8"
+        ).splitlines() == cleaner.clean([*texts, "boom", *texts])
+        assert clean() == len(texts) * 2 + 1
+
+    def test_clean_file_checkpoint_mismatch(
+        self, model: spacy.Language, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that a checkpoint for another input is rejected."""
+        (tmp_path / "in.txt").write_text("a\n", encoding="utf8")
+        files.Checkpoint(100, 0, 0, 0).save(tmp_path / "out.checkpoint")
+        with pytest.raises(ValueError, match="100 bytes"):
+            files.clean_file(
+                Cleaner(model, processing.remove_stopword_token),
+                tmp_path / "in.txt",
+                tmp_path / "out.txt",
+                checkpoint=tmp_path / "out.checkpoint",
+            )
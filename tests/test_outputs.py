@@ -0,0 +1,130 @@
+"""Tests for `spacy_cleaner.outputs`."""
+
+from typing import List
+
+import numpy as np
+import pytest
+import spacy
+
+from spacy_cleaner import Cleaner, outputs, processing
+
+
+class TestRaggedArray:
+    """Tests for `RaggedArray`."""
+
+    def test_from_lists(self) -> None:
+        """Test that arrays are concatenated with their offsets."""
+        ragged = outputs.RaggedArray.from_lists([[1, 2], [], [3]])
+        assert ragged.data.dtype == np.uint64
+        assert ragged.offsets.tolist() == [0, 2, 2, 3]
+        assert ragged.lengths.tolist() == [2, 0, 1]
+        assert len(ragged) == 3
+        assert [array.tolist() for array in ragged] == [[1, 2], [], [3]]
+        assert ragged[-1].base is ragged.data
+
+    def test_index_error(self) -> None:
+        """Test that indexing past the last array raises."""
+        with pytest.raises(IndexError):
+            outputs.RaggedArray.from_lists([[1]])[1]
+
+
+class TestTokenIds:
+    """Tests for `token_ids`."""
+
+    def test_token_ids(self, model: spacy.Language) -> None:
+        """Test that kept tokens become hashes and placeholders IDs."""
+        doc = model("I love the sea!")
+        ids = outputs.token_ids(
+            doc,
+            processing.remove_stopword_token,
+            processing.replace_punctuation_token,
+            placeholders={"_IS_PUNCT_": 1},
+        )
+        assert ids.dtype == np.uint64
+        assert ids.tolist() == [doc[1].orth, doc[3].orth, 1]
+
+    def test_mutated_tokens(self, model: spacy.Language) -> None:
+        """Test that changed tokens become the hash of their new string."""
+        ids = outputs.token_ids(
+            model("swimming"), processing.mutate_lemma_token, placeholders={}
+        )
+        assert model.vocab.strings[int(ids[0])] == "swim"
+
+
+class TestCleanerTokenIds:
+    """Tests for the token ID methods of `Cleaner`."""
+
+    def test_placeholder_ids(self, model: spacy.Language) -> None:
+        """Test that each placeholder of the chain gets an ID from 1."""
+        cleaner = Cleaner(
+            model,
+            processing.remove_stopword_token,
+            processing.replace_punctuation_token,
+            processing.mutate_lemma_token,
+            processing.replace_url_token,
+            processing.replace_punctuation_token,
+        )
+        assert cleaner.placeholder_ids() == {"_IS_PUNCT_": 1, "_LIKE_URL_": 2}
+
+    def test_token_id_batches(
+        self, model: spacy.Language, texts: List[str]
+    ) -> None:
+        """Test that batches hold the IDs of the cleaned strings."""
+        cleaner = Cleaner(
+            model,
+            processing.remove_stopword_token,
+            processing.replace_punctuation_token,
+            processing.mutate_lemma_token,
+        )
+        batches = list(cleaner.token_id_batches(texts, batch_size=3))
+        assert [len(batch) for batch in batches] == [3, 1]
+        ids = [array for batch in batches for array in batch]
+        for array, expected in zip(ids, cleaner.token_ids(texts)):
+            assert array.tolist() == expected.tolist()
+        strings = {i: s for s, i in cleaner.placeholder_ids().items()}
+        assert [
+            " ".join(
+                strings.get(i) or model.vocab.strings[i] for i in array.tolist()
+            )
+            for array in ids
+        ] == cleaner.clean(texts)
+
+
+class TestKeptTokens:
+    """Tests for `kept_tokens`."""
+
+    def test_kept_tokens(self, model: spacy.Language) -> None:
+        """Test that positions and codes describe the cleaned tokens."""
+        text = "I love swimming in the sea!"
+        kept = outputs.kept_tokens(
+            model(text),
+            processing.remove_stopword_token,
+            processing.replace_punctuation_token,
+            processing.mutate_lemma_token,
+            placeholders={"_IS_PUNCT_": 1},
+        )
+        assert kept.indices.tolist() == [1, 2, 5, 6]
+        assert kept.offsets.tolist() == [[2, 6], [7, 15], [23, 26], [26, 27]]
+        assert kept.codes.tolist() == [
+            outputs.KEPT,
+            outputs.CHANGED,
+            outputs.KEPT,
+            1,
+        ]
+        assert list(kept.spans(text)) == ["love", "swimming", "sea", "!"]
+
+    def test_empty(self, model: spacy.Language) -> None:
+        """Test that a doc without kept tokens gives empty arrays."""
+        kept = outputs.kept_tokens(
+            model("the"), processing.remove_stopword_token, placeholders={}
+        )
+        assert kept.offsets.shape == (0, 2)
+        assert not list(kept.spans("the"))
+
+    def test_cleaner(self, model: spacy.Language, texts: List[str]) -> None:
+        """Test that `Cleaner.kept_tokens` matches `Cleaner.clean`."""
+        cleaner = Cleaner(model, processing.remove_stopword_token)
+        assert [
+            " ".join(kept.spans(text))
+            for kept, text in zip(cleaner.kept_tokens(texts), texts)
+        ] == cleaner.clean(texts)
@@ -0,0 +1,57 @@
+"""Tests for `spacy_cleaner.runners`."""
+
+from typing import Iterator, List
+
+import pytest
+import spacy
+
+from spacy_cleaner import Cleaner, processing
+from spacy_cleaner.runners import STAGES, PipelinedRunner
+
+
+class TestPipelinedRunner:
+    """Tests for `PipelinedRunner`."""
+
+    def test_run(self, model: spacy.Language, texts: List[str]) -> None:
+        """Test that every text is cleaned and written in order."""
+        cleaner = Cleaner(
+            model,
+            processing.remove_stopword_token,
+            processing.mutate_lemma_token,
+            progress=False,
+        )
+        written: List[str] = []
+        metrics = PipelinedRunner(cleaner, queue_size=2, batch_size=3).run(
+            iter(texts * 5), written.append
+        )
+        assert written == cleaner.clean(texts * 5)
+        assert set(metrics.stages) == set(STAGES)
+        assert all(
+            stage.items == len(texts) * 5 for stage in metrics.stages.values()
+        )
+        assert metrics.stages["parse"].throughput > 0
+        assert metrics.to_dict()["stages"]["write"]["items"] == len(texts) * 5
+
+    def test_run_error(self, model: spacy.Language, texts: List[str]) -> None:
+        """Test that an error in one stage stops the others and is raised."""
+
+        def source() -> Iterator[str]:
+            yield from texts
+            msg = "Broken input."
+            raise OSError(msg)
+
+        cleaner = Cleaner(model, processing.remove_stopword_token)
+        with pytest.raises(OSError, match="Broken input"):
+            PipelinedRunner(cleaner, queue_size=1).run(source(), print)
+
+    def test_run_write_error(
+        self, model: spacy.Language, texts: List[str]
+    ) -> None:
+        """Test that a failing writer does not leave other stages blocked."""
+
+        def write(text: str) -> None:
+            raise ValueError(text)
+
+        cleaner = Cleaner(model, processing.remove_stopword_token)
+        with pytest.raises(ValueError):  # noqa: PT011
+            PipelinedRunner(cleaner, queue_size=1).run(texts * 100, write)
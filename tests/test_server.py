@@ -0,0 +1,92 @@
+"""Tests for `spacy_cleaner.server`."""
+
+import concurrent.futures
+import json
+import threading
+import urllib.error
+import urllib.request
+from typing import Any, Iterator, List
+
+import pytest
+import spacy
+
+from spacy_cleaner import Cleaner, processing
+from spacy_cleaner.server import CleanerServer
+
+
+@pytest.fixture()
+def httpd(model: spacy.Language) -> Iterator[CleanerServer]:
+    """Return a running server on a free localhost port."""
+    cleaner = Cleaner(model, processing.remove_stopword_token, progress=False)
+    with CleanerServer(
+        ("127.0.0.1", 0), cleaner, max_latency=0.1, max_batch_size=64
+    ) as httpd:
+        thread = threading.Thread(target=httpd.serve_forever)
+        thread.start()
+        yield httpd
+        httpd.shutdown()
+        thread.join()
+
+
+def request(httpd: CleanerServer, path: str, body: Any = None) -> Any:  # noqa: ANN401
+    """Send a request to the server and return the decoded response."""
+    host, port = httpd.server_address[:2]
+    data = None if body is None else json.dumps(body).encode("utf8")
+    with urllib.request.urlopen(  # noqa: S310
+        f"http://{host!s}:{port}{path}", data=data, timeout=10
+    ) as response:
+        return json.loads(response.read())
+
+
+class TestCleanerServer:
+    """Tests for `CleanerServer`."""
+
+    def test_clean(self, httpd: CleanerServer, texts: List[str]) -> None:
+        """Test that texts are cleaned like with `Cleaner.clean`."""
+        expected = httpd.batcher.cleaner.clean(texts)
+        assert request(httpd, "/clean", {"texts": texts}) == {
+            "cleaned": expected
+        }
+        assert request(httpd, "/clean", {"text": texts[0]}) == {
+            "cleaned": expected[0]
+        }
+
+    def test_clean_batches_requests(
+        self, httpd: CleanerServer, texts: List[str]
+    ) -> None:
+        """Test that concurrent requests share batches."""
+        with concurrent.futures.ThreadPoolExecutor(len(texts)) as pool:
+            responses = list(
+                pool.map(
+                    lambda text: request(httpd, "/clean", {"text": text}),
+                    texts,
+                )
+            )
+        assert [response["cleaned"] for response in responses] == (
+            httpd.batcher.cleaner.clean(texts)
+        )
+        assert httpd.batcher.batches < len(texts)
+
+    def test_health(self, httpd: CleanerServer) -> None:
+        """Test the health endpoint."""
+        assert request(httpd, "/health") == {"status": "ok"}
+
+    @pytest.mark.parametrize(
+        ("path", "body", "status"),
+        [
+            ("/clean", {"texts": [1]}, 400),
+            ("/clean", ["text"], 400),
+            ("/missing", {"texts": []}, 404),
+        ],
+    )
+    def test_errors(
+        self,
+        httpd: CleanerServer,
+        path: str,
+        body: Any,  # noqa: ANN401
+        status: int,
+    ) -> None:
+        """Test that invalid requests are rejected."""
+        with pytest.raises(urllib.error.HTTPError) as e:
+            request(httpd, path, body)
+        assert e.value.code == status
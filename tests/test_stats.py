@@ -0,0 +1,72 @@
+"""Tests for `spacy_cleaner.stats`."""
+
+from typing import List
+
+import spacy
+
+from spacy_cleaner import Cleaner, processing
+from spacy_cleaner.stats import Stats, processor_name
+
+
+class TestStats:
+    """Tests for `Stats`."""
+
+    def test_processor_counters(self, model: spacy.Language) -> None:
+        """Test that each processor counts calls, removals and replacements."""
+        cleaner = Cleaner(
+            model,
+            processing.remove_stopword_token,
+            processing.replace_punctuation_token,
+            stats=True,
+        )
+        assert cleaner.clean(["I love the sea!"]) == ["love sea _IS_PUNCT_"]
+        assert cleaner.stats is not None
+        stats = cleaner.stats.to_dict()
+        assert stats["processors"]["remove_stopword_token"] == {
+            "calls": 5,
+            "matches": 2,
+            "removed": 2,
+            "replaced": 0,
+            "seconds": stats["processors"]["remove_stopword_token"]["seconds"],
+        }
+        replace = stats["processors"]["replace_punctuation_token"]
+        assert (replace["calls"], replace["replaced"]) == (3, 1)
+
+    def test_batches(self, model: spacy.Language, texts: List[str]) -> None:
+        """Test that docs are recorded in batches of `batch_size`."""
+        cleaner = Cleaner(model, processing.mutate_lemma_token, stats=True)
+        assert cleaner.clean(texts, batch_size=3) == Cleaner(
+            model, processing.mutate_lemma_token
+        ).clean(texts)
+        assert cleaner.stats is not None
+        assert [batch.docs for batch in cleaner.stats.recent_batches] == [3, 1]
+        assert cleaner.stats.docs == len(texts)
+        assert cleaner.stats.parse_seconds > 0
+        cleaner.stats.reset()
+        assert (
+            cleaner.stats.to_dict()["processors"]["mutate_lemma_token"]["calls"]
+            == 0
+        )
+
+    def test_to_prometheus(self) -> None:
+        """Test the Prometheus text format."""
+        stats = Stats()
+        processor = stats.instrument(processing.remove_number_token)
+        stats.instrument(processing.remove_number_token)
+        nlp = spacy.blank("en")
+        processor(nlp("9")[0])
+        text = stats.to_prometheus()
+        assert "# TYPE spacy_cleaner_processor_calls_total counter" in text
+        assert (
+            "spacy_cleaner_processor_removed_total"
+            '{processor="remove_number_token"} 1' in text
+        )
+        assert 'processor="remove_number_token#2"' in text
+        assert "spacy_cleaner_docs_total 0" in text
+
+    def test_processor_name(self) -> None:
+        """Test that built-in processors are named as in `processing`."""
+        assert processor_name(processing.replace_url_token) == (
+            "replace_url_token"
+        )
+        assert processor_name(processor_name) == "processor_name"
@@ -0,0 +1,53 @@
+"""Tests for `spacy_cleaner.stores`."""
+
+import pathlib
+from typing import List
+
+import spacy
+
+from spacy_cleaner import Cleaner, processing
+from spacy_cleaner.stores import DocStore
+
+
+class TestDocStore:
+    """Tests for `DocStore`."""
+
+    def test_write_docs(
+        self, model: spacy.Language, texts: List[str], tmp_path: pathlib.Path
+    ) -> None:
+        """Test that docs are stored in shards and read back in order."""
+        store = DocStore(tmp_path / "store", shard_size=3)
+        assert store.write(model, texts) == len(texts)
+        assert len(store.shards()) == 2
+        assert len(store) == len(texts)
+        docs = list(store.docs(model.vocab))
+        assert [doc.text for doc in docs] == texts
+        assert [tok.lemma_ for tok in docs[1]] == [
+            tok.lemma_ for tok in model(texts[1])
+        ]
+
+    def test_add_appends(
+        self, model: spacy.Language, texts: List[str], tmp_path: pathlib.Path
+    ) -> None:
+        """Test that later writes are appended after earlier ones."""
+        store = DocStore(tmp_path / "store")
+        store.add(model.pipe(texts[:2]))
+        store.add(model.pipe(texts[2:]))
+        assert [doc.text for doc in store.docs(model.vocab)] == texts
+        store.clear()
+        assert len(store) == 0
+
+    def test_clean_docs(
+        self, model: spacy.Language, texts: List[str], tmp_path: pathlib.Path
+    ) -> None:
+        """Test that stored docs clean like freshly parsed texts."""
+        store = DocStore(tmp_path / "store")
+        store.write(model, texts)
+        cleaner = Cleaner(
+            model,
+            processing.remove_stopword_token,
+            processing.mutate_lemma_token,
+        )
+        assert list(cleaner.clean_docs(store.docs(model.vocab))) == (
+            cleaner.clean(texts)
+        )